@@ -0,0 +1,127 @@
+import time
+from typing import TYPE_CHECKING, Dict, List, Optional, Set
+from task_store import TaskStore
+
+if TYPE_CHECKING:
+    import pandas as pd
+    from task_analytics import TaskAnalytics
+
+
+class AnalyticsView:
+    """Analytics DataFrame that is kept in sync with a task store.
+
+    The view subscribes to the store and records every change as a delta. Deltas are
+    applied the next time the frame is requested, so repeated queries on an unchanged
+    store reuse the same frame. Only structural changes (new or replaced projects and
+    imports) cause a full rebuild through TaskAnalytics.import_from_dict.
+
+    The frame has the same rows, order and dtypes as import_from_dict, without the
+    'task' column. pandas is only imported when the frame is first requested.
+    """
+
+    COLUMNS = ['project_name', 'task_id', 'description', 'done', 'deadline']
+
+    def __init__(self, store: TaskStore):
+        self._store = store
+        self._analytics: Optional['TaskAnalytics'] = None
+        self._frame: Optional['pd.DataFrame'] = None
+        self._project_positions: Dict[str, int] = {}
+        self._empty_projects: Set[str] = set()
+        self._added_rows: List[list] = []
+        self._done_changes: Dict[int, bool] = {}
+        self._deadline_changes: Dict[int, str] = {}
+        self._stale = True
+        self.rebuilds = 0
+        self.delta_applications = 0
+        # Rows of the frames built by rebuilds, and the time spent building and updating frames
+        self.rows_built = 0
+        self.build_seconds = 0.0
+        store.subscribe(self)
+
+    @property
+    def dirty(self) -> bool:
+        return self._stale or bool(self._added_rows or self._done_changes or self._deadline_changes)
+
+    def frame(self) -> 'pd.DataFrame':
+        """Return the up-to-date analytics frame. Callers must not modify it."""
+        if self.dirty:
+            start = time.perf_counter()
+            if self._stale:
+                self._rebuild()
+            else:
+                self._apply_deltas()
+            self.build_seconds += time.perf_counter() - start
+        return self._frame
+
+    def on_project_added(self, name: str) -> None:
+        self._stale = True
+
+    def on_task_added(self, project: str, task_id: int, description: str, done: bool) -> None:
+        if self._stale:
+            return
+        if project in self._empty_projects:
+            # The placeholder row of an empty project disappears, which changes the dtypes
+            self._stale = True
+            return
+        self._added_rows.append([self._project_positions[project], project, task_id, description, done, ''])
+
+    def on_done_changed(self, task_id: int, done: bool) -> None:
+        if not self._stale:
+            self._done_changes[task_id] = done
+
+    def on_deadline_changed(self, task_id: int, deadline: str) -> None:
+        if not self._stale:
+            self._deadline_changes[task_id] = deadline
+
+    def on_loaded(self) -> None:
+        self._stale = True
+
+    def _rebuild(self) -> None:
+        if self._analytics is None:
+            from task_analytics import TaskAnalytics
+            self._analytics = TaskAnalytics()
+        tasks = self._store.to_dict()
+        self._frame = self._analytics.import_from_dict(tasks)[self.COLUMNS]
+        self._project_positions = {name: position for position, name in enumerate(tasks)}
+        self._empty_projects = {name for name, project_tasks in tasks.items() if len(project_tasks) == 0}
+        self._clear_deltas()
+        self._stale = False
+        self.rebuilds += 1
+        self.rows_built += len(self._frame)
+
+    def _apply_deltas(self) -> None:
+        import pandas as pd
+        frame = self._frame
+        if self._added_rows:
+            added = pd.DataFrame([row[1:] for row in self._added_rows], columns=self.COLUMNS)
+            added['deadline'] = pd.to_datetime(added['deadline'], format='%d-%m-%Y')
+            positions = pd.concat([
+                frame['project_name'].map(self._project_positions),
+                pd.Series([row[0] for row in self._added_rows]),
+            ], ignore_index=True)
+            frame = pd.concat([frame, added], ignore_index=True)
+            # New tasks go after the existing tasks of their project
+            order = positions.to_numpy().argsort(kind='stable')
+            frame = frame.take(order).reset_index(drop=True)
+
+        if self._done_changes or self._deadline_changes:
+            task_ids = pd.Index(frame['task_id'])
+            if not task_ids.is_unique:
+                self._rebuild()
+                return
+            if self._done_changes:
+                rows = task_ids.get_indexer(list(self._done_changes))
+                frame.iloc[rows, frame.columns.get_loc('done')] = list(self._done_changes.values())
+            if self._deadline_changes:
+                rows = task_ids.get_indexer(list(self._deadline_changes))
+                deadlines = pd.to_datetime(pd.Series(list(self._deadline_changes.values())), format='%d-%m-%Y')
+                frame.iloc[rows, frame.columns.get_loc('deadline')] = deadlines.to_numpy()
+
+        self._frame = frame
+        self._clear_deltas()
+        self.delta_applications += 1
+
+    def _clear_deltas(self) -> None:
+        self._added_rows = []
+        self._done_changes = {}
+        self._deadline_changes = {}
@@ -0,0 +1,271 @@
+import asyncio
+import io
+import json
+import traceback
+from http import HTTPStatus
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs
+from concurrent_task_list import NullOutput
+from task_list import TaskList
+from task_store import TaskStore
+
+
+class _EventLoopTaskList(TaskList):
+    """TaskList whose imports replace the tasks on the event loop.
+
+    An import reads its file in the executor, while other commands keep running on
+    the event loop. Replacing the tasks from the executor thread could interleave
+    with one of them, which would then cache its output of the old tasks as current.
+    """
+
+    loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _replace_tasks(self, imported: TaskStore):
+        try:
+            on_loop = asyncio.get_running_loop() is self.loop
+        except RuntimeError:
+            on_loop = False
+        if self.loop is None or on_loop:
+            return super()._replace_tasks(imported)
+
+        async def replace():
+            return TaskList._replace_tasks(self, imported)
+        return asyncio.run_coroutine_threadsafe(replace(), self.loop).result()
+
+
+class AsyncTaskList:
+    """TaskList for an asyncio server: one writer task, concurrent reads.
+
+    Commands that change the tasks are queued and executed one at a time by a single
+    writer task. Imports and exports run in the default executor, so that reading and
+    writing files does not block the event loop; the writer waits for them, so nothing
+    else changes the tasks meanwhile. All other commands run directly on the event
+    loop. They never overlap a change: changes also run on the event loop, and an
+    import hands the tasks it read back to the event loop to replace the current ones.
+    """
+
+    EXECUTOR_COMMANDS = {"import", "export", "import-binary", "export-binary"}
+    WRITER_COMMANDS = {"add", "check", "uncheck", "deadline"} | EXECUTOR_COMMANDS
+
+    def __init__(self, store: Optional[TaskStore] = None, journal_directory: Optional[str] = None, analytics_workers: int = 0):
+        self._task_list = _EventLoopTaskList(io.StringIO(), NullOutput(), store, journal_directory, analytics_workers=analytics_workers)
+        self._queue: Optional[asyncio.Queue] = None
+        self._writer: Optional[asyncio.Task] = None
+
+    async def execute(self, command_line: str) -> str:
+        if command_line.split(" ", 1)[0] not in self.WRITER_COMMANDS:
+            return self._task_list.execute(command_line)
+        return (await self._submit([command_line]))[0]
+
+    async def execute_batch(self, command_lines: List[str]) -> List[str]:
+        """Run commands one after another, without other changes in between."""
+        return await self._submit(command_lines)
+
+    def start(self) -> None:
+        if self._writer is None:
+            self._queue = asyncio.Queue()
+            self._task_list.loop = asyncio.get_running_loop()
+            self._writer = self._task_list.loop.create_task(self._write())
+
+    async def stop(self) -> None:
+        if self._writer is not None:
+            self._writer.cancel()
+            try:
+                await self._writer
+            except asyncio.CancelledError:
+                pass
+            self._writer = None
+            self._task_list.loop = None
+
+    def close(self) -> None:
+        """Sync the journal and stop the analytics workers, once the writer is stopped."""
+        self._task_list.close()
+
+    async def _submit(self, command_lines: List[str]) -> List[str]:
+        self.start()
+        done = asyncio.get_running_loop().create_future()
+        await self._queue.put((command_lines, done))
+        return await done
+
+    async def _write(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            command_lines, done = await self._queue.get()
+            try:
+                outputs = []
+                for command_line in command_lines:
+                    if command_line.split(" ", 1)[0] in self.EXECUTOR_COMMANDS:
+                        outputs.append(await loop.run_in_executor(None, self._task_list.execute, command_line))
+                    else:
+                        outputs.append(self._task_list.execute(command_line))
+            except Exception as error:
+                done.set_exception(error)
+            else:
+                done.set_result(outputs)
+
+
+Scope = Dict[str, object]
+Receive = Callable[[], Awaitable[dict]]
+Send = Callable[[dict], Awaitable[None]]
+
+
+class TaskListApp:
+    """ASGI application serving the TaskList commands.
+
+    - GET /show?offset=&limit= and GET /summary return the command output as text
+    - POST /api/command with {"command": ...} returns {"output": ...}
+    - POST /api/batch with a list of commands returns {"results": [{"command", "output"}]}
+
+    Runs with any ASGI server, or without dependencies through serve().
+    """
+
+    def __init__(self, tasks: Optional[AsyncTaskList] = None):
+        self.tasks = tasks if tasks is not None else AsyncTaskList()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "lifespan":
+            await self._lifespan(receive, send)
+            return
+        method, path = scope["method"], scope["path"]
+        query = parse_qs(scope.get("query_string", b"").decode())
+        if method == "GET" and path == "/show":
+            offset = query.get("offset", ["0"])[0]
+            limit = query.get("limit", [None])[0]
+            command = f"show --offset {offset}" + (f" --limit {limit}" if limit is not None else "")
+            await self._respond(send, 200, await self.tasks.execute(command))
+        elif method == "GET" and path == "/summary":
+            await self._respond(send, 200, await self.tasks.execute("summary"))
+        elif method == "POST" and path == "/api/command":
+            body = await self._json_body(receive)
+            command = body.get("command") if isinstance(body, dict) else None
+            if not isinstance(command, str):
+                await self._respond_json(send, 400, {"error": "expected {\"command\": <command string>}"})
+                return
+            await self._respond_json(send, 200, {"output": await self.tasks.execute(command)})
+        elif method == "POST" and path == "/api/batch":
+            body = await self._json_body(receive)
+            commands = body.get("commands") if isinstance(body, dict) else body
+            if not isinstance(commands, list) or not all(isinstance(command, str) for command in commands):
+                await self._respond_json(send, 400, {"error": "expected a list of command strings"})
+                return
+            outputs = await self.tasks.execute_batch(commands)
+            await self._respond_json(send, 200, {"results": [{"command": command, "output": output} for command, output in zip(commands, outputs)]})
+        else:
+            await self._respond_json(send, 404, {"error": f"no route for {method} {path}"})
+
+    async def _lifespan(self, receive: Receive, send: Send) -> None:
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                self.tasks.start()
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                await self.tasks.stop()
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    @staticmethod
+    async def _json_body(receive: Receive) -> object:
+        chunks = []
+        while True:
+            message = await receive()
+            chunks.append(message.get("body", b""))
+            if not message.get("more_body"):
+                break
+        try:
+            return json.loads(b"".join(chunks) or b"null")
+        except ValueError:
+            return None
+
+    @staticmethod
+    async def _respond(send: Send, status: int, text: str, content_type: bytes = b"text/plain; charset=utf-8") -> None:
+        body = text.encode("utf-8")
+        await send({
+            "type": "http.response.start",
+            "status": status,
+            "headers": [(b"content-type", content_type), (b"content-length", str(len(body)).encode())],
+        })
+        await send({"type": "http.response.body", "body": body})
+
+    @classmethod
+    async def _respond_json(cls, send: Send, status: int, value: object) -> None:
+        await cls._respond(send, status, json.dumps(value), b"application/json")
+
+
+app = TaskListApp()
+
+
+async def serve(application, host: str = "localhost", port: int = 8080, ready: Optional[asyncio.Event] = None) -> None:
+    """Serve an ASGI application with a minimal HTTP/1.1 server, one request per connection.
+
+    Meant for running locally without an ASGI server installed.
+    """
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            scope, body = await _read_request(reader)
+        except (ValueError, asyncio.IncompleteReadError):
+            writer.close()
+            return
+        response: List[bytes] = []
+
+        async def receive() -> dict:
+            return {"type": "http.request", "body": body, "more_body": False}
+
+        async def send(message: dict) -> None:
+            if message["type"] == "http.response.start":
+                headers = b"".join(name + b": " + value + b"\r\n" for name, value in message.get("headers", []))
+                status = HTTPStatus(message["status"])
+                response.append(b"HTTP/1.1 %d %s\r\n%sConnection: close\r\n\r\n" % (status, status.phrase.encode(), headers))
+            else:
+                response.append(message.get("body", b""))
+
+        try:
+            try:
+                await application(scope, receive, send)
+            except Exception:
+                traceback.print_exc()
+                response[:] = [b"HTTP/1.1 500 Internal Server Error\r\nContent-Length: 0\r\nConnection: close\r\n\r\n"]
+            writer.write(b"".join(response))
+            await writer.drain()
+        finally:
+            writer.close()
+
+    lifespan = asyncio.Queue()
+    await lifespan.put({"type": "lifespan.startup"})
+    lifespan_done = asyncio.get_running_loop().create_future()
+
+    async def lifespan_send(message: dict) -> None:
+        if message["type"] == "lifespan.startup.complete" and not lifespan_done.done():
+            lifespan_done.set_result(None)
+
+    lifespan_task = asyncio.get_running_loop().create_task(application({"type": "lifespan"}, lifespan.get, lifespan_send))
+    await lifespan_done
+    server = await asyncio.start_server(handle, host, port)
+    if ready is not None:
+        ready.set()
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        await lifespan.put({"type": "lifespan.shutdown"})
+        await lifespan_task
+
+
+async def _read_request(reader: asyncio.StreamReader) -> Tuple[Scope, bytes]:
+    head = await reader.readuntil(b"\r\n\r\n")
+    request_line, *header_lines = head.decode("latin-1").split("\r\n")
+    method, target, _ = request_line.split(" ", 2)
+    headers = [line.split(":", 1) for line in header_lines if line]
+    length = next((int(value) for name, value in headers if name.strip().lower() == "content-length"), 0)
+    body = await reader.readexactly(length) if length else b""
+    path, _, query = target.partition("?")
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": method,
+        "path": path,
+        "query_string": query.encode("latin-1"),
+        "headers": [(name.strip().lower().encode("latin-1"), value.strip().encode("latin-1")) for name, value in headers],
+    }
+    return scope, body
@@ -0,0 +1,46 @@
+"""Compare repeated `summary` calls with and without the incrementally maintained analytics view.
+
+Run from the python/ directory:
+    python -m benchmarks.analytics_view
+"""
+from benchmarks.common import build_task_list, report, time_call
+from task_analytics import TaskAnalytics
+
+SIZES = [1_000, 10_000, 100_000]
+CALLS = 1_000
+
+
+def summary_with_rebuild(task_list):
+    analytics = TaskAnalytics()
+    df = analytics.import_from_dict(task_list._store.to_dict())
+    return analytics.get_project_summary(df)
+
+
+def main():
+    for size in SIZES:
+        task_list = build_task_list(size)
+        analytics = TaskAnalytics()
+        calls = CALLS if size <= 10_000 else CALLS // 10
+        build_frame = time_call(lambda: analytics.import_from_dict(task_list._store.to_dict()), repeat=3)
+        view_frame = time_call(lambda: [task_list._analytics_view.frame() for _ in range(CALLS)])
+        print(f"{size:,} tasks")
+        report("  import_from_dict frame (per call)", build_frame)
+        report("  analytics view frame, unchanged list (per call)", view_frame, CALLS)
+
+        rebuild = time_call(lambda: [summary_with_rebuild(task_list) for _ in range(calls)], repeat=1)
+        view = time_call(lambda: [task_list.execute("summary") for _ in range(calls)], repeat=1)
+
+        def mutate_then_summary():
+            for i in range(calls):
+                task_list.execute(f"check {i % size + 1}")
+                task_list.execute("summary")
+        delta = time_call(mutate_then_summary, repeat=1)
+
+        report(f"  {calls:,} x summary, rebuild frame (per call)", rebuild, calls)
+        report(f"  {calls:,} x summary, view unchanged (per call)", view, calls)
+        report(f"  {calls:,} x check + summary, view (per call)", delta, calls)
+        print(f"  view rebuilds: {task_list._analytics_view.rebuilds}")
+
+
+if __name__ == "__main__":
+    main()
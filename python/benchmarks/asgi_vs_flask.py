@@ -0,0 +1,109 @@
+"""Compare the Flask server with the asyncio (ASGI) server under concurrent clients.
+
+Both servers run locally on their own port. Every simulated client opens a connection
+per request and sends a mix of reads (the first page of show) and writes (a batch
+adding one task). Reports requests per second and latency percentiles.
+
+Run from the python/ directory:
+    python -m benchmarks.asgi_vs_flask [--clients 10 50] [--requests 100] [--tasks 10000]
+"""
+import argparse
+import asyncio
+import json
+import logging
+import random
+import statistics
+import threading
+import time
+
+from werkzeug.serving import make_server
+
+import task_controller
+from asgi_app import TaskListApp, serve
+
+FLASK_PORT = 8091
+ASGI_PORT = 8092
+WRITE_RATIO = 0.1
+
+
+async def request(port, method, path, body=b""):
+    reader, writer = await asyncio.open_connection("localhost", port)
+    writer.write(
+        f"{method} {path} HTTP/1.1\r\nHost: localhost\r\nContent-Type: application/json\r\n"
+        f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode() + body
+    )
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+    if not response.startswith(b"HTTP/1.1 200") and not response.startswith(b"HTTP/1.0 200"):
+        raise RuntimeError(response[:200])
+
+
+async def client(port, read_path, n_requests, seed, latencies):
+    rng = random.Random(seed)
+    for _ in range(n_requests):
+        start = time.perf_counter()
+        if rng.random() < WRITE_RATIO:
+            await request(port, "POST", "/api/batch", json.dumps([f"add task load Task {rng.random()}"]).encode())
+        else:
+            await request(port, "GET", read_path)
+        latencies.append(time.perf_counter() - start)
+
+
+async def load(label, port, read_path, n_clients, n_requests):
+    latencies = []
+    start = time.perf_counter()
+    await asyncio.gather(*(client(port, read_path, n_requests, seed, latencies) for seed in range(n_clients)))
+    elapsed = time.perf_counter() - start
+    percentiles = statistics.quantiles(latencies, n=100)
+    print(f"  {label:<8} {len(latencies) / elapsed:>8.0f} req/s   p50 {percentiles[49] * 1e3:>8.2f} ms   p99 {percentiles[98] * 1e3:>8.2f} ms")
+
+
+def start_flask():
+    logging.getLogger("werkzeug").setLevel(logging.ERROR)
+    server = make_server("localhost", FLASK_PORT, task_controller.app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def start_asgi(application):
+    ready = threading.Event()
+
+    async def run():
+        started = asyncio.Event()
+        server = asyncio.ensure_future(serve(application, "localhost", ASGI_PORT, started))
+        await started.wait()
+        ready.set()
+        await server
+
+    threading.Thread(target=asyncio.run, args=(run(),), daemon=True).start()
+    ready.wait()
+
+
+async def fill(port, n_tasks):
+    commands = ["add project load"] + [f"add task load Task {i}" for i in range(n_tasks)]
+    for start in range(0, len(commands), task_controller.MAX_BATCH_SIZE):
+        batch = commands[start:start + task_controller.MAX_BATCH_SIZE]
+        await request(port, "POST", "/api/batch", json.dumps(batch).encode())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--clients", type=int, nargs="+", default=[10, 50])
+    parser.add_argument("--requests", type=int, default=100, help="requests per client")
+    parser.add_argument("--tasks", type=int, default=10_000, help="tasks in the list before the test")
+    args = parser.parse_args()
+
+    flask_server = start_flask()
+    start_asgi(TaskListApp())
+    asyncio.run(fill(FLASK_PORT, args.tasks))
+    asyncio.run(fill(ASGI_PORT, args.tasks))
+    for n_clients in args.clients:
+        print(f"{n_clients} clients x {args.requests} requests, {int(WRITE_RATIO * 100)}% writes, {args.tasks:,} tasks")
+        asyncio.run(load("Flask", FLASK_PORT, "/projects/stream?limit=100", n_clients, args.requests))
+        asyncio.run(load("ASGI", ASGI_PORT, "/show?limit=100", n_clients, args.requests))
+    flask_server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+"""Compare checking and setting deadlines one command per task with bulk commands.
+
+Every task of a 200,000 task list is checked, unchecked and given a deadline, once
+with one command per task and once with a single range command. The bulk commands
+resolve the IDs once, change the store in one pass and write one summary line.
+
+Run from the python/ directory:
+    python -m benchmarks.bulk_mutations
+"""
+from benchmarks.common import build_task_list, report, time_call
+from columnar_task_store import ColumnarTaskStore
+from task_store import TaskStore
+
+N_TASKS = 200_000
+
+
+def main():
+    print(f"{N_TASKS:,} tasks, time per task")
+    for store_type in (TaskStore, ColumnarTaskStore):
+        task_list = build_task_list(N_TASKS, store=store_type())
+        # Build the deadline index, so its upkeep is part of the deadline timings
+        task_list._deadline_index.count_before(0)
+
+        def one_by_one(command):
+            for task_id in range(1, N_TASKS + 1):
+                task_list.execute(command.format(task_id))
+            task_list._deadline_index.count_before(0)
+
+        def bulk(command):
+            task_list.execute(command.format(f"1-{N_TASKS}"))
+            task_list._deadline_index.count_before(0)
+
+        for command in ("check {}", "uncheck {}", "deadline {} 01-01-2026"):
+            name = command.split()[0]
+            report(f"  {store_type.__name__}, {name} per task", time_call(lambda: one_by_one(command), repeat=3), N_TASKS)
+            report(f"  {store_type.__name__}, {name} range", time_call(lambda: bulk(command), repeat=3), N_TASKS)
+
+
+if __name__ == "__main__":
+    main()
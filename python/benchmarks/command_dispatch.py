@@ -0,0 +1,89 @@
+"""Measure the overhead of dispatching a command, without the work of the command itself.
+
+Compares the if/elif chain execute used to be, which also built a TaskAnalytics for
+every command, with a lookup in the command registry. Handlers do nothing, so the
+difference is the dispatch alone. show is first in the chain, help last, and unknown
+commands go through every comparison.
+
+Run from the python/ directory:
+    python -m benchmarks.command_dispatch
+"""
+from benchmarks.common import report, time_call
+from command_registry import Command, CommandRegistry
+from task_analytics import TaskAnalytics
+
+CHAIN = [
+    "show", "add", "check", "uncheck", "deadline", "today", "view-by-deadline", "import",
+    "export", "import-binary", "export-binary", "summary", "top-projects",
+    "find-tasks-by-keyword", "find-overdue", "help",
+]
+N_CALLS = 200_000
+
+
+def handler(task_list, arguments):
+    return arguments
+
+
+def chain_dispatch(command_line):
+    analytics = TaskAnalytics()
+    parts = command_line.split(" ", 1)
+    command = parts[0]
+    arguments = parts[1] if len(parts) > 1 else ""
+    if command == "show":
+        return handler(None, arguments)
+    elif command == "add":
+        return handler(None, arguments)
+    elif command == "check":
+        return handler(None, arguments)
+    elif command == "uncheck":
+        return handler(None, arguments)
+    elif command == "deadline":
+        return handler(None, arguments)
+    elif command == "today":
+        return handler(None, arguments)
+    elif command == "view-by-deadline":
+        return handler(None, arguments)
+    elif command == "import":
+        return handler(None, arguments)
+    elif command == "export":
+        return handler(None, arguments)
+    elif command == "import-binary":
+        return handler(None, arguments)
+    elif command == "export-binary":
+        return handler(None, arguments)
+    elif command == "summary":
+        return handler(None, arguments)
+    elif command == "top-projects":
+        return handler(None, arguments)
+    elif command == "find-tasks-by-keyword":
+        return handler(None, arguments)
+    elif command == "find-overdue":
+        return handler(None, arguments)
+    elif command == "help":
+        return handler(None, arguments)
+    else:
+        return handler(None, command)
+
+
+REGISTRY = CommandRegistry(Command(name, handler) for name in CHAIN)
+
+
+def registry_dispatch(command_line):
+    name, _, arguments = command_line.partition(" ")
+    command = REGISTRY.get(name)
+    if command is None:
+        return handler(None, name)
+    return command.run(None, arguments)
+
+
+def main():
+    print(f"dispatch overhead per command, {N_CALLS:,} calls")
+    for command_line in ["show", "find-overdue 01-01-2026", "help", "frobnicate"]:
+        for label, dispatch in [("if/elif chain", chain_dispatch), ("registry", registry_dispatch)]:
+            calls = [command_line] * N_CALLS
+            seconds = time_call(lambda: [dispatch(line) for line in calls])
+            report(f"  {command_line.split()[0]}, {label}", seconds, N_CALLS)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,31 @@
+import io
+import time
+from typing import Callable, Optional
+
+from task_list import TaskList
+from task_store import TaskStore
+
+
+def build_task_list(n_tasks: int, n_projects: int = 100, store: Optional[TaskStore] = None) -> TaskList:
+    """Build a TaskList with n_tasks tasks spread round-robin over n_projects projects."""
+    task_list = TaskList(io.StringIO(), io.StringIO(), store)
+    projects = [f"project{i}" for i in range(n_projects)]
+    for project in projects:
+        task_list._add_project(project)
+    for i in range(n_tasks):
+        task_list._add_task(projects[i % n_projects], f"Task number {i}")
+    return task_list
+
+
+def time_call(function: Callable[[], object], repeat: int = 5) -> float:
+    """Return the best wall-clock time in seconds over `repeat` runs."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def report(label: str, seconds: float, per: int = 1) -> None:
+    print(f"{label:<48} {seconds * 1e6 / per:>12.2f} us")
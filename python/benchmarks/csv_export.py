@@ -0,0 +1,49 @@
+"""Compare exporting through a DataFrame with streaming rows straight from the store.
+
+Run from the python/ directory:
+    python -m benchmarks.csv_export
+"""
+import os
+import time
+import tracemalloc
+
+from benchmarks.common import build_task_list
+from columnar_task_store import ColumnarTaskStore
+from task_analytics import TaskAnalytics
+from task_csv import export_store_to_csv
+from task_store import TaskStore
+
+SIZES = [100_000, 1_000_000]
+PATH = "benchmark_export.csv"
+
+
+def dataframe_export(task_list):
+    analytics = TaskAnalytics()
+    analytics.export_to_csv(analytics.import_from_dict(task_list._store.to_dict()), PATH)
+
+
+def measure(label, function):
+    tracemalloc.start()
+    start = time.perf_counter()
+    function()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"  {label:<40} {elapsed:>8.2f} s   peak {peak / 2**20:>8.1f} MiB")
+
+
+def main():
+    try:
+        for size in SIZES:
+            print(f"{size:,} tasks")
+            for name, store_type in {"dict": TaskStore, "columnar": ColumnarTaskStore}.items():
+                task_list = build_task_list(size, store=store_type())
+                measure(f"DataFrame export, {name} store", lambda: dataframe_export(task_list))
+                measure(f"streaming export, {name} store", lambda: export_store_to_csv(task_list._store, PATH))
+    finally:
+        if os.path.exists(PATH):
+            os.remove(PATH)
+
+
+if __name__ == "__main__":
+    main()
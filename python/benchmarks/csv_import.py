@@ -0,0 +1,98 @@
+"""Measure time and peak memory of the streaming CSV import on a generated file.
+
+Every import runs in its own process so that the peak resident set size belongs to it.
+Generating 40 million rows gives a file of about 2 GB.
+
+Run from the python/ directory:
+    python -m benchmarks.csv_import --rows 40000000 --path /tmp/tasks.csv
+"""
+import argparse
+import io
+import os
+import resource
+import subprocess
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from task import Task
+from task_analytics import TaskAnalytics
+from task_list import TaskList
+
+CHUNK_ROWS = 1_000_000
+# The previous import path loads the whole file at once; only compare it on small files
+MAX_FULL_LOAD_ROWS = 2_000_000
+
+
+def generate_csv(path, rows, projects=1_000, seed=42):
+    rng = np.random.default_rng(seed)
+    with open(path, 'w') as file:
+        file.write("project_name,task_id,description,done,deadline\n")
+        for start in range(0, rows, CHUNK_ROWS):
+            count = min(CHUNK_ROWS, rows - start)
+            deadlines = pd.Series(pd.Timestamp('2024-01-01') + pd.to_timedelta(rng.integers(0, 1_000, count), unit='D'))
+            chunk = pd.DataFrame({
+                'project_name': pd.Series(rng.integers(0, projects, count)).map(lambda code: f"project{code}"),
+                'task_id': np.arange(start + 1, start + count + 1),
+                'description': pd.Series(rng.integers(0, 50_000, count)).map(lambda code: f"Task description {code}"),
+                'done': rng.random(count) < 0.3,
+                'deadline': deadlines.where(rng.random(count) < 0.5),
+            })
+            chunk.to_csv(file, header=False, index=False, date_format='%d-%m-%Y')
+
+
+def full_load_import(path):
+    analytics = TaskAnalytics()
+    df = analytics.import_from_csv(path)
+    df['task'] = df.apply(lambda x: Task(x['task_id'], x['description'], x['done']), axis=1)
+    return analytics.export_to_dict(df)
+
+
+def measure(mode, path, store):
+    start = time.perf_counter()
+    if mode == "full":
+        full_load_import(path)
+    else:
+        task_list = TaskList(io.StringIO(), io.StringIO(), make_store(store))
+        task_list.execute(f"import {path}")
+    elapsed = time.perf_counter() - start
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(f"{mode + ' import, ' + store + ' store':<40} {elapsed:>8.2f} s   peak RSS {peak:>8.0f} MiB")
+
+
+def make_store(store):
+    if store == "columnar":
+        from columnar_task_store import ColumnarTaskStore
+        return ColumnarTaskStore()
+    from task_store import TaskStore
+    return TaskStore()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--path", default="benchmark_tasks.csv")
+    parser.add_argument("--measure", choices=["full", "streaming"])
+    parser.add_argument("--store", default="dict", choices=["dict", "columnar"])
+    args = parser.parse_args()
+
+    if args.measure:
+        measure(args.measure, args.path, args.store)
+        return
+
+    generate_csv(args.path, args.rows)
+    print(f"{args.rows:,} rows, {os.path.getsize(args.path) / 2**20:,.0f} MiB")
+    runs = [("streaming", "dict"), ("streaming", "columnar")]
+    if args.rows <= MAX_FULL_LOAD_ROWS:
+        runs.insert(0, ("full", "dict"))
+    try:
+        for mode, store in runs:
+            subprocess.run([sys.executable, "-m", "benchmarks.csv_import", "--measure", mode, "--store", store, "--path", args.path], check=True)
+    finally:
+        os.remove(args.path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""Compare today, view-by-deadline and find-overdue with and without the sorted deadline index.
+
+Run from the python/ directory:
+    python -m benchmarks.deadline_index
+"""
+import io
+import random
+from datetime import date, datetime, timedelta
+
+from benchmarks.common import build_task_list, report, time_call
+from output_sink import OutputSink
+from task_analytics import TaskAnalytics
+
+SIZES = [10_000, 100_000, 1_000_000]
+
+
+
+def scan_today(tasks):
+    output = ''
+    current_date = datetime.today().strftime('%d-%m-%Y')
+    for project_name, project_tasks in tasks.items():
+        show_project = False
+        for task in project_tasks:
+            if task.deadline == current_date:
+                if not show_project:
+                    output += f"{project_name}\n"
+                    show_project = True
+                status = 'x' if task.done else ' '
+                output += f"    [{status}] {task.id}: {task.description}\n"
+        output += "\n"
+    return output
+
+
+def scan_view_by_deadline(tasks):
+    output = ''
+    tasks_organized = {}
+    for project_name, tasks_in_project in tasks.items():
+        for task in tasks_in_project:
+            task_deadline = task.deadline if len(task.deadline) else "No deadline"
+            tasks_organized.setdefault(task_deadline, {}).setdefault(project_name, []).append(task)
+    for deadline in sorted(tasks_organized.keys(), key=lambda date: "-".join(date.split("-")[::-1])):
+        output += f"{deadline}:\n"
+        for project_name in sorted(tasks_organized[deadline].keys()):
+            output += f"  {project_name}:\n"
+            for task in tasks_organized[deadline][project_name]:
+                output += f"    {task.id}: {task.description}\n"
+    return output
+
+
+def add_deadlines(task_list, size, rng):
+    start = date.today() - timedelta(days=365)
+    for task_id in range(1, size + 1, 2):
+        deadline = start + timedelta(days=rng.randrange(3 * 365))
+        task_list._store.set_deadline(task_id, deadline.strftime('%d-%m-%Y'))
+
+
+def main():
+    rng = random.Random(42)
+    analytics = TaskAnalytics()
+    overdue_dates = {
+        "find-overdue today": date.today().strftime('%d-%m-%Y'),
+        "find-overdue 11 months ago": (date.today() - timedelta(days=330)).strftime('%d-%m-%Y'),
+    }
+    for size in SIZES:
+        task_list = build_task_list(size)
+        add_deadlines(task_list, size, rng)
+        task_list._output = OutputSink(io.StringIO())
+        tasks = task_list._store.to_dict()
+        df = task_list._analytics_view.frame()
+        print(f"{size:,} tasks, {size // 2:,} with a deadline")
+        report("  build deadline index", time_call(lambda: task_list._deadline_index.due_on(0), repeat=1))
+        report("  today, scan", time_call(lambda: scan_today(tasks), repeat=1))
+        report("  today, index", time_call(task_list._today, repeat=3))
+        report("  view-by-deadline, scan", time_call(lambda: scan_view_by_deadline(tasks), repeat=1))
+        report("  view-by-deadline, index", time_call(task_list._view_by_deadline, repeat=1))
+        for label, overdue_date in overdue_dates.items():
+            report(f"  {label}, scan", time_call(lambda: analytics.find_overdue_tasks(df, overdue_date), repeat=3))
+            report(f"  {label}, index", time_call(lambda: analytics.find_overdue_tasks(df, overdue_date, task_list._deadline_index), repeat=3))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""Seeded generator of realistic task lists for the benchmarks.
+
+The same seed and parameters give the same tasks on every machine:
+- project sizes follow a Zipf-like law, project k getting a share proportional to
+  1 / k ** project_skew, so a few projects hold most of the tasks
+- a done_ratio share of the tasks is done
+- a deadline_ratio share has a deadline, spread uniformly over deadline_days days
+  around REFERENCE_DATE, so that about half of those are overdue on that date
+- descriptions are 3 to 8 words drawn from a vocabulary of made-up words, with
+  Zipf-like word frequencies, so that some words are in many descriptions
+"""
+import io
+from datetime import date
+from typing import List, Optional
+
+import numpy as np
+import pandas as pd
+
+from task_list import TaskList
+from task_store import TaskStore
+
+REFERENCE_DATE = date(2026, 1, 1)
+SYLLABLES = ["ka", "lo", "mi", "ne", "ru", "sa", "to", "vi", "ze", "do", "fa", "gu", "pe", "ri", "sho", "tam"]
+
+
+class TaskListSpec:
+    """Parameters of a generated task list, see the module docstring."""
+
+    def __init__(self, n_tasks: int, tasks_per_project: int = 100, project_skew: float = 1.0, done_ratio: float = 0.3,
+                 deadline_ratio: float = 0.5, deadline_days: int = 365, vocabulary_size: int = 2_000, seed: int = 42):
+        self.n_tasks = n_tasks
+        # On average; the skew makes the first projects much larger
+        self.n_projects = max(n_tasks // tasks_per_project, 1)
+        self.project_skew = project_skew
+        self.done_ratio = done_ratio
+        self.deadline_ratio = deadline_ratio
+        self.deadline_days = deadline_days
+        self.vocabulary_size = vocabulary_size
+        self.seed = seed
+
+
+def vocabulary(size: int, rng: np.random.Generator) -> List[str]:
+    """size distinct made-up words of two to four syllables."""
+    words = {}
+    while len(words) < size:
+        n_syllables = int(rng.integers(2, 5))
+        word = ''.join(SYLLABLES[i] for i in rng.integers(0, len(SYLLABLES), n_syllables))
+        words.setdefault(word, None)
+    return list(words)
+
+
+def zipf_weights(n: int, skew: float) -> np.ndarray:
+    weights = 1.0 / np.arange(1, n + 1) ** skew
+    return weights / weights.sum()
+
+
+def generate_frame(spec: TaskListSpec) -> pd.DataFrame:
+    """The tasks of spec as a frame like TaskAnalytics.read_csv_chunks returns, ordered by project."""
+    rng = np.random.default_rng(spec.seed)
+    sizes = rng.multinomial(spec.n_tasks, zipf_weights(spec.n_projects, spec.project_skew))
+    project_names = [f"project{p}" for p in range(spec.n_projects)]
+    projects = np.repeat(np.arange(spec.n_projects), sizes)
+
+    words = np.array(vocabulary(spec.vocabulary_size, rng), dtype=object)
+    word_weights = zipf_weights(spec.vocabulary_size, 1.0)
+    n_words = rng.integers(3, 9, spec.n_tasks)
+    drawn = words[rng.choice(spec.vocabulary_size, int(n_words.sum()), p=word_weights)].tolist()
+    bounds = np.concatenate([[0], np.cumsum(n_words)]).tolist()
+    descriptions = [' '.join(drawn[start:stop]).capitalize() + '.' for start, stop in zip(bounds[:-1], bounds[1:])]
+
+    offsets = rng.integers(-spec.deadline_days // 2, spec.deadline_days - spec.deadline_days // 2, spec.n_tasks)
+    deadlines = pd.Timestamp(REFERENCE_DATE) + pd.to_timedelta(offsets, unit='D')
+    return pd.DataFrame({
+        'project_name': np.array(project_names, dtype=object)[projects],
+        'task_id': np.arange(1, spec.n_tasks + 1),
+        'description': descriptions,
+        'done': pd.array(rng.random(spec.n_tasks) < spec.done_ratio, dtype='boolean'),
+        'deadline': pd.Series(deadlines).where(rng.random(spec.n_tasks) < spec.deadline_ratio),
+    })
+
+
+def generate_task_list(spec: TaskListSpec, store: Optional[TaskStore] = None) -> TaskList:
+    """A TaskList holding the tasks of spec, in the given kind of store."""
+    store = store if store is not None else TaskStore()
+    store.extend_from_frame(generate_frame(spec))
+    return TaskList(io.StringIO(), io.StringIO(), store)
@@ -0,0 +1,37 @@
+"""Measure what command timing adds to a command, with and without stats on.
+
+Runs check and show on a small list, where the instrumentation is the largest share
+of a command, and summary on a large one, where it is not.
+
+Run from the python/ directory:
+    python -m benchmarks.instrumentation
+"""
+import io
+
+from benchmarks.common import build_task_list, report, time_call
+from output_sink import OutputSink
+
+N_CALLS = 100_000
+# (command, tasks, projects, calls)
+COMMANDS = [("check 1", 10, 1, N_CALLS), ("show", 10, 1, N_CALLS), ("summary", 100_000, 100, 20)]
+
+
+def run(task_list, command, n_calls):
+    for _ in range(n_calls):
+        task_list.execute(command)
+        # Every summary is computed, not served from the result cache
+        task_list._results.on_loaded()
+
+
+def main():
+    print("time per command")
+    for command, n_tasks, n_projects, n_calls in COMMANDS:
+        task_list = build_task_list(n_tasks, n_projects)
+        task_list._output = OutputSink(io.StringIO())
+        for timing in ("off", "on"):
+            task_list.execute(f"stats {timing}")
+            report(f"  {command}, {n_tasks:,} tasks, stats {timing}", time_call(lambda: run(task_list, command, n_calls), repeat=3), n_calls)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+"""Measure the cost of journaling mutations, with an fsync per change and with group commit.
+
+Run from the python/ directory:
+    python -m benchmarks.journal_append
+"""
+import io
+import shutil
+import tempfile
+
+from benchmarks.common import report, time_call
+from task_list import TaskList
+
+N_TASKS = 10_000
+
+
+def add_tasks(journal_directory=None, group_commit_size=None):
+    task_list = TaskList(io.StringIO(), io.StringIO(), journal_directory=journal_directory)
+    if group_commit_size is not None:
+        task_list._journal.GROUP_COMMIT_SIZE = group_commit_size
+    task_list.execute("add project load")
+    for i in range(N_TASKS):
+        task_list.execute(f"add task load Task {i}")
+    task_list.close()
+
+
+def journaled(group_commit_size):
+    def run():
+        directory = tempfile.mkdtemp()
+        try:
+            add_tasks(directory, group_commit_size)
+        finally:
+            shutil.rmtree(directory)
+    return run
+
+
+def main():
+    print(f"{N_TASKS:,} x add task")
+    report("no journal", time_call(add_tasks, repeat=3), N_TASKS)
+    report("journal, fsync per change", time_call(journaled(1), repeat=3), N_TASKS)
+    report("journal, group commit", time_call(journaled(None), repeat=3), N_TASKS)
+
+
+if __name__ == "__main__":
+    main()
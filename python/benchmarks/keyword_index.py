@@ -0,0 +1,52 @@
+"""Compare find_tasks_by_keyword with a full scan and with the trigram keyword index.
+
+Run from the python/ directory:
+    python -m benchmarks.keyword_index
+"""
+import io
+import random
+
+from benchmarks.common import report, time_call
+from task_analytics import TaskAnalytics
+from task_list import TaskList
+
+SIZE = 1_000_000
+PROJECTS = 100
+VOCABULARY = [
+    "review", "design", "deploy", "refactor", "document", "test", "release", "budget", "meeting", "client",
+    "report", "invoice", "migrate", "database", "backend", "frontend", "customer", "onboarding", "security", "audit",
+]
+KEYWORDS = ["review", "budget meeting", "onboarding", "zebra", "mig"]
+
+
+def build_task_list(size, rng):
+    task_list = TaskList(io.StringIO(), io.StringIO())
+    projects = [f"project{i}" for i in range(PROJECTS)]
+    for project in projects:
+        task_list._add_project(project)
+    for i in range(size):
+        words = rng.sample(VOCABULARY, 4)
+        task_list._add_task(projects[i % PROJECTS], f"{' '.join(words)} #{i}")
+    return task_list
+
+
+def main():
+    rng = random.Random(42)
+    analytics = TaskAnalytics()
+    task_list = build_task_list(SIZE, rng)
+    df = task_list._analytics_view.frame()
+    index = task_list._keyword_index
+
+    print(f"{SIZE:,} descriptions")
+    report("  build keyword index", time_call(lambda: (index.on_loaded(), index.candidates("abc")), repeat=1))
+    for keyword in KEYWORDS:
+        scan = time_call(lambda: analytics.find_tasks_by_keyword(df, keyword), repeat=1)
+        indexed = time_call(lambda: analytics.find_tasks_by_keyword(df, keyword, keyword_index=index), repeat=3)
+        matches = len(analytics.find_tasks_by_keyword(df, keyword, keyword_index=index))
+        print(f"  '{keyword}' ({matches:,} matches)")
+        report("    full scan", scan)
+        report("    keyword index", indexed)
+
+
+if __name__ == "__main__":
+    main()
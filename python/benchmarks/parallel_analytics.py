@@ -0,0 +1,65 @@
+"""Compare the serial TaskAnalytics with ParallelTaskAnalytics on a large task frame.
+
+Times summary, a keyword scan and an overdue scan, without indexes, for each number
+of workers. The first parallel query also starts the worker processes, so every
+query is run once before it is timed. Speedups need as many idle cores as workers;
+on a single core the parallel version only adds the cost of sharing the columns.
+
+Run from the python/ directory:
+    python -m benchmarks.parallel_analytics --tasks 2000000 --workers 1 2 4 8
+"""
+import argparse
+import os
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.common import report, time_call
+from parallel_analytics import ParallelTaskAnalytics
+from task_analytics import TaskAnalytics
+
+
+def task_frame(n_tasks, n_projects=1_000, seed=42):
+    rng = np.random.default_rng(seed)
+    deadlines = pd.Timestamp('2024-01-01') + pd.to_timedelta(rng.integers(0, 1_000, n_tasks), unit='D')
+    return pd.DataFrame({
+        'project_name': pd.Series(rng.integers(0, n_projects, n_tasks)).map(lambda code: f"project{code}"),
+        'task_id': np.arange(1, n_tasks + 1),
+        'description': pd.Series(rng.integers(0, 50_000, n_tasks)).map(lambda code: f"Task description {code}"),
+        'done': rng.random(n_tasks) < 0.3,
+        'deadline': deadlines.where(rng.random(n_tasks) < 0.5),
+    })
+
+
+def queries(analytics, df):
+    return [
+        ("summary", lambda: analytics.get_project_summary(df)),
+        ("keyword scan (regex)", lambda: analytics.find_tasks_by_keyword(df, "description 4[0-9]+7$")),
+        ("overdue scan", lambda: analytics.find_overdue_tasks(df, "01-06-2025")),
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tasks", type=int, default=2_000_000)
+    parser.add_argument("--workers", type=int, nargs="+", default=sorted({1, 2, os.cpu_count() or 1}))
+    args = parser.parse_args()
+    warnings.simplefilter("ignore")
+
+    df = task_frame(args.tasks)
+    print(f"{args.tasks:,} tasks, {os.cpu_count()} cores")
+    for label, query in queries(TaskAnalytics(), df):
+        report(f"  {label}, serial", time_call(query, repeat=3))
+    for workers in args.workers:
+        analytics = ParallelTaskAnalytics(workers)
+        try:
+            for label, query in queries(analytics, df):
+                query()
+                report(f"  {label}, {workers} workers", time_call(query, repeat=3))
+        finally:
+            analytics.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""Compare the per-project aggregations against the previous groupby/lambda implementation.
+
+Run from the python/ directory:
+    python -m benchmarks.project_summary
+"""
+import numpy as np
+import pandas as pd
+
+from benchmarks.common import report, time_call
+from task_analytics import TaskAnalytics
+
+SIZES = [1_000, 100_000, 1_000_000]
+# Few projects with many tasks each, and many projects with a couple of tasks each
+PROJECT_COUNTS = {"few projects": lambda rows: 10, "many projects": lambda rows: max(1, rows // 2)}
+# The lambda implementation takes minutes beyond this many projects
+MAX_LAMBDA_GROUPS = 100_000
+
+
+def lambda_project_summary(df):
+    return df.groupby(['project_name'], as_index=False).agg(
+        total_tasks=('task_id', 'count'),
+        completed_tasks=('done', lambda x: int(x.sum(skipna=True))),
+        pending_tasks=('done', lambda x: x.count() - x.sum(skipna=True)),
+        completion_rate=('done', lambda x: 100 * np.mean(x))
+    )
+
+
+def lambda_top_projects(df, n):
+    return df.groupby(['project_name'], as_index=False).agg(completion_rate=('done', lambda x: 100 * np.mean(x))).sort_values(by=['completion_rate'], ascending=False).head(n)
+
+
+def build_frame(rows, projects, rng):
+    return pd.DataFrame({
+        'project_name': pd.Series(rng.integers(0, projects, rows)).map(lambda code: f"project{code}"),
+        'task_id': np.arange(1, rows + 1),
+        'description': "Task",
+        'done': rng.random(rows) < 0.5,
+        'deadline': pd.NaT,
+    })
+
+
+def main():
+    rng = np.random.default_rng(42)
+    analytics = TaskAnalytics()
+    for rows in SIZES:
+        for label, project_count in PROJECT_COUNTS.items():
+            projects = project_count(rows)
+            df = build_frame(rows, projects, rng)
+            print(f"{rows:,} rows, {label} ({projects:,})")
+            report("  get_project_summary", time_call(lambda: analytics.get_project_summary(df), repeat=3))
+            report("  get_top_projects_by_completion(5)", time_call(lambda: analytics.get_top_projects_by_completion(df, 5), repeat=3))
+            if projects <= MAX_LAMBDA_GROUPS:
+                report("  lambda project summary", time_call(lambda: lambda_project_summary(df), repeat=1))
+                report("  lambda top projects(5)", time_call(lambda: lambda_top_projects(df, 5), repeat=1))
+
+
+if __name__ == "__main__":
+    main()
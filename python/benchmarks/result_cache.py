@@ -0,0 +1,43 @@
+"""Compare repeating dashboard queries with and without the result cache.
+
+Polls summary, top-projects and find-overdue on an unchanged task list, the first
+round computing every result, the later ones answered from the cache, and then
+after every single change, which empties the cache.
+
+Run from the python/ directory:
+    python -m benchmarks.result_cache
+"""
+import io
+
+from benchmarks.common import build_task_list, report, time_call
+from output_sink import OutputSink
+
+N_TASKS = 100_000
+QUERIES = ["summary", "top-projects 10", "find-overdue 01-01-2026"]
+
+
+def poll(task_list):
+    for query in QUERIES:
+        task_list.execute(query)
+
+
+def main():
+    task_list = build_task_list(N_TASKS)
+    task_list._output = OutputSink(io.StringIO())
+    for task_id in range(1, N_TASKS, 7):
+        task_list.execute(f"deadline {task_id} 01-01-2025")
+    poll(task_list)
+    print(f"{len(QUERIES)} queries on {N_TASKS:,} tasks, time per query")
+
+    def changed_then_poll():
+        task_list.execute("check 1")
+        poll(task_list)
+
+    report("  after a change (cache emptied)", time_call(changed_then_poll), len(QUERIES))
+    report("  unchanged tasks (cache hits)", time_call(lambda: poll(task_list)), len(QUERIES))
+    results = task_list._results
+    print(f"  hits {results.hits}, misses {results.misses}")
+
+
+if __name__ == "__main__":
+    main()
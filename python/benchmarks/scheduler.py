@@ -0,0 +1,92 @@
+"""Measure what the background scheduler takes off the command path.
+
+- Snapshots: how long the lock is held to copy the columns of the store, against
+  exporting the snapshot inside a command with export-binary.
+- Daily views: today and find-overdue after a change to a due and an overdue task,
+  computed by the command itself against served from the views the scheduler
+  computed at midnight, and after a change to a task that is neither, which keeps
+  the views.
+
+Run from the python/ directory:
+    python -m benchmarks.scheduler
+"""
+import io
+import os
+import tempfile
+import time
+from datetime import date
+
+from benchmarks.common import build_task_list, report, time_call
+from columnar_task_store import ColumnarTaskStore
+from output_sink import OutputSink
+from task_scheduler import TaskScheduler
+from task_store import TaskStore
+
+N_TASKS = 200_000
+
+
+def main():
+    today = f"{date.today():%d-%m-%Y}"
+    daily = ["today", f"find-overdue {today}"]
+    print(f"{N_TASKS:,} tasks")
+    for store_type in (TaskStore, ColumnarTaskStore):
+        task_list = build_task_list(N_TASKS, store=store_type())
+        task_list._output = OutputSink(io.StringIO())
+        task_list.execute(f"deadline 1-{N_TASKS // 10} 01-01-2020")
+        task_list.execute(f"deadline {N_TASKS // 10 + 1}-{N_TASKS // 5} {today}")
+        name = store_type.__name__
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "tasks.npz")
+            locked = []
+
+            def timed_lock(command):
+                # The scheduler holds the lock for as long as this context is entered
+                class Timed:
+                    def __enter__(self):
+                        self.start = time.perf_counter()
+
+                    def __exit__(self, *exc):
+                        locked.append(time.perf_counter() - self.start)
+                return Timed()
+
+            scheduler = TaskScheduler(task_list, timed_lock, path)
+
+            def scheduled_snapshot():
+                task_list.execute("check 1")
+                scheduler.snapshot()
+
+            report(f"  {name}, export-binary in the command", time_call(lambda: task_list.execute(f"export-binary {path}"), repeat=3))
+            report(f"  {name}, scheduled snapshot, total", time_call(scheduled_snapshot, repeat=3))
+            report(f"  {name}, scheduled snapshot, lock held", min(locked))
+
+        # Task 1 is overdue, and the first task of the second tenth is due today
+        relevant = ["check 1", f"check {N_TASKS // 10 + 1}"]
+
+        def computed():
+            for command in relevant + daily:
+                task_list.execute(command)
+
+        def precomputed():
+            for command in relevant:
+                task_list.execute(command)
+            task_list.refresh_daily_views()
+            start = time.perf_counter()
+            for command in daily:
+                task_list.execute(command)
+            served.append(time.perf_counter() - start)
+
+        served = []
+        report(f"  {name}, today + find-overdue computed", time_call(computed, repeat=3))
+        time_call(precomputed, repeat=3)
+        report(f"  {name}, today + find-overdue precomputed", min(served))
+
+        def after_unrelated_change():
+            task_list.execute(f"check {N_TASKS}")
+            for command in daily:
+                task_list.execute(command)
+
+        report(f"  {name}, today + find-overdue kept", time_call(after_unrelated_change, repeat=3))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""Compare running a command log through the interactive loop with script mode.
+
+The log adds projects, then tasks project by project, then checks every third task,
+the shape of a replayed command history. Both runs write to /dev/null; the
+interactive loop prompts and flushes for every command, script mode groups the add
+task and check commands into bulk store operations and flushes in blocks.
+
+Run from the python/ directory:
+    python -m benchmarks.script_mode
+"""
+import io
+import os
+
+from benchmarks.common import report, time_call
+from columnar_task_store import ColumnarTaskStore
+from task_list import TaskList
+from task_store import TaskStore
+
+N_PROJECTS = 100
+N_TASKS = 200_000
+
+
+def command_log():
+    lines = [f"add project project{p}\n" for p in range(N_PROJECTS)]
+    per_project = N_TASKS // N_PROJECTS
+    for p in range(N_PROJECTS):
+        lines.extend(f"add task project{p} Task number {i}\n" for i in range(per_project))
+    lines.extend(f"check {task_id}\n" for task_id in range(3, N_TASKS + 1, 3))
+    lines.append("quit\n")
+    return ''.join(lines)
+
+
+def main():
+    log = command_log()
+    n_commands = log.count("\n")
+    print(f"command log with {n_commands:,} commands, time per command")
+    with open(os.devnull, 'w') as devnull:
+        for store_type in (TaskStore, ColumnarTaskStore):
+            interactive = lambda: TaskList(io.StringIO(log), devnull, store_type()).run()
+            script = lambda: TaskList(io.StringIO(log), devnull, store_type()).run_script()
+            report(f"  {store_type.__name__}, interactive loop", time_call(interactive, repeat=3), n_commands)
+            report(f"  {store_type.__name__}, script mode", time_call(script, repeat=3), n_commands)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""Compare rendering show line by line with rendering it once and writing it in one call.
+
+Also times the first page of show, which does not depend on the size of the list.
+The line-by-line version is how show used to work: a write and a string concatenation
+per line, and a flush at the end. Output goes to /dev/null, standing in for stdout
+redirected to a file, and to a pipe drained by another thread.
+
+Run from the python/ directory:
+    python -m benchmarks.show_output
+"""
+import io
+import os
+import threading
+
+from benchmarks.common import build_task_list, report, time_call
+from output_sink import OutputSink
+
+N_TASKS = 100_000
+
+
+def line_by_line_show(store, stream):
+    output = ''
+    for project_name, tasks in store.items():
+        output_project = f"{project_name}\n"
+        stream.write(output_project)
+        stream.flush()
+        output += output_project
+        for task in tasks:
+            status = 'x' if task.done else ' '
+            deadline = f' (Deadline: {task.deadline})' if len(task.deadline) >= 1 else ''
+            output_task = f"    [{status}] {task.id}: {task.description}{deadline}\n"
+            stream.write(output_task)
+            stream.flush()
+            output += output_task
+        stream.write("\n")
+        output += "\n"
+    stream.flush()
+    return output
+
+
+def drain(descriptor):
+    while os.read(descriptor, 1 << 16):
+        pass
+
+
+def run(label, stream, task_list):
+    task_list._output = OutputSink(stream)
+    report(f"  {label}, line by line", time_call(lambda: line_by_line_show(task_list._store, stream), repeat=3))
+    report(f"  {label}, rendered once", time_call(task_list._show, repeat=3))
+
+
+def main():
+    task_list = build_task_list(N_TASKS)
+    print(f"show with {N_TASKS:,} tasks")
+    with open(os.devnull, 'w') as devnull:
+        run("stdout to /dev/null", devnull, task_list)
+
+    read_end, write_end = os.pipe()
+    reader = threading.Thread(target=drain, args=(read_end,))
+    reader.start()
+    with os.fdopen(write_end, 'w') as pipe:
+        run("pipe", pipe, task_list)
+    reader.join()
+    os.close(read_end)
+
+    task_list._output = OutputSink(io.StringIO())
+    report("  first page (show --limit 100)", time_call(lambda: task_list.execute("show --limit 100")))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""Compare reloading a task list from a CSV export and from a binary snapshot.
+
+Run from the python/ directory:
+    python -m benchmarks.snapshot_load
+"""
+import io
+import os
+import time
+
+from benchmarks.common import build_task_list
+from columnar_task_store import ColumnarTaskStore
+from task_list import TaskList
+from task_store import TaskStore
+
+SIZES = [100_000, 1_000_000]
+CSV_PATH = "benchmark_snapshot.csv"
+BINARY_PATH = "benchmark_snapshot.npz"
+
+
+def measure(label, function):
+    start = time.perf_counter()
+    function()
+    elapsed = time.perf_counter() - start
+    print(f"  {label:<40} {elapsed:>8.2f} s")
+
+
+def main():
+    try:
+        for size in SIZES:
+            print(f"{size:,} tasks")
+            for name, store_type in {"dict": TaskStore, "columnar": ColumnarTaskStore}.items():
+                task_list = build_task_list(size, store=store_type())
+                # Every tenth task gets a deadline, spread over a year
+                for task_id in range(1, size + 1, 10):
+                    task_list._store.set_deadline(task_id, f"{task_id % 28 + 1:02d}-{task_id % 12 + 1:02d}-2026")
+                task_list.execute(f"export {CSV_PATH}")
+                measure(f"export-binary, {name} store", lambda: task_list.execute(f"export-binary {BINARY_PATH}"))
+                print(f"  {'file size CSV / binary':<40} {os.path.getsize(CSV_PATH) / 2**20:>8.1f} / {os.path.getsize(BINARY_PATH) / 2**20:.1f} MiB")
+                loaded = TaskList(io.StringIO(), io.StringIO(), store_type())
+                measure(f"import (CSV), {name} store", lambda: loaded.execute(f"import {CSV_PATH}"))
+                measure(f"import-binary, {name} store", lambda: loaded.execute(f"import-binary {BINARY_PATH}"))
+    finally:
+        for path in (CSV_PATH, BINARY_PATH):
+            if os.path.exists(path):
+                os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
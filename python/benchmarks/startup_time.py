@@ -0,0 +1,89 @@
+"""Measure how long the console application takes to start, and guard against regressions.
+
+Each measurement runs a fresh interpreter from this directory:
+- the cumulative import time of task_list, as reported by python -X importtime
+- the wall-clock time of a short script through task_list_application.py --script,
+  using only show/add/check, compared with the same script followed by summary
+
+Exits with status 1 when importing task_list takes longer than --budget-ms, or when
+the short script imports pandas or numpy.
+
+Run from the python/ directory:
+    python -m benchmarks.startup_time --budget-ms 150
+"""
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+HERE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SCRIPT = "add project secrets\nadd task secrets Eat more donuts.\ncheck 1\nshow\n"
+HEAVY_MODULES = ("pandas", "numpy")
+
+
+def import_time_ms(module):
+    """Cumulative import time of a module in a fresh interpreter, in milliseconds."""
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                            cwd=HERE, capture_output=True, text=True, check=True)
+    for line in result.stderr.splitlines():
+        fields = [field.strip() for field in line.split("|")]
+        if len(fields) == 3 and fields[2] == module:
+            return int(fields[1]) / 1000
+    raise RuntimeError(f"no import time reported for {module}")
+
+
+def heavy_modules_loaded(script):
+    """The heavy modules that running the script in the console application imports."""
+    code = (
+        "import io, sys\n"
+        "from task_list import TaskList\n"
+        f"TaskList(io.StringIO({script!r}), io.StringIO()).run_script()\n"
+        f"print(' '.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))\n"
+    )
+    result = subprocess.run([sys.executable, "-c", code], cwd=HERE, capture_output=True, text=True, check=True)
+    return result.stdout.split()
+
+
+def run_script_seconds(script, repeat=5):
+    with tempfile.NamedTemporaryFile('w', suffix=".txt", delete=False) as file:
+        file.write(script)
+    try:
+        best = float("inf")
+        for _ in range(repeat):
+            start = time.perf_counter()
+            subprocess.run([sys.executable, "task_list_application.py", "--script", file.name],
+                           cwd=HERE, stdout=subprocess.DEVNULL, check=True)
+            best = min(best, time.perf_counter() - start)
+        return best
+    finally:
+        os.unlink(file.name)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--budget-ms", type=float, default=150.0, help="maximum import time of task_list")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    # The first run also writes the bytecode caches
+    import_time_ms("task_list")
+    import_ms = min(import_time_ms("task_list") for _ in range(args.repeat))
+    print(f"{'  import task_list':<48} {import_ms:>12.1f} ms")
+    print(f"{'  script with show/add/check':<48} {run_script_seconds(SCRIPT, args.repeat) * 1e3:>12.1f} ms")
+    print(f"{'  same script followed by summary':<48} {run_script_seconds(SCRIPT + 'summary' + chr(10), args.repeat) * 1e3:>12.1f} ms")
+
+    failures = []
+    if import_ms > args.budget_ms:
+        failures.append(f"importing task_list took {import_ms:.1f} ms, more than the budget of {args.budget_ms:.0f} ms")
+    loaded = heavy_modules_loaded(SCRIPT)
+    if loaded:
+        failures.append(f"show/add/check imported {', '.join(loaded)}")
+    for failure in failures:
+        print(f"REGRESSION: {failure}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
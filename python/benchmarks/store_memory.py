@@ -0,0 +1,37 @@
+"""Compare the memory used by the dict-of-lists and the columnar task stores.
+
+Run from the python/ directory:
+    python -m benchmarks.store_memory
+"""
+import gc
+import tracemalloc
+
+from benchmarks.common import build_task_list, report, time_call
+from columnar_task_store import ColumnarTaskStore
+from task_store import TaskStore
+
+SIZES = [10_000, 100_000, 1_000_000]
+STORES = {"dict": TaskStore, "columnar": ColumnarTaskStore}
+
+
+def measure(store_type, size):
+    gc.collect()
+    tracemalloc.start()
+    task_list = build_task_list(size, store=store_type())
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return task_list, current
+
+
+def main():
+    for size in SIZES:
+        print(f"{size:,} tasks")
+        for name, store_type in STORES.items():
+            task_list, used = measure(store_type, size)
+            print(f"  {name + ' store memory':<46} {used / 2**20:>9.1f} MiB ({used / size:.0f} bytes/task)")
+            report(f"  {name} store show (per task)", time_call(task_list._show, repeat=1), size)
+            del task_list
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,241 @@
+"""Time every console command and every TaskAnalytics method on generated task lists.
+
+The lists come from benchmarks.generator, so a seed gives the same tasks on every
+run. Each benchmark runs once to warm up, then repeatedly for about TARGET_SECONDS
+(at least MIN_REPEAT and at most MAX_REPEAT times); the fastest and the median run
+are kept. Cached commands are timed computing their output, not served from the
+result cache.
+
+Results are written as JSON with --output. With --baseline, they are compared with
+an earlier results file: a benchmark whose fastest run is more than --threshold
+slower than in the baseline (and slower by more than NOISE_FLOOR seconds) is a
+regression, and the suite exits with status 1.
+
+Run from the python/ directory:
+    python -m benchmarks.suite --output results.json
+    python -m benchmarks.suite --baseline results.json --threshold 0.2
+"""
+import argparse
+import json
+import math
+import os
+import platform
+import re
+import statistics
+import sys
+import tempfile
+import time
+import warnings
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.common import report
+from benchmarks.generator import REFERENCE_DATE, TaskListSpec, generate_task_list
+from columnar_task_store import ColumnarTaskStore
+from task_analytics import TaskAnalytics
+from task_list import TaskList
+from task_store import TaskStore
+
+RESULTS_VERSION = 1
+SCALES = [1_000, 10_000, 100_000]
+STORES = {"TaskStore": TaskStore, "ColumnarTaskStore": ColumnarTaskStore}
+TARGET_SECONDS = 0.2
+MIN_REPEAT = 3
+MAX_REPEAT = 1_000
+# Differences below this are timer and scheduling noise, not regressions
+NOISE_FLOOR = 5e-6
+
+# (benchmark name, function to time)
+Benchmark = Tuple[str, Callable[[], object]]
+
+
+def time_benchmark(function: Callable[[], object]) -> Tuple[int, float, float]:
+    """Return the number of runs and the fastest and median run time in seconds."""
+    start = time.perf_counter()
+    function()
+    first = time.perf_counter() - start
+    repeat = min(max(math.ceil(TARGET_SECONDS / max(first, 1e-9)), MIN_REPEAT), MAX_REPEAT)
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+    return repeat, min(times), statistics.median(times)
+
+
+def command_lines(task_list: TaskList, directory: str) -> Dict[str, List[str]]:
+    """The command lines each console command is timed with, in the order they run.
+
+    Commands that only read come first and imports last, so that every command sees
+    the generated tasks, apart from the few changes the commands before it made.
+    """
+    n_tasks = len(task_list._store)
+    middle = max(n_tasks // 2, 1)
+    reference = f"{REFERENCE_DATE:%d-%m-%Y}"
+    word = task_list._store.get(1)[1].description.split()[1]
+    csv_path = os.path.join(directory, "tasks.csv")
+    snapshot_path = os.path.join(directory, "tasks.npz")
+    return {
+        "help": ["help"],
+        "show": ["show", "show --limit 100"],
+        "view-by-deadline": ["view-by-deadline", "view-by-deadline --limit 100"],
+        "today": ["today"],
+        "summary": ["summary"],
+        "top-projects": ["top-projects 10"],
+        "find-tasks-by-keyword": [f"find-tasks-by-keyword {word}", f"find-tasks-by-keyword --literal {word}"],
+        "find-overdue": [f"find-overdue {reference}"],
+        "stats": ["stats"],
+        "check": [f"check {middle}", f"check 1-{n_tasks}"],
+        "uncheck": [f"uncheck {middle}", f"uncheck 1-{n_tasks}"],
+        "deadline": [f"deadline {middle} {reference}"],
+        "add": ["add task project0 Benchmark the task list.", "add project benchmark"],
+        "export": [f"export {csv_path}"],
+        "export-binary": [f"export-binary {snapshot_path}"],
+        "import": [f"import {csv_path}"],
+        "import-binary": [f"import-binary {snapshot_path}"],
+    }
+
+
+def command_benchmarks(task_list: TaskList, directory: str) -> List[Benchmark]:
+    lines = command_lines(task_list, directory)
+    for command in TaskList.commands:
+        if command.name not in lines:
+            print(f"  no arguments to time {command.name} with, skipped", file=sys.stderr)
+
+    # The files to import exist even when the exports are filtered out
+    task_list.execute(lines["export"][0])
+    task_list.execute(lines["export-binary"][0])
+
+    def run(command_line):
+        # Empties the result cache, so cached commands compute their output
+        task_list._results.on_loaded()
+        task_list.execute(command_line)
+
+    return [(f"command {command_line.replace(directory + os.sep, '')}", lambda command_line=command_line: run(command_line))
+            for command in lines.values() for command_line in command]
+
+
+def analytics_benchmarks(task_list: TaskList, directory: str) -> List[Benchmark]:
+    analytics = TaskAnalytics()
+    tasks = task_list._store.to_dict()
+    df = analytics.import_from_dict(tasks)
+    reference = f"{REFERENCE_DATE:%d-%m-%Y}"
+    word = task_list._store.get(1)[1].description.split()[1]
+    csv_path = os.path.join(directory, "analytics.csv")
+    analytics.export_to_csv(df, csv_path)
+    benchmarks = {
+        "import_from_dict": lambda: analytics.import_from_dict(tasks),
+        "export_to_dict": lambda: analytics.export_to_dict(df),
+        "export_to_csv": lambda: analytics.export_to_csv(df, csv_path),
+        "import_from_csv": lambda: analytics.import_from_csv(csv_path),
+        "read_csv_chunks": lambda: list(analytics.read_csv_chunks(csv_path, 100_000)),
+        "get_project_summary": lambda: analytics.get_project_summary(df),
+        "get_top_projects_by_completion": lambda: analytics.get_top_projects_by_completion(df, 10),
+        "find_tasks_by_keyword": lambda: analytics.find_tasks_by_keyword(df, word),
+        "find_overdue_tasks": lambda: analytics.find_overdue_tasks(df, reference),
+    }
+    for name in dir(TaskAnalytics):
+        if not name.startswith("_") and callable(getattr(TaskAnalytics, name)) and name not in benchmarks:
+            print(f"  no arguments to time TaskAnalytics.{name} with, skipped", file=sys.stderr)
+    return [(f"analytics {name}", function) for name, function in benchmarks.items()]
+
+
+def run_suite(scales: List[int], stores: List[str], generator: dict, pattern: Optional[str] = None) -> List[dict]:
+    """Run the benchmarks on lists of every scale in every store, generated with TaskListSpec(scale, **generator)."""
+    results = []
+    for n_tasks in scales:
+        for store_name in stores:
+            print(f"{n_tasks:,} tasks, {store_name}")
+            task_list = generate_task_list(TaskListSpec(n_tasks, **generator), STORES[store_name]())
+            with tempfile.TemporaryDirectory() as directory:
+                # The analytics first: the commands change the tasks
+                benchmarks = analytics_benchmarks(task_list, directory) + command_benchmarks(task_list, directory)
+                for name, function in benchmarks:
+                    if pattern is not None and not re.search(pattern, name):
+                        continue
+                    repeat, fastest, median = time_benchmark(function)
+                    report(f"  {name}", fastest)
+                    results.append({
+                        "benchmark": name, "store": store_name, "tasks": n_tasks,
+                        "repeat": repeat, "min_seconds": fastest, "median_seconds": median,
+                    })
+            task_list.close()
+    return results
+
+
+def environment() -> dict:
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "processor": platform.processor(),
+        "cpus": os.cpu_count(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "date": datetime.now().isoformat(timespec="seconds"),
+    }
+
+
+def compare(results: List[dict], baseline: List[dict], threshold: float) -> List[dict]:
+    """Return the results more than threshold slower than the same benchmark in the baseline."""
+    baseline_times = {(entry["benchmark"], entry["store"], entry["tasks"]): entry["min_seconds"] for entry in baseline}
+    regressions = []
+    for entry in results:
+        before = baseline_times.get((entry["benchmark"], entry["store"], entry["tasks"]))
+        if before is None:
+            continue
+        after = entry["min_seconds"]
+        if after > before * (1 + threshold) and after - before > NOISE_FLOOR:
+            regressions.append(dict(entry, baseline_seconds=before, ratio=after / before))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scales", type=int, nargs="+", default=SCALES, help="numbers of tasks")
+    parser.add_argument("--stores", nargs="+", choices=sorted(STORES), default=list(STORES))
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--tasks-per-project", type=int, default=100)
+    parser.add_argument("--project-skew", type=float, default=1.0, help="Zipf exponent of the project sizes")
+    parser.add_argument("--done-ratio", type=float, default=0.3)
+    parser.add_argument("--deadline-ratio", type=float, default=0.5)
+    parser.add_argument("--deadline-days", type=int, default=365, help="days the deadlines are spread over")
+    parser.add_argument("--vocabulary-size", type=int, default=2_000, help="distinct words in the descriptions")
+    parser.add_argument("--filter", metavar="REGEX", help="only run benchmarks whose name matches")
+    parser.add_argument("--output", metavar="FILE", help="write the results to this JSON file")
+    parser.add_argument("--baseline", metavar="FILE", help="compare with the results in this JSON file")
+    parser.add_argument("--threshold", type=float, default=0.2, help="slowdown counted as a regression (default: 0.2, 20%%)")
+    args = parser.parse_args()
+    warnings.simplefilter("ignore")
+
+    # The parameters of TaskListSpec apart from the number of tasks
+    generator = {
+        "seed": args.seed, "tasks_per_project": args.tasks_per_project, "project_skew": args.project_skew,
+        "done_ratio": args.done_ratio, "deadline_ratio": args.deadline_ratio, "deadline_days": args.deadline_days,
+        "vocabulary_size": args.vocabulary_size,
+    }
+    results = run_suite(args.scales, args.stores, generator, args.filter)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump({
+                "version": RESULTS_VERSION,
+                "environment": environment(),
+                "generator": generator,
+                "results": results,
+            }, file, indent=2)
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as file:
+            baseline = json.load(file)["results"]
+        regressions = compare(results, baseline, args.threshold)
+        print(f"{len(regressions)} regressions of more than {args.threshold:.0%}")
+        for entry in regressions:
+            print(f"  {entry['benchmark']}, {entry['store']}, {entry['tasks']:,} tasks: "
+                  f"{entry['baseline_seconds'] * 1e6:.2f} us -> {entry['min_seconds'] * 1e6:.2f} us ({entry['ratio']:.2f}x)")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
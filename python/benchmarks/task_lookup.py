@@ -0,0 +1,39 @@
+"""Compare task lookups by ID: linear scan over all projects vs the task-ID index.
+
+Run from the python/ directory:
+    python -m benchmarks.task_lookup
+"""
+import random
+
+from benchmarks.common import build_task_list, report, time_call
+
+SIZES = [10_000, 100_000, 1_000_000]
+LOOKUPS = 100
+
+
+def scan_lookup(tasks, task_id):
+    for project_name, project_tasks in tasks.items():
+        for task in project_tasks:
+            if task.id == task_id:
+                return project_name, task
+    return None
+
+
+def main():
+    rng = random.Random(42)
+    for size in SIZES:
+        task_list = build_task_list(size)
+        ids = [rng.randint(1, size) for _ in range(LOOKUPS)]
+
+        scan = time_call(lambda: [scan_lookup(task_list._store.to_dict(), i) for i in ids], repeat=1)
+        index = time_call(lambda: [task_list._store.get(i) for i in ids])
+        check = time_call(lambda: [task_list._set_done(str(i), True) for i in ids])
+
+        print(f"{size:,} tasks")
+        report("  scan lookup (per id)", scan, LOOKUPS)
+        report("  index lookup (per id)", index, LOOKUPS)
+        report("  check command (per id)", check, LOOKUPS)
+
+
+if __name__ == "__main__":
+    main()
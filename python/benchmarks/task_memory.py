@@ -0,0 +1,72 @@
+"""Measure the memory per task of the Task objects and their descriptions.
+
+Builds 1M tasks with 50,000 distinct descriptions, half of them with a deadline, and
+traces the memory that stays allocated:
+- the previous Task: a __dict__ per instance and the deadline as a 'DD-MM-YYYY' string
+- the current Task: __slots__ and the deadline as a date ordinal
+each with a separate description string per task, as a CSV import reads them, and
+with equal descriptions shared, as imports now store them.
+
+Run from the python/ directory:
+    python -m benchmarks.task_memory
+"""
+import gc
+import tracemalloc
+
+from task import Task
+
+N_TASKS = 1_000_000
+N_DESCRIPTIONS = 50_000
+DEADLINES = ["05-03-2024", "17-11-2025", "01-01-2026"]
+
+
+class DictTask:
+    """Task as it was before __slots__ and date ordinals."""
+
+    def __init__(self, id, description, done=False):
+        self._id = id
+        self._description = description
+        self._done = done
+        self._deadline = ""
+
+
+def build(task_type, shared):
+    interned = {}
+    tasks = []
+    for i in range(N_TASKS):
+        description = f"Task description {i % N_DESCRIPTIONS}"
+        if shared:
+            description = interned.setdefault(description, description)
+        task = task_type(i, description, False)
+        if i % 2:
+            if task_type is DictTask:
+                task._deadline = DEADLINES[i % 3]
+            else:
+                task.deadline = DEADLINES[i % 3]
+        tasks.append(task)
+    return tasks
+
+
+def measure(task_type, shared):
+    gc.collect()
+    tracemalloc.start()
+    tasks = build(task_type, shared)
+    # The interning dict is gone, only the tasks and their strings are left
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del tasks
+    return current
+
+
+def main():
+    print(f"{N_TASKS:,} tasks, {N_DESCRIPTIONS:,} distinct descriptions")
+    for label, task_type in [("dict Task, string deadline", DictTask), ("slotted Task, ordinal deadline", Task)]:
+        for shared in (False, True):
+            used = measure(task_type, shared)
+            descriptions = "shared descriptions" if shared else "separate descriptions"
+            print(f"  {label + ', ' + descriptions:<62} {used / 2**20:>7.1f} MiB ({used / N_TASKS:.0f} bytes/task)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,27 @@
+"""Compare adding tasks with one form post each against a single /api/batch request.
+
+Run from the python/ directory:
+    python -m benchmarks.web_batch
+"""
+from benchmarks.common import report, time_call
+from task_controller import app
+
+N_COMMANDS = 1_000
+
+
+def main():
+    client = app.test_client()
+    client.post("/api/projects", json={"name": "batch"})
+    commands = [f"add task batch Task {i}" for i in range(N_COMMANDS)]
+
+    def form_posts():
+        for command in commands:
+            client.post("/tasks", data={"command_input": command})
+
+    print(f"{N_COMMANDS:,} x add task")
+    report("form post per command", time_call(form_posts, repeat=3), N_COMMANDS)
+    report("one /api/batch request", time_call(lambda: client.post("/api/batch", json=commands), repeat=3), N_COMMANDS)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""Load test of the web mode: threads sending a mix of requests through the Flask test client.
+
+Reports requests per second and latency percentiles for a read-heavy and a write-heavy mix.
+
+Run from the python/ directory:
+    python -m benchmarks.web_load [--threads 8] [--requests 500] [--tasks 10000]
+"""
+import argparse
+import random
+import statistics
+import threading
+import time
+
+from task_controller import app, tasks
+
+
+def read_request(client, rng):
+    if rng.random() < 0.5:
+        return client.get(f"/projects?offset={rng.randrange(0, 1000, 100)}")
+    return client.post("/tasks", data={"command_input": "summary"})
+
+
+def write_request(client, rng):
+    if rng.random() < 0.5:
+        return client.post("/tasks", data={"command_input": f"add task load Task {rng.random()}"})
+    return client.post("/tasks", data={"command_input": f"check {rng.randrange(1, 1000)}"})
+
+
+def worker(n_requests, write_ratio, seed, latencies):
+    client = app.test_client()
+    rng = random.Random(seed)
+    for _ in range(n_requests):
+        start = time.perf_counter()
+        response = write_request(client, rng) if rng.random() < write_ratio else read_request(client, rng)
+        latencies.append(time.perf_counter() - start)
+        assert response.status_code == 200
+
+
+def run(label, n_threads, n_requests, write_ratio):
+    latencies = []
+    threads = [threading.Thread(target=worker, args=(n_requests, write_ratio, seed, latencies)) for seed in range(n_threads)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    percentiles = statistics.quantiles(latencies, n=100)
+    print(f"{label:<32} {len(latencies) / elapsed:>8.0f} req/s   p50 {percentiles[49] * 1e3:>7.2f} ms   p99 {percentiles[98] * 1e3:>7.2f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=500, help="requests per thread")
+    parser.add_argument("--tasks", type=int, default=10_000, help="tasks in the list before the test")
+    args = parser.parse_args()
+
+    tasks.execute("add project load")
+    for i in range(args.tasks):
+        tasks.execute(f"add task load Task {i}")
+    print(f"{args.threads} threads x {args.requests} requests, {args.tasks:,} tasks")
+    run("read-heavy (10% writes)", args.threads, args.requests, 0.1)
+    run("write-heavy (50% writes)", args.threads, args.requests, 0.5)
+
+
+if __name__ == "__main__":
+    main()
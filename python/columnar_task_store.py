@@ -0,0 +1,376 @@
+from datetime import date
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+from task import Task, to_ordinal
+from task_store import TaskStore
+import numpy as np
+import pandas as pd
+
+
+class ColumnarTaskStore(TaskStore):
+    """Array-backed storage engine that keeps tasks in columns instead of objects.
+
+    Each task is one row across the following columns:
+    - ids: int64 task IDs
+    - done: bool completion flags
+    - project codes: int32 index into the list of project names
+    - description codes: int32 index into the interned descriptions
+    - deadlines: int32 date ordinals, 0 meaning no deadline
+
+    Task objects are only created when tasks are read back through items() or get().
+    """
+
+    NO_DEADLINE = 0
+    _EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+    _INITIAL_CAPACITY = 1024
+
+    def __init__(self):
+        self._listeners: List[object] = []
+        self._clear()
+
+    def _clear(self) -> None:
+        self._size = 0
+        self._ids = np.zeros(self._INITIAL_CAPACITY, dtype=np.int64)
+        self._done = np.zeros(self._INITIAL_CAPACITY, dtype=np.bool_)
+        self._project_codes = np.zeros(self._INITIAL_CAPACITY, dtype=np.int32)
+        self._description_codes = np.zeros(self._INITIAL_CAPACITY, dtype=np.int32)
+        self._deadlines = np.zeros(self._INITIAL_CAPACITY, dtype=np.int32)
+        self._projects: List[str] = []
+        self._project_codes_by_name: Dict[str, int] = {}
+        self._descriptions: List[str] = []
+        self._description_codes_by_text: Dict[str, int] = {}
+        # Row of each task ID, -1 for unused IDs. IDs are handed out sequentially,
+        # so a dense array is both smaller and faster than a dict. Negative IDs, and
+        # IDs far beyond the number of tasks, which would blow up the array, are kept
+        # in a dict instead, see _index.
+        self._row_of_id = np.full(self._INITIAL_CAPACITY, -1, dtype=np.int64)
+        self._sparse_rows: Dict[int, int] = {}
+
+    def __len__(self) -> int:
+        return self._size
+
+    def has_project(self, name: str) -> bool:
+        return name in self._project_codes_by_name
+
+    def add_project(self, name: str) -> None:
+        code = self._project_codes_by_name.get(name)
+        if code is None:
+            self._project_codes_by_name[name] = len(self._projects)
+            self._projects.append(name)
+        else:
+            # Adding an existing project replaces it, dropping its tasks
+            self._keep_rows(self._project_codes[:self._size] != code)
+        for listener in self._listeners:
+            listener.on_project_added(name)
+
+    def add_task(self, project: str, task_id: int, description: str, done: bool = False) -> None:
+        self._append_row(task_id, self._project_codes_by_name[project], self._intern(description), done, self.NO_DEADLINE)
+        for listener in self._listeners:
+            listener.on_task_added(project, task_id, description, done)
+
+    def add_tasks(self, project: str, task_ids: Sequence[int], descriptions: Sequence[str]) -> None:
+        count = len(task_ids)
+        if self._size + count > len(self._ids):
+            self._grow(max(2 * len(self._ids), self._size + count))
+        ids = np.asarray(task_ids, dtype=np.int64)
+        rows = slice(self._size, self._size + count)
+        self._ids[rows] = ids
+        self._done[rows] = False
+        self._project_codes[rows] = self._project_codes_by_name[project]
+        self._description_codes[rows] = [self._intern(description) for description in descriptions]
+        self._deadlines[rows] = self.NO_DEADLINE
+        # Like _append_row: the first row of a duplicated ID wins
+        unique_ids, first_rows = np.unique(ids, return_index=True)
+        self._size += count
+        self._index(unique_ids, first_rows + self._size - count)
+        for task_id, description in zip(task_ids, descriptions):
+            for listener in self._listeners:
+                listener.on_task_added(project, task_id, description, False)
+
+    def get(self, task_id: int) -> Optional[Tuple[str, Task]]:
+        row = self._row(task_id)
+        if row < 0:
+            return None
+        return self._projects[self._project_codes[row]], self._task_at(row)
+
+    def set_done(self, task_id: int, done: bool) -> bool:
+        row = self._row(task_id)
+        if row < 0:
+            return False
+        self._done[row] = done
+        for listener in self._listeners:
+            listener.on_done_changed(task_id, done)
+        return True
+
+    def set_done_many(self, task_ids: Sequence[int], done: Sequence[bool]) -> List[bool]:
+        rows = self._rows(task_ids)
+        found = rows >= 0
+        # With repeated rows the last flag is assigned, as with set_done one at a time
+        self._done[rows[found]] = np.asarray(done, dtype=np.bool_)[found]
+        for task_id, flag, is_found in zip(task_ids, done, found.tolist()):
+            if is_found:
+                for listener in self._listeners:
+                    listener.on_done_changed(task_id, flag)
+        return found.tolist()
+
+    def set_deadline(self, task_id: int, deadline: str) -> bool:
+        row = self._row(task_id)
+        if row < 0:
+            return False
+        self._deadlines[row] = self._to_ordinal(deadline)
+        for listener in self._listeners:
+            listener.on_deadline_changed(task_id, deadline)
+        return True
+
+    def set_deadline_many(self, task_ids: Sequence[int], deadline: str) -> List[bool]:
+        rows = self._rows(task_ids)
+        found = rows >= 0
+        self._deadlines[rows[found]] = self._to_ordinal(deadline)
+        for task_id, is_found in zip(task_ids, found.tolist()):
+            if is_found:
+                for listener in self._listeners:
+                    listener.on_deadline_changed(task_id, deadline)
+        return found.tolist()
+
+    def has_empty_project(self) -> bool:
+        counts = np.bincount(self._project_codes[:self._size], minlength=len(self._projects))
+        return bool((counts == 0).any())
+
+    def projects(self) -> List[str]:
+        return list(self._projects)
+
+    def items(self) -> Iterator[Tuple[str, List[Task]]]:
+        rows_by_project = self._rows_by_project()
+        for code, project_name in enumerate(self._projects):
+            yield project_name, [self._task_at(row) for row in rows_by_project[code]]
+
+    def task_counts(self) -> Dict[str, int]:
+        counts = np.bincount(self._project_codes[:self._size], minlength=len(self._projects))
+        return dict(zip(self._projects, counts.tolist()))
+
+    def tasks_of(self, project: str, offset: int = 0, limit: Optional[int] = None) -> List[Task]:
+        rows = np.flatnonzero(self._project_codes[:self._size] == self._project_codes_by_name[project])
+        return [self._task_at(row) for row in rows[offset:None if limit is None else offset + limit]]
+
+    def task_ids_of(self, project: str) -> List[int]:
+        rows = np.flatnonzero(self._project_codes[:self._size] == self._project_codes_by_name[project])
+        return self._ids[rows].tolist()
+
+    def task_ids_between(self, first: int, last: int) -> List[int]:
+        info = np.iinfo(np.int64)
+        first, last = max(first, info.min), min(last, info.max)
+        if first > last:
+            return []
+        if last - first < self._size:
+            ids = np.arange(first, last + 1, dtype=np.int64)
+            return ids[self._rows(ids) >= 0].tolist()
+        ids = self._ids[:self._size]
+        return np.unique(ids[(ids >= first) & (ids <= last)]).tolist()
+
+    def page(self, offset: int, limit: Optional[int] = None) -> Iterator[Tuple[str, List[Task]]]:
+        # Only the tasks in the range are turned into Task objects
+        stop = None if limit is None else offset + limit
+        position = 0
+        rows_by_project = self._rows_by_project()
+        for code, project_name in enumerate(self._projects):
+            if stop is not None and position >= stop:
+                return
+            rows = rows_by_project[code]
+            if position + max(len(rows), 1) > offset:
+                selected = rows[max(offset - position, 0):None if stop is None else stop - position]
+                yield project_name, [self._task_at(row) for row in selected]
+            position += max(len(rows), 1)
+
+    def to_dict(self) -> Dict[str, List[Task]]:
+        return dict(self.items())
+
+    def to_columns(self) -> Dict[str, object]:
+        """Return the tasks as columns, see TaskStore.to_columns.
+
+        The columns are copies of the arrays, no Task objects are created. 'description'
+        holds codes into an extra 'descriptions' column, which may also list descriptions
+        no task uses anymore.
+        """
+        order = np.argsort(self._project_codes[:self._size], kind='stable')
+        return {
+            'projects': self.projects(),
+            'project_code': self._project_codes[order],
+            'task_id': self._ids[order],
+            'description': self._description_codes[order],
+            'descriptions': list(self._descriptions),
+            'done': self._done[order],
+            'deadline': self._deadlines[order],
+        }
+
+    def load(self, tasks: Dict[str, List[Task]]) -> None:
+        """Replace the contents of the store with the given projects and tasks."""
+        self._clear()
+        for project_name, project_tasks in tasks.items():
+            code = self._project_codes_by_name.setdefault(project_name, len(self._projects))
+            if code == len(self._projects):
+                self._projects.append(project_name)
+            for task in project_tasks:
+                if task.id is not None:
+                    self._append_row(task.id, code, self._intern(task.description), task.done, task.deadline_ordinal)
+        for listener in self._listeners:
+            listener.on_loaded()
+
+    def extend_from_frame(self, df) -> None:
+        """Append the tasks of a DataFrame as produced by TaskAnalytics.read_csv_chunks.
+
+        Rows without a task_id only add their project. Listeners are not notified, this
+        is meant for filling a new store that is then passed to load_from.
+        """
+        for project_name in df['project_name'].unique():
+            if project_name not in self._project_codes_by_name:
+                self._project_codes_by_name[project_name] = len(self._projects)
+                self._projects.append(project_name)
+        df = df.loc[df['task_id'].notna()]
+        count = len(df)
+        if count == 0:
+            return
+        if self._size + count > len(self._ids):
+            self._grow(max(2 * len(self._ids), self._size + count))
+
+        description_codes, descriptions = pd.factorize(df['description'])
+        interned = self._intern_all(descriptions)
+        deadlines = df['deadline'].to_numpy(dtype='datetime64[D]')
+        ordinals = np.where(np.isnat(deadlines), self.NO_DEADLINE, deadlines.astype(np.int64) + self._EPOCH_ORDINAL)
+
+        rows = slice(self._size, self._size + count)
+        ids = df['task_id'].to_numpy(dtype=np.int64)
+        self._ids[rows] = ids
+        self._done[rows] = df['done'].to_numpy(dtype=np.bool_)
+        self._project_codes[rows] = df['project_name'].map(self._project_codes_by_name).to_numpy(dtype=np.int32)
+        self._description_codes[rows] = interned[description_codes]
+        self._deadlines[rows] = ordinals
+
+        # The first row of a duplicated ID wins
+        unique_ids, first_rows = np.unique(ids, return_index=True)
+        self._size += count
+        self._index(unique_ids, first_rows + self._size - count)
+
+    def load_from(self, other: 'ColumnarTaskStore') -> None:
+        """Replace the contents of the store with those of another store of the same type."""
+        listeners = self._listeners
+        self.__dict__.update(other.__dict__)
+        self._listeners = listeners
+        for listener in self._listeners:
+            listener.on_loaded()
+
+    def max_id(self) -> int:
+        return int(self._ids[:self._size].max()) if self._size else 0
+
+    def _row(self, task_id: int) -> int:
+        if 0 <= task_id < len(self._row_of_id):
+            row = int(self._row_of_id[task_id])
+            if row >= 0:
+                return row
+        return self._sparse_rows.get(task_id, -1)
+
+    def _rows(self, task_ids: Sequence[int]) -> np.ndarray:
+        # Row of every task ID, -1 for IDs that are not in the store
+        try:
+            ids = np.asarray(task_ids, dtype=np.int64)
+        except OverflowError:
+            # IDs beyond int64 cannot be stored, so they are not found
+            info = np.iinfo(np.int64)
+            return np.array([self._row(task_id) if info.min <= task_id <= info.max else -1 for task_id in task_ids], dtype=np.int64)
+        in_range = (ids >= 0) & (ids < len(self._row_of_id))
+        rows = np.full(len(ids), -1, dtype=np.int64)
+        rows[in_range] = self._row_of_id[ids[in_range]]
+        if self._sparse_rows:
+            missing = np.flatnonzero(rows < 0)
+            rows[missing] = [self._sparse_rows.get(task_id, -1) for task_id in ids[missing].tolist()]
+        return rows
+
+    def _index(self, ids: np.ndarray, rows: np.ndarray) -> None:
+        """Record the rows of distinct task IDs, keeping the row an ID already has.
+
+        Call after adding the rows: the dense array grows up to a few times the number
+        of tasks, IDs beyond that or negative go to the dict.
+        """
+        dense = (ids >= 0) & (ids < max(self._INITIAL_CAPACITY, 4 * self._size))
+        if self._sparse_rows:
+            dense &= np.array([task_id not in self._sparse_rows for task_id in ids.tolist()], dtype=np.bool_)
+        dense_ids, dense_rows = ids[dense], rows[dense]
+        if len(dense_ids) and dense_ids.max() >= len(self._row_of_id):
+            self._row_of_id = self._resized(self._row_of_id, max(min(2 * len(self._row_of_id), 4 * self._size), int(dense_ids.max()) + 1), fill=-1)
+        unused = self._row_of_id[dense_ids] < 0
+        self._row_of_id[dense_ids[unused]] = dense_rows[unused]
+        if not dense.all():
+            for task_id, row in zip(ids[~dense].tolist(), rows[~dense].tolist()):
+                self._sparse_rows.setdefault(task_id, row)
+
+    def _task_at(self, row: int) -> Task:
+        task = Task(int(self._ids[row]), self._descriptions[self._description_codes[row]], bool(self._done[row]))
+        task.deadline_ordinal = int(self._deadlines[row])
+        return task
+
+    def _rows_by_project(self) -> List[np.ndarray]:
+        codes = self._project_codes[:self._size]
+        order = np.argsort(codes, kind='stable')
+        bounds = np.searchsorted(codes[order], np.arange(len(self._projects) + 1))
+        return [order[bounds[code]:bounds[code + 1]] for code in range(len(self._projects))]
+
+    def _intern(self, description: str) -> int:
+        code = self._description_codes_by_text.get(description)
+        if code is None:
+            code = len(self._descriptions)
+            self._description_codes_by_text[description] = code
+            self._descriptions.append(description)
+        return code
+
+    def _intern_all(self, descriptions) -> np.ndarray:
+        # descriptions are distinct, so a store without descriptions can take them in one go
+        if not self._descriptions:
+            self._descriptions = descriptions.tolist()
+            self._description_codes_by_text = dict(zip(self._descriptions, range(len(self._descriptions))))
+            return np.arange(len(self._descriptions), dtype=np.int32)
+        return np.array([self._intern(description) for description in descriptions], dtype=np.int32)
+
+    @staticmethod
+    def _to_ordinal(deadline: str) -> int:
+        if not deadline:
+            return ColumnarTaskStore.NO_DEADLINE
+        return to_ordinal(deadline)
+
+    def _append_row(self, task_id: int, project_code: int, description_code: int, done: bool, deadline: int) -> None:
+        if self._size == len(self._ids):
+            self._grow(2 * len(self._ids))
+        row = self._size
+        self._ids[row] = task_id
+        self._done[row] = done
+        self._project_codes[row] = project_code
+        self._description_codes[row] = description_code
+        self._deadlines[row] = deadline
+        self._size += 1
+        if 0 <= task_id < len(self._row_of_id) and task_id not in self._sparse_rows:
+            # The common case of _index, without building arrays
+            if self._row_of_id[task_id] < 0:
+                self._row_of_id[task_id] = row
+        else:
+            self._index(np.array([task_id], dtype=np.int64), np.array([row], dtype=np.int64))
+
+    def _grow(self, capacity: int) -> None:
+        self._ids = self._resized(self._ids, capacity)
+        self._done = self._resized(self._done, capacity)
+        self._project_codes = self._resized(self._project_codes, capacity)
+        self._description_codes = self._resized(self._description_codes, capacity)
+        self._deadlines = self._resized(self._deadlines, capacity)
+
+    @staticmethod
+    def _resized(array: np.ndarray, capacity: int, fill: int = 0) -> np.ndarray:
+        resized = np.full(capacity, fill, dtype=array.dtype)
+        resized[:len(array)] = array
+        return resized
+
+    def _keep_rows(self, mask: np.ndarray) -> None:
+        for name in ('_ids', '_done', '_project_codes', '_description_codes', '_deadlines'):
+            column = getattr(self, name)
+            kept = column[:self._size][mask]
+            column[:len(kept)] = kept
+        self._size = int(mask.sum())
+        self._row_of_id[:] = -1
+        self._sparse_rows = {}
+        unique_ids, first_rows = np.unique(self._ids[:self._size], return_index=True)
+        self._index(unique_ids, first_rows)
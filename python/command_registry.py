@@ -0,0 +1,85 @@
+from typing import Callable, Dict, Iterable, Iterator, Optional, Tuple
+
+
+class Command:
+    """A console command: how to parse its arguments, what to run and its help text.
+
+    The handler is called with the TaskList, writes the output of the command and
+    returns it. Without a parser it receives the argument string, everything after the
+    command name. With a parser it receives the tuple the parser makes of the argument
+    string; when the parser raises ValueError, parse_error is the output instead.
+
+    usage holds the lines shown by help, none for a command that is not listed.
+    The output of a cached command only depends on its arguments and the tasks, so it
+    is reused until the tasks change, see ResultCache. The output of a dated command
+    also depends on the current date, and is only reused on the same day.
+    """
+
+    def __init__(self, name: str, handler: Callable[..., str], usage: Tuple[str, ...] = (),
+                 parser: Optional[Callable[[str], tuple]] = None, parse_error: str = "", cached: bool = False,
+                 dated: bool = False):
+        self.name = name
+        self.handler = handler
+        self.usage = usage
+        self.parser = parser
+        self.parse_error = parse_error
+        self.cached = cached
+        self.dated = dated
+
+    def run(self, task_list, arguments: str) -> str:
+        if self.parser is None:
+            return self.handler(task_list, arguments)
+        try:
+            parsed = self.parser(arguments)
+        except ValueError:
+            task_list._output.write(self.parse_error)
+            return self.parse_error
+        return self.handler(task_list, *parsed)
+
+
+class CommandRegistry:
+    """The commands of a TaskList by name, in the order in which help lists them.
+
+    Plugins add commands by registering them, either on TaskList.commands for every
+    task list or on a copy assigned to the commands of a subclass:
+
+        @TaskList.commands.command("count", usage=("count",))
+        def count(task_list, arguments):
+            ...
+    """
+
+    def __init__(self, commands: Iterable[Command] = ()):
+        self._commands: Dict[str, Command] = {}
+        for command in commands:
+            self.register(command)
+
+    def register(self, command: Command) -> Command:
+        """Add a command, replacing any command with the same name."""
+        self._commands[command.name] = command
+        return command
+
+    def command(self, name: str, usage: Tuple[str, ...] = (), parser: Optional[Callable[[str], tuple]] = None,
+                parse_error: str = "", cached: bool = False, dated: bool = False) -> Callable[[Callable[..., str]], Callable[..., str]]:
+        """Decorator registering a function as the handler of a command."""
+        def register(handler: Callable[..., str]) -> Callable[..., str]:
+            self.register(Command(name, handler, usage, parser, parse_error, cached, dated))
+            return handler
+        return register
+
+    def get(self, name: str) -> Optional[Command]:
+        return self._commands.get(name)
+
+    def copy(self) -> 'CommandRegistry':
+        return CommandRegistry(self._commands.values())
+
+    def help_text(self) -> str:
+        lines = ["Commands:\n"]
+        lines.extend(f"  {usage}\n" for command in self._commands.values() for usage in command.usage)
+        lines.append("\n")
+        return ''.join(lines)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._commands
+
+    def __iter__(self) -> Iterator[Command]:
+        return iter(self._commands.values())
@@ -0,0 +1,219 @@
+import io
+import threading
+import time
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Dict, Iterator, List, Optional, Tuple
+from task import Task
+from task_list import TaskList
+from task_store import TaskStore
+
+if TYPE_CHECKING:
+    from task_scheduler import TaskScheduler
+
+
+class ReadWriteLock:
+    """Lock that lets any number of readers in at once, or a single writer.
+
+    Waiting writers go first, so a steady stream of readers cannot starve them.
+    """
+
+    def __init__(self):
+        self._condition = threading.Condition()
+        self._readers = 0
+        self._writing = False
+        self._waiting_writers = 0
+
+    @contextmanager
+    def reading(self) -> Iterator[None]:
+        with self._condition:
+            while self._writing or self._waiting_writers:
+                self._condition.wait()
+            self._readers += 1
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._readers -= 1
+                if not self._readers:
+                    self._condition.notify_all()
+
+    @contextmanager
+    def writing(self) -> Iterator[None]:
+        with self._condition:
+            self._waiting_writers += 1
+            while self._writing or self._readers:
+                self._condition.wait()
+            self._waiting_writers -= 1
+            self._writing = True
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._writing = False
+                self._condition.notify_all()
+
+
+class NullOutput(io.TextIOBase):
+    """Text stream that discards everything written to it."""
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, text: str) -> int:
+        return len(text)
+
+
+def task_record(project: str, task: Task) -> Dict[str, object]:
+    """Plain dict describing a task, safe to hand out after the lock is released."""
+    return {
+        "id": task.id,
+        "project": project,
+        "description": task.description,
+        "done": task.done,
+        "deadline": task.deadline or None,
+    }
+
+
+class ConcurrentTaskList:
+    """TaskList that can be shared by the threads of a web server.
+
+    Commands that only read the store (READ_COMMANDS) run concurrently under a shared
+    lock. All other commands run alone: besides the mutations, the analytics commands
+    and today/view-by-deadline also update the views and indexes kept next to the store.
+
+    The outputs of SNAPSHOT_COMMANDS are kept until the store changes. Repeating such a
+    command on an unchanged store returns the kept output without taking any lock.
+
+    Output is only returned, it is not written to the server's stdout. Command
+    latencies are recorded from the start, for metrics_text.
+    """
+
+    READ_COMMANDS = {"show", "help", "export", "export-binary"}
+    SNAPSHOT_COMMANDS = {"show", "summary"}
+    # Different pages of show are kept separately, up to this many outputs
+    MAX_SNAPSHOTS = 256
+
+    def __init__(self, store: Optional[TaskStore] = None, journal_directory: Optional[str] = None, analytics_workers: int = 0):
+        self._task_list = TaskList(io.StringIO(), NullOutput(), store, journal_directory, analytics_workers=analytics_workers)
+        self._lock = ReadWriteLock()
+        self._version = 0
+        self._snapshots: Tuple[int, Dict[str, str]] = (0, {})
+        self._task_list._store.subscribe(self)
+        self._metrics = self._task_list._metrics
+        self._metrics.enabled = True
+
+    def execute(self, command_line: str) -> str:
+        command = command_line.split(" ", 1)[0]
+        if command in self.SNAPSHOT_COMMANDS:
+            start = time.perf_counter()
+            version, outputs = self._snapshots
+            output = outputs.get(command_line) if version == self._version else None
+            if output is not None:
+                if self._metrics.enabled:
+                    self._metrics.observe(command, time.perf_counter() - start)
+                return output
+        with self._locked(command):
+            output = self._task_list.execute(command_line)
+            if command in self.SNAPSHOT_COMMANDS:
+                self._keep_snapshot(command_line, output)
+        return output
+
+    def stream(self, command_line: str) -> Iterator[str]:
+        """Yield the output of a command in chunks, see TaskList.stream.
+
+        The chunks are all rendered under the lock, so the output is consistent, and
+        only sent once it is released: a slow client does not hold up other requests.
+        """
+        command = command_line.split(" ", 1)[0]
+        with self._locked(command):
+            chunks = list(self._task_list.stream(command_line))
+        yield from chunks
+
+    def execute_batch(self, command_lines: List[str]) -> List[str]:
+        """Run commands one after another under a single acquisition of the lock."""
+        with self._lock.writing():
+            return [self._task_list.execute(command_line) for command_line in command_lines]
+
+    def start_scheduler(self, snapshot_path: Optional[str] = None, snapshot_interval: float = 0.0) -> 'TaskScheduler':
+        """Start a TaskScheduler whose jobs take the same locks as the commands they run."""
+        from task_scheduler import TaskScheduler
+        scheduler = TaskScheduler(self._task_list, self._locked, snapshot_path, snapshot_interval)
+        scheduler.start()
+        return scheduler
+
+    def metrics_text(self) -> str:
+        with self._lock.reading():
+            return self._task_list.metrics_text()
+
+    def close(self) -> None:
+        """Sync the journal and stop the analytics workers, once no command runs anymore."""
+        with self._lock.writing():
+            self._task_list.close()
+
+    def task_counts(self) -> Dict[str, int]:
+        with self._lock.reading():
+            return self._task_list._store.task_counts()
+
+    def tasks_of(self, project: str, offset: int = 0, limit: Optional[int] = None) -> Optional[List[Dict[str, object]]]:
+        """Records of the tasks of a project, None if there is no such project."""
+        with self._lock.reading():
+            store = self._task_list._store
+            if not store.has_project(project):
+                return None
+            return [task_record(project, task) for task in store.tasks_of(project, offset, limit)]
+
+    def get(self, task_id: int) -> Optional[Dict[str, object]]:
+        with self._lock.reading():
+            entry = self._task_list._store.get(task_id)
+            return task_record(*entry) if entry is not None else None
+
+    def add_project(self, name: str) -> None:
+        with self._lock.writing():
+            self._task_list._add_project(name)
+
+    def add_task(self, project: str, description: str) -> Optional[Dict[str, object]]:
+        """Add a task and return its record, None if there is no such project."""
+        with self._lock.writing():
+            store = self._task_list._store
+            if not store.has_project(project):
+                return None
+            self._task_list._add_task(project, description)
+            return task_record(*store.get(self._task_list._last_id))
+
+    def update_task(self, task_id: int, done: Optional[bool] = None, deadline: Optional[str] = None) -> Optional[Dict[str, object]]:
+        """Change the done flag and/or the 'DD-MM-YYYY' deadline of a task, None if it does not exist."""
+        with self._lock.writing():
+            store = self._task_list._store
+            if store.get(task_id) is None:
+                return None
+            if done is not None:
+                store.set_done(task_id, done)
+            if deadline is not None:
+                store.set_deadline(task_id, deadline)
+            return task_record(*store.get(task_id))
+
+    def on_project_added(self, name: str) -> None:
+        self._version += 1
+
+    def on_task_added(self, project: str, task_id: int, description: str, done: bool) -> None:
+        self._version += 1
+
+    def on_done_changed(self, task_id: int, done: bool) -> None:
+        self._version += 1
+
+    def on_deadline_changed(self, task_id: int, deadline: str) -> None:
+        self._version += 1
+
+    def on_loaded(self) -> None:
+        self._version += 1
+
+    def _locked(self, command: str):
+        return self._lock.reading() if command in self.READ_COMMANDS else self._lock.writing()
+
+    def _keep_snapshot(self, command_line: str, output: str) -> None:
+        # Called with the lock held, so no writer can change the version meanwhile
+        version, outputs = self._snapshots
+        if version != self._version or len(outputs) >= self.MAX_SNAPSHOTS:
+            outputs = {}
+        outputs[command_line] = output
+        self._snapshots = (self._version, outputs)
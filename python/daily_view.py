@@ -0,0 +1,80 @@
+from typing import Iterable, Optional, Set
+from task import to_ordinal
+from task_store import TaskStore
+
+
+class DailyView:
+    """Outputs of today and find-overdue for one date, kept until a change affects them.
+
+    The result cache is emptied by every change to the tasks. The daily view listens
+    to the store itself and only drops an output when the change can alter it:
+    - today: a project is added, a task due on the date is checked or unchecked, or a
+      deadline is moved to or from the date
+    - find-overdue: a project is added, an overdue task is checked or unchecked, a
+      deadline is moved to or from before the date, or a task is added to an empty
+      project, whose placeholder row sets the dtypes of the analytics frame
+    Imports drop both. The outputs of another date are never returned.
+    """
+
+    def __init__(self, store: TaskStore):
+        self.ordinal: Optional[int] = None
+        self.today: Optional[str] = None
+        self.overdue: Optional[str] = None
+        self._due_ids: Set[int] = set()
+        self._overdue_ids: Set[int] = set()
+        self._empty_projects: Set[str] = set()
+        self.hits = 0
+        store.subscribe(self)
+
+    def get_today(self, ordinal: int) -> Optional[str]:
+        return self._hit(self.today if ordinal == self.ordinal else None)
+
+    def get_overdue(self, ordinal: int) -> Optional[str]:
+        return self._hit(self.overdue if ordinal == self.ordinal else None)
+
+    def put_today(self, ordinal: int, output: str, due_ids: Iterable[int]) -> None:
+        self._move_to(ordinal)
+        self.today = output
+        self._due_ids = set(due_ids)
+
+    def put_overdue(self, ordinal: int, output: str, overdue_ids: Iterable[int], empty_projects: Iterable[str]) -> None:
+        self._move_to(ordinal)
+        self.overdue = output
+        self._overdue_ids = set(overdue_ids)
+        self._empty_projects = set(empty_projects)
+
+    def on_project_added(self, name: str) -> None:
+        self.today = self.overdue = None
+
+    def on_task_added(self, project: str, task_id: int, description: str, done: bool) -> None:
+        if project in self._empty_projects:
+            self.overdue = None
+            self._empty_projects.discard(project)
+
+    def on_done_changed(self, task_id: int, done: bool) -> None:
+        if task_id in self._due_ids:
+            self.today = None
+        if task_id in self._overdue_ids:
+            self.overdue = None
+
+    def on_deadline_changed(self, task_id: int, deadline: str) -> None:
+        if self.ordinal is None:
+            return
+        ordinal = to_ordinal(deadline) if deadline else 0
+        if task_id in self._due_ids or ordinal == self.ordinal:
+            self.today = None
+        if task_id in self._overdue_ids or 0 < ordinal < self.ordinal:
+            self.overdue = None
+
+    def on_loaded(self) -> None:
+        self.today = self.overdue = None
+
+    def _move_to(self, ordinal: int) -> None:
+        if ordinal != self.ordinal:
+            self.ordinal = ordinal
+            self.today = self.overdue = None
+
+    def _hit(self, output: Optional[str]) -> Optional[str]:
+        if output is not None:
+            self.hits += 1
+        return output
@@ -0,0 +1,149 @@
+from bisect import bisect_left, insort
+from datetime import date
+from typing import Dict, Iterator, List, Set, Tuple
+from task import to_ordinal
+from task_store import TaskStore
+
+
+class DeadlineIndex:
+    """Task IDs sorted by deadline, so that date lookups become range queries.
+
+    Entries are (ordinal, rank, task ID) tuples in a list kept sorted with bisect. Tasks
+    with the same deadline come out in the order they have in their project, as in the
+    store (see _rank). Tasks of a replaced project stay in the index; callers skip IDs
+    the store no longer knows. Deadline changes are buffered until the next query: a
+    few are applied with insort, more than INSORT_MAX by sorting the entries again.
+    """
+
+    INSORT_MAX = 64
+
+    def __init__(self, store: TaskStore):
+        self._store = store
+        self._ordinals: Dict[int, int] = {}
+        self._entries: List[Tuple[int, int, int]] = []
+        self._pending: Dict[int, int] = {}
+        self._positions: Dict[int, int] = {}
+        self._unordered_projects: Set[str] = set()
+        self._tasks_at_rebuild = 0
+        self._stale = True
+        store.subscribe(self)
+
+    def due_on(self, ordinal: int) -> List[int]:
+        """IDs of the tasks due on the given date, in project order."""
+        return self._ids_between(ordinal, ordinal + 1)
+
+    def due_before(self, ordinal: int) -> List[int]:
+        """IDs of the tasks due before the given date, sorted by deadline."""
+        return self._ids_between(None, ordinal)
+
+    def count_before(self, ordinal: int) -> int:
+        """Number of tasks due before the given date."""
+        self._refresh()
+        return bisect_left(self._entries, (ordinal,))
+
+    def grouped(self) -> Iterator[Tuple[int, List[int]]]:
+        """Yield (ordinal, task IDs) for every deadline in chronological order."""
+        self._refresh()
+        current, task_ids = None, []
+        for ordinal, _, task_id in self._entries:
+            if ordinal != current:
+                if task_ids:
+                    yield current, task_ids
+                current, task_ids = ordinal, []
+            task_ids.append(task_id)
+        if task_ids:
+            yield current, task_ids
+
+    def on_project_added(self, name: str) -> None:
+        pass
+
+    def on_task_added(self, project: str, task_id: int, description: str, done: bool) -> None:
+        pass
+
+    def on_done_changed(self, task_id: int, done: bool) -> None:
+        pass
+
+    def on_deadline_changed(self, task_id: int, deadline: str) -> None:
+        if not self._stale:
+            self._pending[task_id] = to_ordinal(deadline) if deadline else 0
+
+    def on_loaded(self) -> None:
+        self._stale = True
+        self._ordinals = {}
+        self._entries = []
+        self._pending = {}
+        self._positions = {}
+        self._unordered_projects = set()
+
+    def _refresh(self) -> None:
+        if self._stale:
+            self._rebuild()
+        elif len(self._pending) > self.INSORT_MAX:
+            for task_id, ordinal in self._pending.items():
+                if ordinal:
+                    self._ordinals[task_id] = ordinal
+                else:
+                    self._ordinals.pop(task_id, None)
+            self._pending = {}
+            self._entries = sorted((ordinal, self._rank(task_id), task_id) for task_id, ordinal in self._ordinals.items())
+        elif self._pending:
+            for task_id, ordinal in self._pending.items():
+                rank = self._rank(task_id)
+                previous = self._ordinals.pop(task_id, None)
+                if previous is not None:
+                    del self._entries[bisect_left(self._entries, (previous, rank, task_id))]
+                if ordinal:
+                    self._ordinals[task_id] = ordinal
+                    insort(self._entries, (ordinal, rank, task_id))
+            self._pending = {}
+
+    def _ids_between(self, start, stop) -> List[int]:
+        self._refresh()
+        low = 0 if start is None else bisect_left(self._entries, (start,))
+        high = bisect_left(self._entries, (stop,))
+        return [task_id for _, _, task_id in self._entries[low:high]]
+
+    def _rank(self, task_id: int) -> int:
+        """Sort key of a task among the tasks of its project.
+
+        In a project whose tasks were in ID order at the last rebuild, the ID itself:
+        tasks added later get higher IDs and go to the end. Only the tasks of the other
+        projects, as after importing a file that is not sorted by ID, have their
+        position kept; tasks added to those later rank after all of the positions.
+        """
+        position = self._positions.get(task_id)
+        if position is not None:
+            return position
+        if self._unordered_projects:
+            entry = self._store.get(task_id)
+            if entry is not None and entry[0] in self._unordered_projects:
+                return self._tasks_at_rebuild + task_id
+        return task_id
+
+    def _rebuild(self) -> None:
+        self._ordinals = {}
+        self._positions = {}
+        self._unordered_projects = set()
+        position = 0
+        for project_name, tasks in self._store.items():
+            previous = None
+            ordered = True
+            for task in tasks:
+                task_id = task.id
+                if task_id is None:
+                    continue
+                if ordered and previous is not None and task_id <= previous:
+                    ordered = False
+                previous = task_id
+                if task.deadline_ordinal:
+                    self._ordinals.setdefault(task_id, task.deadline_ordinal)
+            task_ids = [task.id for task in tasks if task.id is not None] if not ordered else ()
+            if task_ids:
+                self._unordered_projects.add(project_name)
+                for offset, task_id in enumerate(task_ids):
+                    self._positions.setdefault(task_id, position + offset)
+            position += len(tasks)
+        self._tasks_at_rebuild = position
+        self._entries = sorted((ordinal, self._rank(task_id), task_id) for task_id, ordinal in self._ordinals.items())
+        self._pending = {}
+        self._stale = False
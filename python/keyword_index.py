@@ -0,0 +1,90 @@
+from array import array
+from typing import Dict, Optional, Set
+from task_store import TaskStore
+
+# Characters that give a keyword a meaning beyond its literal text when used as a regex
+REGEX_SPECIAL_CHARACTERS = set('.^$*+?{}[]\\|()')
+
+
+class KeywordIndex:
+    """Inverted trigram index over task descriptions.
+
+    Every lowercased description is split into its three-character substrings and the
+    task ID is appended to the posting list of each one. A keyword can only occur in a
+    description that contains all of its trigrams, so looking up the rarest trigram of
+    the keyword gives a small set of candidate tasks that still needs to be verified.
+
+    The index is kept up to date by subscribing to the task store. Tasks of a replaced
+    project stay in the posting lists; they are filtered out when the candidates are
+    matched against the current tasks.
+    """
+
+    GRAM = 3
+
+    def __init__(self, store: TaskStore):
+        self._store = store
+        self._postings: Dict[str, array] = {}
+        self._stale = True
+        store.subscribe(self)
+
+    @classmethod
+    def is_plain(cls, keyword: str) -> bool:
+        """Whether the keyword matches the same text as a regex and as a literal."""
+        return not REGEX_SPECIAL_CHARACTERS.intersection(keyword)
+
+    def candidates(self, keyword: str) -> Optional[Set[int]]:
+        """Return the IDs of tasks whose description may contain the keyword.
+
+        Returns None when the keyword is too short to be looked up in the index.
+        """
+        keyword = keyword.lower()
+        if len(keyword) < self.GRAM:
+            return None
+        if self._stale:
+            self._rebuild()
+        postings = sorted((self._postings.get(gram, ()) for gram in self._grams(keyword)), key=len)
+        candidates = set(postings[0])
+        for posting in postings[1:]:
+            if not candidates:
+                break
+            candidates.intersection_update(posting)
+        return candidates
+
+    def on_project_added(self, name: str) -> None:
+        pass
+
+    def on_task_added(self, project: str, task_id: int, description: str, done: bool) -> None:
+        if not self._stale:
+            self._add(task_id, description)
+
+    def on_done_changed(self, task_id: int, done: bool) -> None:
+        pass
+
+    def on_deadline_changed(self, task_id: int, deadline: str) -> None:
+        pass
+
+    def on_loaded(self) -> None:
+        # Rebuilt on the next lookup, so a series of imports only pays for one rebuild
+        self._stale = True
+        self._postings = {}
+
+    def _rebuild(self) -> None:
+        self._postings = {}
+        for _, tasks in self._store.items():
+            for task in tasks:
+                if task.id is not None:
+                    self._add(task.id, task.description)
+        self._stale = False
+
+    def _add(self, task_id: int, description: str) -> None:
+        if not isinstance(description, str):
+            return
+        for gram in self._grams(description.lower()):
+            posting = self._postings.get(gram)
+            if posting is None:
+                posting = self._postings[gram] = array('q')
+            posting.append(task_id)
+
+    @classmethod
+    def _grams(cls, text: str) -> Set[str]:
+        return {text[i:i + cls.GRAM] for i in range(len(text) - cls.GRAM + 1)}
@@ -0,0 +1,35 @@
+import time
+from typing import TextIO
+
+
+class OutputSink:
+    """Writes the output of commands to a stream and decides when to flush it.
+
+    Every command renders its output into one string and writes it with a single call.
+    With the default flush_threshold of 0 the stream is flushed after every write, which
+    is what an interactive console needs. A positive threshold only flushes once that
+    many characters have been written since the last flush, so long runs of commands
+    writing to a pipe or file do not pay for a system call each.
+    """
+
+    def __init__(self, stream: TextIO, flush_threshold: int = 0):
+        self.stream = stream
+        self.flush_threshold = flush_threshold
+        self._unflushed = 0
+        self.flushes = 0
+        self.flush_seconds = 0.0
+
+    def write(self, text: str) -> None:
+        if not text:
+            return
+        self.stream.write(text)
+        self._unflushed += len(text)
+        if self._unflushed >= self.flush_threshold:
+            self.flush()
+
+    def flush(self) -> None:
+        start = time.perf_counter()
+        self.stream.flush()
+        self.flush_seconds += time.perf_counter() - start
+        self.flushes += 1
+        self._unflushed = 0
@@ -0,0 +1,216 @@
+import os
+import re
+import weakref
+from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context, shared_memory
+from typing import Callable, Dict, List, Optional, Tuple
+import numpy as np
+import pandas as pd
+from task_analytics import TaskAnalytics
+from task_snapshot import pack_strings, unpack_strings
+
+# Name, dtype and shape of an array in shared memory
+SharedArray = Tuple[str, str, Tuple[int, ...]]
+
+
+class ParallelTaskAnalytics(TaskAnalytics):
+    """TaskAnalytics that spreads the work on large frames over a pool of processes.
+
+    The rows are sharded by project: a project's tasks all go to the same worker.
+    Each worker gets only the rows of its shard, in shared memory, so the frame is
+    never pickled, and returns only its partial counts or the positions of its
+    matching rows, which are merged into the result. Results are the same as those
+    of TaskAnalytics, in the same order.
+
+    The grouping of the rows by shard, and the shards of the project, task_id and
+    description columns, are kept for the last frame queried (see _Partition), so
+    repeated queries on a frame only copy its done and deadline columns, which
+    AnalyticsView updates in place. The other columns of a frame must not be
+    modified in place between queries.
+
+    Frames with fewer than PARALLEL_MIN_ROWS rows are handled in this process, and
+    queries that a keyword or deadline index answers still use the index.
+    Workers are started with spawn, which is safe in the threaded web servers.
+    """
+
+    PARALLEL_MIN_ROWS = 200_000
+
+    def __init__(self, workers: Optional[int] = None):
+        self.workers = workers or os.cpu_count() or 1
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._partition: Optional[_Partition] = None
+
+    def close(self) -> None:
+        if self._partition is not None:
+            self._partition.release()
+            self._partition = None
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def _count_by_project(self, df: pd.DataFrame):
+        if len(df) < self.PARALLEL_MIN_ROWS:
+            return super()._count_by_project(df)
+        partition = self._partition_of(df)
+        done = df['done'].to_numpy().astype('float64')
+        partials = self._map(_count_shard, partition.counted_columns(df), [done[rows] for rows in partition.counted_rows],
+                             partition.n_projects)
+        total_tasks, done_counts, completed_tasks = (np.sum(counts, axis=0).astype('int64') for counts in zip(*partials))
+        return partition.project_names, total_tasks, done_counts, completed_tasks
+
+    def _scan_descriptions(self, df: pd.DataFrame, keyword: str, regex: bool) -> pd.DataFrame:
+        if len(df) < self.PARALLEL_MIN_ROWS:
+            return super()._scan_descriptions(df, keyword, regex)
+        partition = self._partition_of(df)
+        descriptions = partition.description_columns(df)
+        if descriptions is None:
+            return super()._scan_descriptions(df, keyword, regex)
+        if regex:
+            # Invalid patterns fail here, like they do in pandas
+            re.compile(keyword)
+        matches = self._map(_match_shard, descriptions, None, keyword, regex)
+        return df.iloc[partition.rows_of(matches)]
+
+    def _scan_deadlines(self, df: pd.DataFrame, current_date: str) -> pd.DataFrame:
+        if len(df) < self.PARALLEL_MIN_ROWS or df['deadline'].dtype != 'datetime64[ns]':
+            return super()._scan_deadlines(df, current_date)
+        partition = self._partition_of(df)
+        deadlines = df['deadline'].to_numpy().view(np.int64)
+        before = np.datetime64(datetime.strptime(current_date, '%d-%m-%Y'), 'ns').view(np.int64)
+        matches = self._map(_before_shard, None, [deadlines[rows] for rows in partition.rows], int(before))
+        return df.iloc[partition.rows_of(matches)]
+
+    def _partition_of(self, df: pd.DataFrame) -> '_Partition':
+        if self._partition is None or self._partition.frame() is not df or len(self._partition.rows) != self.workers:
+            if self._partition is not None:
+                self._partition.release()
+            self._partition = _Partition(df, self.workers)
+        return self._partition
+
+    def _map(self, function: Callable, kept: Optional[List[List[SharedArray]]], arrays: Optional[List[np.ndarray]], *arguments) -> list:
+        """Run function on every shard, with the kept shared arrays and the array of that shard."""
+        blocks = []
+        try:
+            shared = [list(kept[shard]) if kept is not None else [] for shard in range(self.workers)]
+            if arrays is not None:
+                for shard, array in enumerate(arrays):
+                    shared[shard].append(_share(array, blocks))
+            futures = [self._executor().submit(_run_shared, function, shard_arrays, *arguments) for shard_arrays in shared]
+            return [future.result() for future in futures]
+        finally:
+            _release(blocks)
+
+    def _executor(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(self.workers, mp_context=get_context("spawn"))
+        return self._pool
+
+
+class _Partition:
+    """The rows of a frame grouped by shard, and the shards of the columns that stay the same.
+
+    Shared arrays are created on first use and kept until release().
+    """
+
+    def __init__(self, df: pd.DataFrame, shards: int):
+        self.frame = weakref.ref(df)
+        codes, project_names = pd.factorize(df['project_name'], sort=True)
+        self.project_names = np.asarray(project_names, dtype=object)
+        self.n_projects = len(project_names)
+        self._codes = codes
+        # Rows without a project name are scanned by the first shard, but not counted
+        shard_of_row = np.where(codes >= 0, codes % shards, 0)
+        order = np.argsort(shard_of_row, kind='stable')
+        bounds = np.searchsorted(shard_of_row[order], np.arange(shards + 1))
+        self.rows = [order[bounds[shard]:bounds[shard + 1]] for shard in range(shards)]
+        self.counted_rows = [rows[codes[rows] >= 0] for rows in self.rows]
+        self.sharded: Dict[str, Optional[List[List[SharedArray]]]] = {}
+        self._blocks: List[shared_memory.SharedMemory] = []
+
+    def counted_columns(self, df: pd.DataFrame) -> List[List[SharedArray]]:
+        """Project codes and task flags of the counted rows of every shard."""
+        if 'counted' not in self.sharded:
+            has_task = df['task_id'].notna().to_numpy()
+            self.sharded['counted'] = [
+                [_share(self._codes[rows].astype(np.int64), self._blocks), _share(has_task[rows], self._blocks)]
+                for rows in self.counted_rows
+            ]
+        return self.sharded['counted']
+
+    def description_columns(self, df: pd.DataFrame) -> Optional[List[List[SharedArray]]]:
+        """Descriptions of every shard packed by pack_strings, None unless they are all strings."""
+        if 'descriptions' not in self.sharded:
+            descriptions = df['description'].tolist()
+            if all(isinstance(description, str) for description in descriptions):
+                sharded = []
+                for rows in self.rows:
+                    text, offsets = pack_strings([descriptions[row] for row in rows.tolist()])
+                    sharded.append([_share(text, self._blocks), _share(offsets, self._blocks)])
+                self.sharded['descriptions'] = sharded
+            else:
+                self.sharded['descriptions'] = None
+        return self.sharded['descriptions']
+
+    def rows_of(self, positions: List[np.ndarray]) -> np.ndarray:
+        """Frame rows, in order, of the positions within each shard."""
+        return np.sort(np.concatenate([rows[shard_positions] for rows, shard_positions in zip(self.rows, positions)]))
+
+    def release(self) -> None:
+        _release(self._blocks)
+        self._blocks = []
+        self.sharded = {}
+
+
+def _share(array: np.ndarray, blocks: List[shared_memory.SharedMemory]) -> SharedArray:
+    block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+    blocks.append(block)
+    np.ndarray(array.shape, array.dtype, buffer=block.buf)[...] = array
+    return block.name, array.dtype.str, array.shape
+
+
+def _release(blocks: List[shared_memory.SharedMemory]) -> None:
+    for block in blocks:
+        block.close()
+        block.unlink()
+
+
+def _run_shared(function: Callable, shared: List[SharedArray], *arguments):
+    # Runs in a worker: attach to the arrays, and detach before returning
+    blocks = []
+    try:
+        for name, _, _ in shared:
+            # Spawned workers share the resource tracker of the parent, which unlinks the memory
+            blocks.append(shared_memory.SharedMemory(name=name))
+        arrays = [np.ndarray(shape, np.dtype(dtype), buffer=block.buf) for block, (_, dtype, shape) in zip(blocks, shared)]
+        result = function(*arrays, *arguments)
+        # Results must not be views on the shared memory, which is closed below
+        del arrays
+        return result
+    finally:
+        for block in blocks:
+            block.close()
+
+
+def _count_shard(codes: np.ndarray, has_task: np.ndarray, done: np.ndarray, n_projects: int):
+    has_done = ~np.isnan(done)
+    return (
+        np.bincount(codes, weights=has_task, minlength=n_projects),
+        np.bincount(codes, weights=has_done, minlength=n_projects),
+        np.bincount(codes, weights=np.where(has_done, done, 0.0), minlength=n_projects),
+    )
+
+
+def _match_shard(text: np.ndarray, offsets: np.ndarray, keyword: str, regex: bool) -> np.ndarray:
+    descriptions = unpack_strings(text, offsets)
+    if regex:
+        search = re.compile(keyword).search
+        matched = [position for position, description in enumerate(descriptions) if search(description.lower())]
+    else:
+        matched = [position for position, description in enumerate(descriptions) if keyword in description.lower()]
+    return np.array(matched, dtype=np.int64)
+
+
+def _before_shard(deadlines: np.ndarray, before: int) -> np.ndarray:
+    # NaT is the smallest int64, but is never before a date
+    return np.flatnonzero((deadlines < before) & (deadlines != np.iinfo(np.int64).min))
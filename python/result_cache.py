@@ -0,0 +1,64 @@
+from collections import OrderedDict
+from typing import Hashable, Optional
+from task_store import TaskStore
+
+
+class ResultCache:
+    """Outputs of commands that only depend on the tasks, kept until the tasks change.
+
+    The cache subscribes to the store and counts its changes in `version`. Outputs
+    are kept for the version they were computed on; the first lookup after a change
+    empties the cache. At most max_entries outputs are kept, the least recently used
+    one is dropped first.
+    """
+
+    MAX_ENTRIES = 128
+
+    def __init__(self, store: TaskStore, max_entries: int = MAX_ENTRIES):
+        self.max_entries = max_entries
+        self.version = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries: 'OrderedDict[Hashable, str]' = OrderedDict()
+        self._entries_version = 0
+        store.subscribe(self)
+
+    def __len__(self) -> int:
+        return len(self._entries) if self._entries_version == self.version else 0
+
+    def get(self, key: Hashable) -> Optional[str]:
+        self._expire()
+        output = self._entries.get(key)
+        if output is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return output
+
+    def put(self, key: Hashable, output: str) -> None:
+        self._expire()
+        self._entries[key] = output
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _expire(self) -> None:
+        if self._entries_version != self.version:
+            self._entries.clear()
+            self._entries_version = self.version
+
+    def on_project_added(self, name: str) -> None:
+        self.version += 1
+
+    def on_task_added(self, project: str, task_id: int, description: str, done: bool) -> None:
+        self.version += 1
+
+    def on_done_changed(self, task_id: int, done: bool) -> None:
+        self.version += 1
+
+    def on_deadline_changed(self, task_id: int, deadline: str) -> None:
+        self.version += 1
+
+    def on_loaded(self) -> None:
+        self.version += 1
@@ -1,9 +1,30 @@
+from datetime import date
+from functools import lru_cache
+
+
+@lru_cache(maxsize=1 << 12)
+def to_ordinal(deadline: str) -> int:
+    """Convert a 'DD-MM-YYYY' deadline to a proleptic Gregorian ordinal."""
+    day, month, year = deadline.split("-")
+    return date(int(year), int(month), int(day)).toordinal()
+
+
+@lru_cache(maxsize=1 << 12)
+def format_deadline(ordinal: int) -> str:
+    """Convert a proleptic Gregorian ordinal to a 'DD-MM-YYYY' deadline."""
+    return date.fromordinal(ordinal).strftime('%d-%m-%Y')
+
+
 class Task:
+    # Slots instead of a __dict__ per task. The deadline is kept as a date ordinal, 0
+    # when there is none, and is only formatted when it is read as a string.
+    __slots__ = ('_id', '_description', '_done', '_deadline_ordinal')
+
     def __init__(self, id: int, description: str, done: bool = False):
         self._id = id
         self._description = description
         self._done = done
-        self._deadline = ""
+        self._deadline_ordinal = 0
 
     @property
     def id(self) -> int:
@@ -16,10 +37,14 @@ class Task:
     @property
     def done(self) -> bool:
         return self._done
-    
+
     @property
     def deadline(self) -> str:
-        return self._deadline
+        return format_deadline(self._deadline_ordinal) if self._deadline_ordinal else ""
+
+    @property
+    def deadline_ordinal(self) -> int:
+        return self._deadline_ordinal
 
     @done.setter
     def done(self, done: bool):
@@ -27,8 +52,12 @@ class Task:
 
     @deadline.setter
     def deadline(self, deadline: str):
-        self._deadline = deadline
+        self._deadline_ordinal = to_ordinal(deadline) if deadline else 0
 
     @deadline.deleter
     def deadline(self):
-        self._deadline = ""
\ No newline at end of file
+        self._deadline_ordinal = 0
+
+    @deadline_ordinal.setter
+    def deadline_ordinal(self, ordinal: int):
+        self._deadline_ordinal = ordinal
@@ -1,10 +1,17 @@
 import pandas as pd
-from typing import Dict, List
+from typing import Dict, Iterator, List, Optional
 from task import Task
+from keyword_index import KeywordIndex
+from deadline_index import DeadlineIndex, to_ordinal
 import numpy as np
-from datetime import datetime
+from datetime import date, datetime
 
 class TaskAnalytics:
+    # Index lookups are used when at most 1 in INDEX_SELECTIVITY rows is selected
+    INDEX_SELECTIVITY = 8
+    EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+    # Rows the queries looked at, whole frames or the rows an index selected
+    rows_scanned = 0
     
     def import_from_dict(self, tasks_dict: Dict[str, List[Task]]) -> pd.DataFrame:
         """Import tasks from dictionary structure and convert to DataFrame.
@@ -15,10 +22,13 @@ class TaskAnalytics:
         - The 'deadline' column should be converted to datetime
         """
         array = [
-            [project, task.id, task.description, task.done, task.deadline, task] for project, tasks in tasks_dict.items() for task in (tasks if len(tasks)>0 else [Task(None,'',None)])
+            [project, task.id, task.description, task.done, task.deadline_ordinal, task] for project, tasks in tasks_dict.items() for task in (tasks if len(tasks)>0 else [Task(None,'',None)])
         ]
         df = pd.DataFrame(array, columns=['project_name', 'task_id', 'description', 'done', 'deadline', 'task'])
-        df['deadline'] = pd.to_datetime(df['deadline'], format='%d-%m-%Y')
+        # Deadlines are date ordinals, 0 for none, which convert without parsing strings
+        ordinals = df['deadline'].to_numpy(dtype=np.int64)
+        has_deadline = ordinals != 0
+        df['deadline'] = pd.to_datetime(np.where(has_deadline, ordinals - self.EPOCH_ORDINAL, 0), unit='D').where(has_deadline)
         return df
     
     def export_to_dict(self, df: pd.DataFrame) -> Dict[str, List[Task]]:
@@ -52,6 +62,53 @@ class TaskAnalytics:
         df['deadline'] = pd.to_datetime(df['deadline'], format='%d-%m-%Y')
         return df
       
+    def read_csv_chunks(self, filepath: str, chunksize: int) -> Iterator[pd.DataFrame]:
+        """Read tasks from a CSV file written by export_to_csv, one chunk at a time.
+
+        Note:
+        - At most chunksize rows are held in memory at once.
+        - Each chunk is validated and typed before it is returned: 'task_id' as Int64,
+          'done' as boolean and 'deadline' as datetime. Invalid rows raise a ValueError
+          naming their line numbers.
+        - Rows without a task_id are projects without tasks.
+        - Empty descriptions are read as empty strings.
+        """
+        columns = ['project_name', 'task_id', 'description', 'done', 'deadline']
+        with open(filepath) as file:
+            if file.readline().rstrip('\r\n').split(',') != columns:
+                raise ValueError(f"line 1 is not the header {','.join(columns)}")
+        reader = pd.read_csv(filepath, names=columns, header=0, dtype=str, keep_default_na=False, na_values=[''], chunksize=chunksize)
+        with reader:
+            for chunk in reader:
+                yield self._validate_chunk(chunk)
+
+    def _validate_chunk(self, chunk: pd.DataFrame) -> pd.DataFrame:
+        # Line 1 of the file is the header
+        lines = f"{chunk.index[0] + 2}-{chunk.index[-1] + 2}" if len(chunk) else ""
+        if chunk['project_name'].isna().any():
+            raise ValueError(f"missing project name on lines {lines}")
+        try:
+            task_ids = pd.to_numeric(chunk['task_id'])
+        except ValueError:
+            raise ValueError(f"invalid task ID on lines {lines}")
+        if (task_ids.dropna() % 1 != 0).any():
+            raise ValueError(f"invalid task ID on lines {lines}")
+        has_task = task_ids.notna()
+        done = chunk['done'].map({'True': True, 'False': False})
+        if (done.isna() & (chunk['done'].notna() | has_task)).any():
+            raise ValueError(f"invalid done flag on lines {lines}")
+        try:
+            deadline = pd.to_datetime(chunk['deadline'], format='%d-%m-%Y')
+        except ValueError:
+            raise ValueError(f"invalid deadline on lines {lines}, use format DD-MM-YYYY")
+        return pd.DataFrame({
+            'project_name': chunk['project_name'],
+            'task_id': task_ids.astype('Int64'),
+            'description': chunk['description'].fillna(''),
+            'done': done.astype('boolean'),
+            'deadline': deadline,
+        })
+      
     def get_project_summary(self, df: pd.DataFrame) -> pd.DataFrame:
         """Generate a summary DataFrame for all projects.
         
@@ -61,14 +118,20 @@ class TaskAnalytics:
         - completed_tasks
         - pending_tasks
         - completion_rate (percentage)
+
+        Note:
+        - Counts are computed with np.bincount on the factorized project names,
+          which avoids calling a Python function per project.
         """
-        df_grouped = df.groupby(['project_name'], as_index=False).agg(
-            total_tasks=('task_id','count'), 
-            completed_tasks=('done',lambda x: int(x.sum(skipna=True))),
-            pending_tasks=('done', lambda x: x.count() - x.sum(skipna=True)),
-            completion_rate=('done', lambda x: 100*np.mean(x))
-        )
-        return df_grouped
+        self.rows_scanned += len(df)
+        project_names, total_tasks, done_counts, completed_tasks = self._count_by_project(df)
+        return pd.DataFrame({
+            'project_name': project_names,
+            'total_tasks': total_tasks,
+            'completed_tasks': completed_tasks,
+            'pending_tasks': done_counts - completed_tasks,
+            'completion_rate': self._completion_rate(done_counts, completed_tasks),
+        })
     
     def get_top_projects_by_completion(self, df: pd.DataFrame, n: int = 5) -> pd.DataFrame:
         """Get the top N projects with the highest completion rates.
@@ -77,16 +140,79 @@ class TaskAnalytics:
         - project_name
         - completion_rate (percentage)
         """
-        return df.groupby(['project_name'], as_index=False).agg(completion_rate=('done',lambda x: 100*np.mean(x))).sort_values(by=['completion_rate'], ascending=False).head(n)
+        self.rows_scanned += len(df)
+        project_names, _, done_counts, completed_tasks = self._count_by_project(df)
+        rates = pd.DataFrame({
+            'project_name': project_names,
+            'completion_rate': self._completion_rate(done_counts, completed_tasks),
+        })
+        # A stable sort keeps ties in project name order; projects without a completion rate go last
+        return rates.sort_values(by=['completion_rate'], ascending=False, kind='stable', na_position='last').head(n)
+
+    def _count_by_project(self, df: pd.DataFrame):
+        """Count tasks, non-missing done flags and completed tasks per project, sorted by project name."""
+        codes, project_names = pd.factorize(df['project_name'], sort=True)
+        grouped = codes >= 0
+        codes = codes[grouped]
+        done = df['done'].to_numpy()[grouped].astype('float64')
+        has_done = ~np.isnan(done)
+        n_projects = len(project_names)
+        total_tasks = np.bincount(codes, weights=df['task_id'].notna().to_numpy()[grouped], minlength=n_projects).astype('int64')
+        done_counts = np.bincount(codes, weights=has_done, minlength=n_projects).astype('int64')
+        completed_tasks = np.bincount(codes, weights=np.where(has_done, done, 0.0), minlength=n_projects).astype('int64')
+        return np.asarray(project_names, dtype=object), total_tasks, done_counts, completed_tasks
+
+    @staticmethod
+    def _completion_rate(done_counts: np.ndarray, completed_tasks: np.ndarray) -> np.ndarray:
+        mean = np.divide(completed_tasks, done_counts, out=np.full(len(done_counts), np.nan), where=done_counts > 0)
+        return 100 * mean
     
-    def find_tasks_by_keyword(self, df: pd.DataFrame, keyword: str) -> pd.DataFrame:
+    def find_tasks_by_keyword(self, df: pd.DataFrame, keyword: str, regex: bool = True,
+                              keyword_index: Optional[KeywordIndex] = None) -> pd.DataFrame:
         """Find all tasks containing a specific keyword in their description.
+
+        Note:
+        - The keyword is treated as a regular expression unless regex is False.
+        - If a KeywordIndex over the same tasks is given, keywords without regex
+          meaning only have their candidate rows checked instead of every row.
         """
-        return df.loc[df['description'].str.lower().str.contains(keyword.lower())][['project_name', 'task_id', 'description', 'done', 'deadline']]
+        columns = ['project_name', 'task_id', 'description', 'done', 'deadline']
+        keyword = keyword.lower()
+        if keyword_index is not None and (not regex or KeywordIndex.is_plain(keyword)):
+            candidates = keyword_index.candidates(keyword)
+            if candidates is not None:
+                rows = np.flatnonzero(df['task_id'].isin(candidates).to_numpy())
+                self.rows_scanned += len(rows)
+                matches = df['description'].iloc[rows].str.lower().str.contains(keyword, regex=False)
+                mask = np.zeros(len(df), dtype=bool)
+                mask[rows[matches.fillna(False).to_numpy(dtype=bool)]] = True
+                return df.loc[mask][columns]
+        self.rows_scanned += len(df)
+        return self._scan_descriptions(df, keyword, regex)[columns]
+
+    def _scan_descriptions(self, df: pd.DataFrame, keyword: str, regex: bool) -> pd.DataFrame:
+        """Rows whose lowercased description contains the lowercased keyword, checking every row."""
+        return df.loc[df['description'].str.lower().str.contains(keyword, regex=regex)]
         
-    def find_overdue_tasks(self, df: pd.DataFrame, current_date: str) -> pd.DataFrame:
+    def find_overdue_tasks(self, df: pd.DataFrame, current_date: str,
+                           deadline_index: Optional[DeadlineIndex] = None) -> pd.DataFrame:
         """Find all incomplete tasks past their deadline.
+
+        Note:
+        - If a DeadlineIndex over the same tasks is given, the overdue tasks are
+          looked up in the index instead of comparing every deadline. When a large
+          share of the tasks is overdue, comparing all deadlines is faster.
         """
-        df_overdue = df.loc[df['deadline'] < datetime.strptime(current_date, '%d-%m-%Y')]
+        if deadline_index is not None and deadline_index.count_before(to_ordinal(current_date)) * self.INDEX_SELECTIVITY <= len(df):
+            overdue_ids = deadline_index.due_before(to_ordinal(current_date))
+            rows = np.flatnonzero(df['task_id'].isin(overdue_ids).to_numpy())
+            self.rows_scanned += len(rows)
+            return df.iloc[rows][['project_name', 'task_id', 'description', 'done', 'deadline']]
+        self.rows_scanned += len(df)
+        df_overdue = self._scan_deadlines(df, current_date)
         df_overdue['deadline'] = pd.to_datetime(df_overdue['deadline'])
-        return df_overdue[['project_name', 'task_id', 'description', 'done', 'deadline']]
\ No newline at end of file
+        return df_overdue[['project_name', 'task_id', 'description', 'done', 'deadline']]
+
+    def _scan_deadlines(self, df: pd.DataFrame, current_date: str) -> pd.DataFrame:
+        """Rows with a deadline before current_date, comparing every deadline."""
+        return df.loc[df['deadline'] < datetime.strptime(current_date, '%d-%m-%Y')]
@@ -1,11 +1,30 @@
-from flask import Flask, render_template, request, flash
-from task_list import TaskList
-import sys 
+from datetime import datetime
+from flask import Flask, Response, render_template, request, flash, jsonify
+from concurrent_task_list import ConcurrentTaskList
 
 app = Flask(__name__)
 app.secret_key = "super_secret_passkey"
 
-tasks = TaskList(sys.stdin, sys.stdout)
+# Shared by the threads of the server, see ConcurrentTaskList
+tasks = ConcurrentTaskList()
+
+# Tasks per page of /projects
+PAGE_SIZE = 100
+# Commands accepted by one /api/batch request
+MAX_BATCH_SIZE = 10_000
+
+def page_arguments(limit):
+	offset = request.args.get('offset', 0, type=int)
+	limit = request.args.get('limit', limit, type=int)
+	return max(offset, 0), (max(limit, 1) if limit is not None else None)
+
+def render_projects_page():
+	offset, limit = page_arguments(PAGE_SIZE)
+	chunks = list(tasks.stream(f"show --offset {offset} --limit {limit}"))
+	# The last chunk tells how to continue when there are more tasks, shown as a link instead
+	more = bool(chunks) and chunks[-1].startswith("(more: ")
+	page = ''.join(chunks[:-1] if more else chunks)
+	return render_template('projects.html', page=page, offset=offset, limit=limit, next_offset=offset + limit if more else None)
 
 @app.route("/tasks")
 def welcome():
@@ -14,16 +33,97 @@ def welcome():
 
 @app.route("/tasks", methods=['POST', 'GET'])
 def response():
-	flash(tasks.execute(str(request.form['command_input'])))
-	return render_template("tasks.html")
+	# Rendered into the page rather than flashed, large outputs do not fit in the session cookie
+	return render_template("tasks.html", output=tasks.execute(str(request.form['command_input'])))
 
 @app.route("/projects", methods=["GET"])
 def projects():
-	flash(tasks.execute('show'))
-	return render_template('projects.html')
+	return render_projects_page()
 
 @app.route("/projects", methods=["POST", "GET"])
 def add_projects():
     tasks.execute(f"add project {request.form['project_to_create']}")
-    flash(tasks.execute('show').replace("\n", '<br>'))
-    return render_template('projects.html')
\ No newline at end of file
+    return render_projects_page()
+
+@app.route("/projects/stream", methods=["GET"])
+def stream_projects():
+	# Sent with chunked transfer encoding, one project at a time
+	offset, limit = page_arguments(None)
+	command = f"show --offset {offset}" + (f" --limit {limit}" if limit is not None else "")
+	return Response(tasks.stream(command), mimetype='text/plain')
+
+@app.route("/metrics", methods=["GET"])
+def metrics():
+	# Prometheus text exposition format
+	return Response(tasks.metrics_text(), mimetype='text/plain; version=0.0.4')
+
+
+# JSON API
+
+def api_error(message, status):
+	return jsonify({"error": message}), status
+
+@app.route("/api/projects", methods=["GET"])
+def api_projects():
+	return jsonify([{"name": name, "task_count": count} for name, count in tasks.task_counts().items()])
+
+@app.route("/api/projects", methods=["POST"])
+def api_add_project():
+	name = (request.get_json(silent=True) or {}).get("name")
+	if not isinstance(name, str) or not name:
+		return api_error("name must be a non-empty string", 400)
+	tasks.add_project(name)
+	return jsonify({"name": name, "task_count": 0}), 201
+
+@app.route("/api/projects/<name>/tasks", methods=["GET"])
+def api_project_tasks(name):
+	offset, limit = page_arguments(None)
+	records = tasks.tasks_of(name, offset, limit)
+	if records is None:
+		return api_error(f'no project with the name "{name}"', 404)
+	return jsonify(records)
+
+@app.route("/api/projects/<name>/tasks", methods=["POST"])
+def api_add_task(name):
+	description = (request.get_json(silent=True) or {}).get("description")
+	if not isinstance(description, str) or not description:
+		return api_error("description must be a non-empty string", 400)
+	record = tasks.add_task(name, description)
+	if record is None:
+		return api_error(f'no project with the name "{name}"', 404)
+	return jsonify(record), 201
+
+@app.route("/api/tasks/<int:task_id>", methods=["GET"])
+def api_task(task_id):
+	record = tasks.get(task_id)
+	if record is None:
+		return api_error(f"no task with the ID {task_id}", 404)
+	return jsonify(record)
+
+@app.route("/api/tasks/<int:task_id>", methods=["PATCH"])
+def api_update_task(task_id):
+	changes = request.get_json(silent=True) or {}
+	done, deadline = changes.get("done"), changes.get("deadline")
+	if done is not None and not isinstance(done, bool):
+		return api_error("done must be true or false", 400)
+	if deadline is not None:
+		try:
+			deadline = datetime.strptime(deadline, "%d-%m-%Y").strftime("%d-%m-%Y")
+		except (TypeError, ValueError):
+			return api_error("deadline must be a date in the format DD-MM-YYYY", 400)
+	record = tasks.update_task(task_id, done, deadline)
+	if record is None:
+		return api_error(f"no task with the ID {task_id}", 404)
+	return jsonify(record)
+
+@app.route("/api/batch", methods=["POST"])
+def api_batch():
+	# Either a list of commands or {"commands": [...]}
+	body = request.get_json(silent=True)
+	commands = body.get("commands") if isinstance(body, dict) else body
+	if not isinstance(commands, list) or not all(isinstance(command, str) for command in commands):
+		return api_error("expected a list of command strings", 400)
+	if len(commands) > MAX_BATCH_SIZE:
+		return api_error(f"at most {MAX_BATCH_SIZE} commands per batch", 413)
+	outputs = tasks.execute_batch(commands)
+	return jsonify({"results": [{"command": command, "output": output} for command, output in zip(commands, outputs)]})
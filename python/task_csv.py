@@ -0,0 +1,79 @@
+import csv
+import os
+import tempfile
+from contextlib import contextmanager
+from typing import IO, Iterator
+from task_store import TaskStore
+
+CSV_COLUMNS = ['project_name', 'task_id', 'description', 'done', 'deadline']
+EXPORT_BATCH_SIZE = 10_000
+
+
+@contextmanager
+def atomic_write(filepath: str, mode: str = 'w', **open_kwargs) -> Iterator[IO]:
+    """Open a temporary file next to filepath that replaces it once the block completes.
+
+    If the block raises, the temporary file is removed and filepath is left untouched.
+    """
+    directory = os.path.dirname(os.path.abspath(filepath))
+    descriptor, temporary_path = tempfile.mkstemp(dir=directory, prefix=f".{os.path.basename(filepath)}.", suffix=".tmp")
+    try:
+        # mkstemp creates the file readable by its owner only, use the permissions open() would give
+        os.chmod(temporary_path, _file_permissions(filepath))
+        with os.fdopen(descriptor, mode, **open_kwargs) as file:
+            yield file
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temporary_path, filepath)
+    except BaseException:
+        if os.path.exists(temporary_path):
+            os.remove(temporary_path)
+        raise
+    _fsync_directory(directory)
+
+
+def _fsync_directory(directory: str) -> None:
+    # Makes the rename itself durable; not supported on every platform
+    try:
+        descriptor = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(descriptor)
+    except OSError:
+        pass
+    finally:
+        os.close(descriptor)
+
+
+def _file_permissions(filepath: str) -> int:
+    try:
+        return os.stat(filepath).st_mode & 0o777
+    except FileNotFoundError:
+        umask = os.umask(0)
+        os.umask(umask)
+        return 0o666 & ~umask
+
+
+def export_store_to_csv(store: TaskStore, filepath: str, batch_size: int = EXPORT_BATCH_SIZE) -> None:
+    """Write the tasks of a store to a CSV file without building a DataFrame first.
+
+    The file has the same bytes as TaskAnalytics.export_to_csv would write for the same
+    tasks. That includes its quirk of writing task IDs as floats (1.0) when there is a
+    project without tasks, as the empty task ID turns the ID column into floats.
+    Rows are written in batches and the file is replaced atomically.
+    """
+    float_ids = store.has_empty_project()
+    with atomic_write(filepath, newline='', buffering=1 << 20) as file:
+        writer = csv.writer(file, lineterminator=os.linesep)
+        writer.writerow(CSV_COLUMNS)
+        batch = []
+        for project_name, tasks in store.items():
+            if not tasks:
+                batch.append((project_name, '', '', '', ''))
+            for task in tasks:
+                batch.append((project_name, f"{task.id}.0" if float_ids else task.id, task.description, task.done, task.deadline))
+            if len(batch) >= batch_size:
+                writer.writerows(batch)
+                batch = []
+        writer.writerows(batch)
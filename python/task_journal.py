@@ -0,0 +1,169 @@
+import json
+import os
+import threading
+import time
+from typing import List, Optional
+from task_csv import atomic_write
+from task_store import TaskStore
+
+
+class TaskJournal:
+    """Write-ahead journal that makes the changes to a task store durable.
+
+    The journal directory holds a binary snapshot of the store and an append-only log
+    with one JSON record per change made after that snapshot:
+    - [sequence, "p", project name]
+    - [sequence, "t", project name, task ID, description, done]
+    - [sequence, "c", task ID, done]
+    - [sequence, "d", task ID, deadline]
+
+    Each record is written to the operating system as soon as the change is made, so it
+    survives the process being killed. Records are fsynced in groups: at most
+    GROUP_COMMIT_SIZE records or GROUP_COMMIT_INTERVAL seconds of changes can be lost
+    when the machine itself goes down. When no further change comes to complete a
+    group, a timer thread fsyncs it GROUP_COMMIT_INTERVAL seconds after its first record.
+
+    Opening a journal replays the log on top of the snapshot into the store. After
+    COMPACT_AFTER records, and after every import, the store is written to a new
+    snapshot and the log is emptied. The snapshot records the sequence number of its
+    last change, so records that are already in it are skipped when a crash happened
+    before the log was emptied.
+    """
+
+    SNAPSHOT_NAME = "snapshot.npz"
+    LOG_NAME = "journal.log"
+    GROUP_COMMIT_SIZE = 64
+    GROUP_COMMIT_INTERVAL = 0.05
+    COMPACT_AFTER = 100_000
+
+    def __init__(self, directory: str, store: TaskStore):
+        self._directory = directory
+        self._snapshot_path = os.path.join(directory, self.SNAPSHOT_NAME)
+        self._log_path = os.path.join(directory, self.LOG_NAME)
+        self._store = store
+        self._sequence = 0
+        self._records = 0
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+        # Taken by the timer thread too, which syncs groups that were left incomplete
+        self._lock = threading.RLock()
+        self._timer: Optional[threading.Timer] = None
+        os.makedirs(directory, exist_ok=True)
+        self.replayed = self._recover()
+        self._log = open(self._log_path, 'a', encoding='utf-8', newline='\n')
+        # Subscribe after the replay, so that replayed changes are not logged again
+        store.subscribe(self)
+
+    def sync(self) -> None:
+        """Flush and fsync all records written so far."""
+        with self._lock:
+            self._log.flush()
+            os.fsync(self._log.fileno())
+            self._unsynced = 0
+            self._last_sync = time.monotonic()
+
+    def compact(self) -> None:
+        """Write the store to a new snapshot and start an empty log."""
+        from task_snapshot import export_store_to_snapshot
+        with self._lock:
+            self.sync()
+            export_store_to_snapshot(self._store, self._snapshot_path, self._sequence)
+            self._log.close()
+            with atomic_write(self._log_path, encoding='utf-8'):
+                pass
+            self._log = open(self._log_path, 'a', encoding='utf-8', newline='\n')
+            self._records = 0
+
+    def close(self) -> None:
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if not self._log.closed:
+                self.sync()
+                self._log.close()
+
+    def on_project_added(self, name: str) -> None:
+        self._append(["p", name])
+
+    def on_task_added(self, project: str, task_id: int, description: str, done: bool) -> None:
+        self._append(["t", project, task_id, description, done])
+
+    def on_done_changed(self, task_id: int, done: bool) -> None:
+        self._append(["c", task_id, done])
+
+    def on_deadline_changed(self, task_id: int, deadline: str) -> None:
+        self._append(["d", task_id, deadline])
+
+    def on_loaded(self) -> None:
+        # An import replaces every task, which the log cannot express
+        self.compact()
+
+    def _append(self, record: list) -> None:
+        with self._lock:
+            self._sequence += 1
+            self._log.write(json.dumps([self._sequence] + record, ensure_ascii=False, separators=(',', ':')) + "\n")
+            self._log.flush()
+            self._records += 1
+            self._unsynced += 1
+            if self._unsynced >= self.GROUP_COMMIT_SIZE or time.monotonic() - self._last_sync >= self.GROUP_COMMIT_INTERVAL:
+                self.sync()
+            elif self._timer is None:
+                self._timer = threading.Timer(self.GROUP_COMMIT_INTERVAL, self._sync_pending)
+                self._timer.daemon = True
+                self._timer.start()
+            if self._records >= self.COMPACT_AFTER:
+                self.compact()
+
+    def _sync_pending(self) -> None:
+        with self._lock:
+            self._timer = None
+            if self._unsynced and not self._log.closed:
+                self.sync()
+
+    def _recover(self) -> int:
+        if os.path.exists(self._snapshot_path):
+            from task_snapshot import read_snapshot
+            snapshot = read_snapshot(self._snapshot_path)
+            restored = type(self._store)()
+            restored.extend_from_frame(snapshot)
+            self._store.load_from(restored)
+            self._sequence = snapshot.attrs['sequence']
+        if not os.path.exists(self._log_path):
+            return 0
+
+        replayed = 0
+        with open(self._log_path, 'rb') as log:
+            lines = log.read().split(b"\n")
+        # Everything after the last newline is a record that was cut off while being written
+        complete, torn = lines[:-1], lines[-1]
+        for number, line in enumerate(complete, start=1):
+            try:
+                record = json.loads(line)
+                sequence = record[0]
+            except (ValueError, IndexError):
+                raise ValueError(f"{self._log_path} is corrupt on line {number}")
+            if sequence <= self._sequence:
+                continue
+            self._apply(record[1:])
+            self._sequence = sequence
+            self._records += 1
+            replayed += 1
+        if torn:
+            with open(self._log_path, 'r+b') as log:
+                log.truncate(sum(len(line) + 1 for line in complete))
+                os.fsync(log.fileno())
+        return replayed
+
+    def _apply(self, record: List) -> None:
+        operation, arguments = record[0], record[1:]
+        if operation == "p":
+            self._store.add_project(*arguments)
+        elif operation == "t":
+            self._store.add_task(*arguments)
+        elif operation == "c":
+            self._store.set_done(*arguments)
+        elif operation == "d":
+            self._store.set_deadline(*arguments)
+        else:
+            raise ValueError(f"unknown journal record {operation!r} in {self._log_path}")
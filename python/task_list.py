@@ -1,117 +1,303 @@
+import io
 import sys
-from typing import Dict, List, TextIO
-from task import Task
-from task_analytics import TaskAnalytics
+import threading
+import time
+from contextlib import nullcontext
+from itertools import groupby, islice
+from operator import itemgetter
+from typing import TYPE_CHECKING, Dict, Iterable, Iterator, List, Optional, TextIO, Tuple
+from task import Task, format_deadline, to_ordinal
+from task_store import TaskStore
+from analytics_view import AnalyticsView
+from keyword_index import KeywordIndex
+from deadline_index import DeadlineIndex
+from daily_view import DailyView
+from task_csv import export_store_to_csv
+from task_journal import TaskJournal
+from output_sink import OutputSink
+from command_registry import Command, CommandRegistry
+from result_cache import ResultCache
+from task_metrics import CommandMetrics, Counter
 from datetime import datetime, date
 
+# pandas and numpy take long to import, so the analytics and binary snapshots are only
+# imported by the commands that use them
+if TYPE_CHECKING:
+    from task_analytics import TaskAnalytics
+    from task_scheduler import TaskScheduler
+
 class TaskList_ShowData:
     def __init__(self, output_stream: TextIO):
-        self._tasks: Dict[str, List[Task]] = {}
+        self._store = TaskStore()
+        self._deadline_index = DeadlineIndex(self._store)
+        self._daily_view = DailyView(self._store)
         self._output_stream = output_stream
+        self._output = OutputSink(output_stream)
+
+    OUTPUT_CHUNK_SIZE = 1 << 16
+
+    def _show(self, arguments: str = ""):
+        return self._write_paged("show", self._render_show, arguments)
+
+    def _render_show(self, offset: int = 0, limit: Optional[int] = None) -> Iterator[str]:
+        """Yield the output of show one project at a time, for the rows offset to offset + limit."""
+        # One row more than the page, to know whether there is a next page
+        remaining = None if limit is None else limit + 1
+        for project_name, tasks in self._store.page(offset, remaining):
+            if remaining is not None:
+                if remaining == 1 or len(tasks) >= remaining:
+                    tasks = tasks[:remaining - 1]
+                    if tasks:
+                        yield self._render_project(project_name, tasks)
+                    yield self._more("show", offset, limit)
+                    return
+                remaining -= max(len(tasks), 1)
+            yield self._render_project(project_name, tasks)
+
+    @staticmethod
+    def _render_project(project_name: str, tasks: List[Task]) -> str:
+        lines = [f"{project_name}\n"]
+        # Deadlines are ordinals, format each distinct one once
+        suffixes = {0: ''}
+        for task in tasks:
+            status = 'x' if task.done else ' '
+            deadline = suffixes.get(task.deadline_ordinal)
+            if deadline is None:
+                deadline = suffixes[task.deadline_ordinal] = f' (Deadline: {format_deadline(task.deadline_ordinal)})'
+            lines.append(f"    [{status}] {task.id}: {task.description}{deadline}\n")
+        lines.append("\n")
+        return ''.join(lines)
+
+    def _help(self, arguments: str = ""):
+        output = self.commands.help_text()
+        self._output.write(output)
+        return output
+
+    def _summary(self, arguments: str = ""):
+        summary = self._analytics.get_project_summary(self._analytics_view.frame())
+        output = summary.to_string(index=False) + '\n' if not summary.empty else '\n'
+        self._output.write(output)
+        return output
+
+    def _top_projects(self, n: int):
+        top_projects = self._analytics.get_top_projects_by_completion(self._analytics_view.frame(), n)
+        output = top_projects.to_string(index=False) + '\n'
+        self._output.write(output)
+        return output
+
+    def _find_tasks_by_keyword(self, keyword: str, regex: bool):
+        tasks_by_keyword = self._analytics.find_tasks_by_keyword(self._analytics_view.frame(), keyword, regex, self._keyword_index)
+        output = tasks_by_keyword.to_string(index=False) + '\n' if not tasks_by_keyword.empty else '\n'
+        self._output.write(output)
+        return output
+
+    def _find_overdue(self, current_date: str):
+        ordinal = to_ordinal(current_date)
+        # Only the current date has a daily view, other dates are left to the result cache
+        daily = ordinal == date.today().toordinal()
+        output = self._daily_view.get_overdue(ordinal) if daily else None
+        if output is None:
+            overdue = self._analytics.find_overdue_tasks(self._analytics_view.frame(), current_date, self._deadline_index)
+            output = overdue.to_string(index=False) + '\n' if not overdue.empty else 'No overdue tasks.\n'
+            if daily:
+                empty_projects = [name for name, count in self._store.task_counts().items() if count == 0]
+                self._daily_view.put_overdue(ordinal, output, overdue['task_id'].dropna().astype('int64').tolist(), empty_projects)
+        self._output.write(output)
+        return output
 
-    def _show(self):
-        output = ''
-        for project_name, tasks in self._tasks.items():
-            output_project = f"{project_name}\n"
-            self._output_stream.write(output_project)
-            output += output_project
-            for task in tasks:
-                status = 'x' if task.done else ' '
-                deadline = f' (Deadline: {task.deadline})' if len(task.deadline) >= 1 else ''
-                output_task = f"    [{status}] {task.id}: {task.description}{deadline}\n"
-                self._output_stream.write(output_task)
-                output += output_task
-            self._output_stream.write("\n")
-            output += "\n"
-        self._output_stream.flush()
+    STATS_USAGE = "Usage: stats [on|off|reset], stats profile <command> or stats memory <command>\n"
+    # Lines of the cProfile and tracemalloc reports of stats profile and stats memory
+    PROFILE_LINES = 25
+
+    def _stats(self, arguments: str = ""):
+        action, _, command_line = arguments.partition(" ")
+        if action == "profile" and command_line:
+            return self._profile(command_line)
+        if action == "memory" and command_line:
+            return self._trace_memory(command_line)
+        if not arguments:
+            output = self._metrics.table() + ''.join(f"{name:<36}{value:>14.6g}\n" for name, _, value in self._counters())
+        elif arguments in ("on", "off"):
+            self._metrics.enabled = arguments == "on"
+            output = f"Command timing is {arguments}.\n"
+        elif arguments == "reset":
+            self._metrics.reset()
+            output = "Command timings reset.\n"
+        else:
+            output = self.STATS_USAGE
+        self._output.write(output)
         return output
 
-    def _help(self):
-        output =  "Commands:\n"
-        output += "  show\n"
-        output += "  add project <project name>\n"
-        output += "  add task <project name> <task description>\n"
-        output += "  check <task ID>\n"
-        output += "  uncheck <task ID>\n"
-        output += "  deadline <task id> <deadline>\n"
-        output += "  view-by-deadline\n"
-        output += "  import <filepath>\n"
-        output += "  export <filepath>\n"
-        output += "  summary\n"
-        output += "  top-projects <number of projects>\n"
-        output += "  find-tasks-by-keyword <keyword>\n"
-        output += "  find-overdue <current date>\n"
-        output += "\n"
-        self._output_stream.write(output)
-        self._output_stream.flush()
+    def _profile(self, command_line: str):
+        """Run a command under cProfile and write the functions it spent most time in after its output."""
+        import cProfile
+        import pstats
+        profiler = cProfile.Profile()
+        profiler.runcall(self.execute, command_line)
+        report = io.StringIO()
+        pstats.Stats(profiler, stream=report).sort_stats("cumulative").print_stats(self.PROFILE_LINES)
+        output = report.getvalue()
+        self._output.write(output)
+        return output
+
+    def _trace_memory(self, command_line: str):
+        """Run a command under tracemalloc and write its peak memory and the lines that kept the most."""
+        import tracemalloc
+        started = not tracemalloc.is_tracing()
+        if started:
+            tracemalloc.start()
+        before = tracemalloc.take_snapshot()
+        tracemalloc.reset_peak()
+        size_before = tracemalloc.get_traced_memory()[0]
+        try:
+            self.execute(command_line)
+            size, peak = tracemalloc.get_traced_memory()
+            differences = tracemalloc.take_snapshot().compare_to(before, 'lineno')[:self.PROFILE_LINES]
+        finally:
+            if started:
+                tracemalloc.stop()
+        lines = [f"Peak memory {(peak - size_before) / 1024:.1f} KiB, still allocated {(size - size_before) / 1024:.1f} KiB\n"]
+        lines.extend(f"{difference}\n" for difference in differences)
+        output = ''.join(lines)
+        self._output.write(output)
         return output
 
+    def _counters(self) -> List[Counter]:
+        view = self._analytics_view
+        return [
+            ("analytics_rows_scanned_total", "Rows looked at by the analytics commands.",
+             self._task_analytics.rows_scanned if self._task_analytics is not None else 0),
+            ("dataframes_built_total", "Analytics frames built from all tasks.", view.rebuilds),
+            ("dataframe_rows_built_total", "Rows of the analytics frames built from all tasks.", view.rows_built),
+            ("dataframe_updates_total", "Changes applied to the analytics frame in place.", view.delta_applications),
+            ("dataframe_build_seconds_total", "Time spent building and updating the analytics frame.", view.build_seconds),
+            ("result_cache_hits_total", "Outputs served from the result cache.", self._results.hits),
+            ("result_cache_misses_total", "Cached commands that had to run.", self._results.misses),
+            ("daily_view_hits_total", "Outputs of today and find-overdue served from the daily view.", self._daily_view.hits),
+            ("output_flushes_total", "Flushes of the output stream.", self._output.flushes),
+            ("output_flush_seconds_total", "Time spent flushing the output stream.", self._output.flush_seconds),
+        ]
+
     def _error(self, command: str):
         output = f'I don\'t know what the command "{command}" is.\n'
-        self._output_stream.write(output)
-        self._output_stream.flush()
+        self._output.write(output)
         return output
 
-    def _today(self):
-        output = ''
-        current_date = datetime.today().strftime('%d-%m-%Y')
-        for project_name, tasks in self._tasks.items():
-            show_project = False
-            for task in tasks:
-                task_deadline = task.deadline
-                if task_deadline == current_date:
-                    if not show_project:
-                        output_project = f"{project_name}\n"
-                        self._output_stream.write(output_project)
-                        output += output_project
-                        show_project = True
+    def _today(self, arguments: str = ""):
+        ordinal = date.today().toordinal()
+        output = self._daily_view.get_today(ordinal)
+        if output is None:
+            due_ids = self._deadline_index.due_on(ordinal)
+            due_today = self._tasks_by_project(due_ids)
+            lines = []
+            for project_name in self._store.projects():
+                tasks = due_today.get(project_name, [])
+                if tasks:
+                    lines.append(f"{project_name}\n")
+                for task in tasks:
                     status = 'x' if task.done else ' '
-                    output_task = f"    [{status}] {task.id}: {task.description}\n"
-                    self._output_stream.write(output_task)
-                    output += output_task
-            self._output_stream.write("\n")
-            output += "\n"
-            show_project = False
-        self._output_stream.flush()
+                    lines.append(f"    [{status}] {task.id}: {task.description}\n")
+                lines.append("\n")
+            output = ''.join(lines)
+            self._daily_view.put_today(ordinal, output, due_ids)
+        self._output.write(output)
         return output
 
-    def _view_by_deadline(self):
-        output = ''
-        tasks_organized: Dict[str, Dict[str, List[Task]]] = {}
-
-        # Organize all tasks in a convenient format
-        for project_name, tasks_in_project in self._tasks.items():
-            for task in tasks_in_project:
-                task_deadline = task.deadline if len(task.deadline) else "No deadline"
-                if task_deadline not in tasks_organized.keys():
-                    tasks_organized[task_deadline] = {project_name: []}
-                elif project_name not in tasks_organized[task_deadline].keys():
-                    tasks_organized[task_deadline][project_name] = []
-                tasks_organized[task_deadline][project_name].append(task)
-
-        # Show all tasks sorted by deadline
-        for deadline in sorted(tasks_organized.keys(), key = lambda date: "-".join(date.split("-")[::-1])):
-            output_deadline = f"{deadline}:\n"
-            self._output_stream.write(output_deadline)
-            output += output_deadline
-            projects_tasks_at_deadline = tasks_organized[deadline]
-            for project_name in sorted(projects_tasks_at_deadline.keys()):
-                output_project = f"  {project_name}:\n"
-                self._output_stream.write(output_project)
-                output += output_project
-                tasks_at_deadline = projects_tasks_at_deadline[project_name]
-                for task in tasks_at_deadline:
-                    output_task = f"    {task.id}: {task.description}\n"
-                    self._output_stream.write(output_task)
-                    output += output_task
-        self._output_stream.flush()
-        return output
+    def _view_by_deadline(self, arguments: str = ""):
+        return self._write_paged("view-by-deadline", self._render_view_by_deadline, arguments)
+
+    def _render_view_by_deadline(self, offset: int = 0, limit: Optional[int] = None) -> Iterator[str]:
+        """Yield the output of view-by-deadline one deadline at a time, for the tasks offset to offset + limit."""
+        rows = (
+            (deadline, project_name, task)
+            for deadline, projects_tasks_at_deadline in self._deadline_groups()
+            for project_name in sorted(projects_tasks_at_deadline.keys())
+            for task in projects_tasks_at_deadline[project_name]
+        )
+        page = islice(rows, offset, None if limit is None else offset + limit)
+        for deadline, deadline_rows in groupby(page, key=itemgetter(0)):
+            lines = [f"{deadline}:\n"]
+            for project_name, project_rows in groupby(deadline_rows, key=itemgetter(1)):
+                lines.append(f"  {project_name}:\n")
+                lines.extend(f"    {task.id}: {task.description}\n" for _, _, task in project_rows)
+            yield ''.join(lines)
+        if next(rows, None) is not None:
+            yield self._more("view-by-deadline", offset, limit)
+
+    def _deadline_groups(self) -> Iterator[Tuple[str, Dict[str, List[Task]]]]:
+        # Show all tasks sorted by deadline, tasks without one last
+        for ordinal, task_ids in self._deadline_index.grouped():
+            yield format_deadline(ordinal), self._tasks_by_project(task_ids)
+        without_deadline = {}
+        for project_name, tasks_in_project in self._store.items():
+            tasks = [task for task in tasks_in_project if not task.deadline_ordinal]
+            if tasks:
+                without_deadline[project_name] = tasks
+        yield "No deadline", without_deadline
+
+    @staticmethod
+    def _more(command: str, offset: int, limit: int) -> str:
+        return f"(more: {command} --offset {offset + limit} --limit {limit})\n"
+
+    @staticmethod
+    def _page_usage(command: str) -> str:
+        return f"Usage: {command} [--offset <number>] [--limit <number>]\n"
+
+    @staticmethod
+    def _parse_page(arguments: str) -> Tuple[int, Optional[int]]:
+        """Parse '[--offset <number>] [--limit <number>]', raising a ValueError when invalid."""
+        options = {"--offset": 0, "--limit": None}
+        words = arguments.split()
+        if len(words) % 2:
+            raise ValueError(arguments)
+        for option, value in zip(words[::2], words[1::2]):
+            if option not in options or not value.isdigit():
+                raise ValueError(arguments)
+            options[option] = int(value)
+        if options["--limit"] == 0:
+            raise ValueError(arguments)
+        return options["--offset"], options["--limit"]
+
+    def _write_paged(self, command: str, render, arguments: str):
+        try:
+            offset, limit = self._parse_page(arguments)
+        except ValueError:
+            output = self._page_usage(command)
+            self._output.write(output)
+            return output
+        return self._write_chunks(render(offset, limit))
+
+    def _write_chunks(self, chunks: Iterable[str]) -> str:
+        """Write rendered output while it is produced, at least OUTPUT_CHUNK_SIZE characters at a time."""
+        output, pending, pending_size = [], [], 0
+        for chunk in chunks:
+            output.append(chunk)
+            pending.append(chunk)
+            pending_size += len(chunk)
+            if pending_size >= self.OUTPUT_CHUNK_SIZE:
+                self._output.write(''.join(pending))
+                pending, pending_size = [], 0
+        self._output.write(''.join(pending))
+        return ''.join(output)
+
+    def _tasks_by_project(self, task_ids: List[int]) -> Dict[str, List[Task]]:
+        """Look up tasks by ID and group them per project, skipping IDs that no longer exist."""
+        tasks_by_project: Dict[str, List[Task]] = {}
+        for task_id in task_ids:
+            entry = self._store.get(task_id)
+            if entry is not None:
+                project_name, task = entry
+                tasks_by_project.setdefault(project_name, []).append(task)
+        return tasks_by_project
 
 class TaskList_AddElements:
+    IMPORT_CHUNK_SIZE = 100_000
+
     def __init__(self, output_stream: TextIO):
-        self._tasks: Dict[str, List[Task]] = {}
+        self._store = TaskStore()
         self._last_id = 0
         self._output_stream = output_stream
+        self._output = OutputSink(output_stream)
 
     def _add(self, command_line: str):
         parts = command_line.split(" ", 1)
@@ -126,20 +312,29 @@ class TaskList_AddElements:
             return "Error: no task description given\n"
         
     def _add_project(self, name: str):
-        self._tasks[name] = []
+        self._store.add_project(name)
         return f"Added project {name}\n"
     
     def _add_task(self, project: str, description: str):
-        project_tasks = self._tasks.get(project)
-        if project_tasks is None:
+        if not self._store.has_project(project):
             output = f'Could not find a project with the name "{project}".\n'
-            self._output_stream.write(output)
-            self._output_stream.flush()
+            self._output.write(output)
             return output
         
-        project_tasks.append(Task(self._next_id(), description, False))
+        self._store.add_task(project, self._next_id(), description, False)
         return f'Added task {description} to project {project}\n'
     
+    def _add_tasks(self, project: str, descriptions: List[str]):
+        """_add_task for each description, as one bulk operation on the store."""
+        if not self._store.has_project(project):
+            output = f'Could not find a project with the name "{project}".\n' * len(descriptions)
+            self._output.write(output)
+            return output
+        first_id = self._last_id + 1
+        self._last_id += len(descriptions)
+        self._store.add_tasks(project, range(first_id, self._last_id + 1), descriptions)
+        return ''.join(f'Added task {description} to project {project}\n' for description in descriptions)
+
     def _next_id(self) -> int:
         self._last_id += 1
         return self._last_id
@@ -149,32 +344,104 @@ class TaskList_AddElements:
         try:
             task_id = int(parts[0])
         except ValueError:
-            self._output_stream.write("No valid Task ID given\n")
-            self._output_stream.flush()
-            return "No valid Task ID given.\n"
+            return self._add_deadline_bulk(command_line)
         try:
             day, month, year = parts[1].split("-", 3)
             assert(int(day) <= 31)
             assert(int(month) <= 12)
             assert(0<=int(year)<=9999)
         except ValueError:
-            self._output_stream.write("This is not a valid date! Use format DD-MM-YYYY.\n")
-            self._output_stream.flush()
+            self._output.write("This is not a valid date! Use format DD-MM-YYYY.\n")
             return "This is not a valid date! Use format DD-MM-YYYY.\n"
-        for _, tasks in self._tasks.items():
-            for task in tasks:
-                if task.id == task_id:
-                    task.deadline = date(int(year), int(month), int(day)).strftime('%d-%m-%Y')
-                    return f"Added deadline to task.\n"
+        if self._store.set_deadline(task_id, date(int(year), int(month), int(day)).strftime('%d-%m-%Y')):
+            return f"Added deadline to task.\n"
         output = f"Could not find a task with an ID of {task_id}.\n"
-        self._output_stream.write(output)
-        self._output_stream.flush()
+        self._output.write(output)
         return output
 
+    def _add_deadline_bulk(self, command_line: str):
+        # The selector may contain spaces, the deadline is the last word
+        selector, _, deadline = command_line.rpartition(" ")
+        try:
+            task_ids = self._select_tasks(selector)
+        except ValueError:
+            self._output.write("No valid Task ID given\n")
+            return "No valid Task ID given.\n"
+        except KeyError:
+            output = f'Could not find a project with the name "{selector.partition(" ")[2]}".\n'
+            self._output.write(output)
+            return output
+        try:
+            deadline = datetime.strptime(deadline, '%d-%m-%Y').strftime('%d-%m-%Y')
+        except ValueError:
+            self._output.write("This is not a valid date! Use format DD-MM-YYYY.\n")
+            return "This is not a valid date! Use format DD-MM-YYYY.\n"
+        return self._bulk_summary("Added deadline to", self._store.set_deadline_many(task_ids, deadline))
+
+    def _import(self, filepath: str):
+        # Fill a new store chunk by chunk, so a failed import leaves the current tasks alone
+        imported = type(self._store)()
+        rows = 0
+        start = time.perf_counter()
+        try:
+            for chunk in self._analytics.read_csv_chunks(filepath, self.IMPORT_CHUNK_SIZE):
+                imported.extend_from_frame(chunk)
+                rows += len(chunk)
+                rate = rows / max(time.perf_counter() - start, 1e-9)
+                self._output.write(f"Imported {rows} rows ({rate:.0f} rows/sec)\n")
+        except FileNotFoundError:
+            output = "Filename not found.\n"
+        except (OSError, ValueError) as error:
+            output = f"Import failed: {error}.\n"
+        else:
+            output = self._replace_tasks(imported)
+        self._output.write(output)
+        return output
+
+    def _import_binary(self, filepath: str):
+        from task_snapshot import read_snapshot
+        imported = type(self._store)()
+        try:
+            imported.extend_from_frame(read_snapshot(filepath))
+        except FileNotFoundError:
+            output = "Filename not found.\n"
+        except (OSError, ValueError) as error:
+            output = f"Import failed: {error}.\n"
+        else:
+            output = self._replace_tasks(imported)
+        self._output.write(output)
+        return output
+
+    def _export(self, filepath: str):
+        try:
+            export_store_to_csv(self._store, filepath)
+            output = "Tasks exported to file succesfully.\n"
+        except OSError as error:
+            output = f"Export failed: {error}.\n"
+        self._output.write(output)
+        return output
+
+    def _export_binary(self, filepath: str):
+        from task_snapshot import export_store_to_snapshot
+        try:
+            export_store_to_snapshot(self._store, filepath)
+            output = "Tasks exported to file succesfully.\n"
+        except OSError as error:
+            output = f"Export failed: {error}.\n"
+        self._output.write(output)
+        return output
+
+    def _replace_tasks(self, imported: TaskStore):
+        self._store.load_from(imported)
+        # Never hand out an ID that is already in use
+        self._last_id = max(self._last_id, imported.max_id())
+        return "File found and imported as tasks (overwrote old tasks)\n"
+
 class TaskList_ModifyElements:
     def __init__(self, output_stream: TextIO):
-        self._tasks: Dict[str, List[Task]] = {}
+        self._store = TaskStore()
         self._output_stream = output_stream
+        self._output = OutputSink(output_stream)
 
     def _check(self, id_string: str):
         output = self._set_done(id_string, True)
@@ -188,148 +455,358 @@ class TaskList_ModifyElements:
         try:
             task_id = int(id_string)
         except ValueError:
-            output = f"{task_id} is not a valid ID"
-            self._output_stream.write(output)
-            self._output_stream.flush()
-            return output
+            return self._set_done_bulk(id_string, done)
         
-        for _, tasks in self._tasks.items():
-            for task in tasks:
-                if task.id == task_id:
-                    task.done = done
-                    output = f"{'Checked' if done else 'Unchecked'} {task_id}.\n"
-                    self._output_stream.write(output)
-                    self._output_stream.flush()
-                    return output
+        if self._store.set_done(task_id, done):
+            output = f"{'Checked' if done else 'Unchecked'} {task_id}.\n"
+            self._output.write(output)
+            return output
         
         output = f"Could not find a task with an ID of {task_id}.\n"
-        self._output_stream.write(output)
-        self._output_stream.flush()
+        self._output.write(output)
+        return output
+
+    def _set_done_bulk(self, selector: str, done: bool):
+        try:
+            task_ids = self._select_tasks(selector)
+        except ValueError:
+            output = f"{selector} is not a valid ID"
+        except KeyError:
+            output = f'Could not find a project with the name "{selector.partition(" ")[2]}".\n'
+        else:
+            found = self._store.set_done_many(task_ids, [done] * len(task_ids))
+            output = self._bulk_summary('Checked' if done else 'Unchecked', found)
+        self._output.write(output)
+        return output
+
+    def _select_tasks(self, selector: str) -> List[int]:
+        """IDs of the tasks a bulk command applies to, resolved once and without duplicates.
+
+        - "100-5000": the tasks with an ID in the range, missing IDs are skipped
+        - "1,2,10-20": a list of IDs and ranges
+        - "project <project name>": the tasks of a project, KeyError if there is none
+        - "where overdue <DD-MM-YYYY>": the tasks with a deadline before the date
+
+        Anything else raises ValueError.
+        """
+        kind, _, rest = selector.partition(" ")
+        if kind == "project":
+            if not self._store.has_project(rest):
+                raise KeyError(rest)
+            return self._store.task_ids_of(rest)
+        if kind == "where":
+            condition, _, current_date = rest.partition(" ")
+            if condition != "overdue":
+                raise ValueError(f"unknown condition {condition}")
+            ordinal = datetime.strptime(current_date, '%d-%m-%Y').toordinal()
+            # The deadline index keeps the IDs of replaced projects
+            return [task_id for task_id in self._deadline_index.due_before(ordinal) if self._store.get(task_id) is not None]
+        task_ids: Dict[int, None] = {}
+        for part in selector.split(","):
+            first, dash, last = part.partition("-")
+            if dash:
+                # Only the IDs in use, however wide the range or sparse the IDs
+                task_ids.update(dict.fromkeys(self._store.task_ids_between(int(first), int(last))))
+            else:
+                task_ids[int(part)] = None
+        return list(task_ids)
+
+    def _bulk_summary(self, action: str, found: List[bool]) -> str:
+        changed = sum(found)
+        output = f"{action} {changed} {'task' if changed == 1 else 'tasks'}"
+        if changed < len(found):
+            output += f", {len(found) - changed} not found"
+        return output + ".\n"
+
+    def _set_done_many(self, changes: List[Tuple[str, bool]]):
+        """_set_done for each ID string and flag in turn, as one bulk operation on the store."""
+        task_ids = []
+        flags = []
+        for id_string, done in changes:
+            try:
+                task_ids.append(int(id_string))
+                flags.append(done)
+            except ValueError:
+                pass
+        found = iter(self._store.set_done_many(task_ids, flags))
+        lines = []
+        for id_string, done in changes:
+            try:
+                task_id = int(id_string)
+            except ValueError:
+                lines.append(f"{id_string} is not a valid ID")
+                continue
+            if next(found):
+                lines.append(f"{'Checked' if done else 'Unchecked'} {task_id}.\n")
+            else:
+                lines.append(f"Could not find a task with an ID of {task_id}.\n")
+        output = ''.join(lines)
+        self._output.write(output)
         return output
 
 class TaskList(TaskList_ShowData, TaskList_AddElements, TaskList_ModifyElements):
     QUIT = "quit"
-    def __init__(self, input_stream: TextIO, output_stream: TextIO):
-        self._tasks: Dict[str, List[Task]] = {}
+    # Filled in below the class, plugins can register more commands
+    commands: CommandRegistry
+    # Script mode flushes its output in blocks of this many characters
+    SCRIPT_FLUSH_THRESHOLD = 1 << 16
+    # and executes at most this many consecutive add task or check/uncheck commands at once
+    SCRIPT_GROUP_SIZE = 10_000
+
+    def __init__(self, input_stream: TextIO, output_stream: TextIO, store: Optional[TaskStore] = None, journal_directory: Optional[str] = None, flush_threshold: int = 0, analytics_workers: int = 0):
+        self._store = store if store is not None else TaskStore()
+        self._analytics_view = AnalyticsView(self._store)
+        self._keyword_index = KeywordIndex(self._store)
+        self._deadline_index = DeadlineIndex(self._store)
+        self._daily_view = DailyView(self._store)
+        self._results = ResultCache(self._store)
         self._input_stream = input_stream
         self._output_stream = output_stream
-        self._last_id = 0
+        # Flushes after every command by default, see OutputSink
+        self._output = OutputSink(output_stream, flush_threshold)
+        # Replays the journal into the store, so continue after the recovered IDs
+        self._journal = TaskJournal(journal_directory, self._store) if journal_directory else None
+        self._last_id = self._store.max_id()
+        # With workers, analytics on large lists run in a pool of that many processes
+        self._analytics_workers = analytics_workers
+        self._task_analytics: Optional['TaskAnalytics'] = None
+        # Held around every command once a scheduler runs jobs from another thread
+        self._lock = nullcontext()
+        self._scheduler: Optional['TaskScheduler'] = None
+        # Command latencies, recorded after stats on
+        self._metrics = CommandMetrics()
+
+    @staticmethod
+    def start_console(journal_directory: Optional[str] = None, analytics_workers: int = 0, scheduled: bool = False,
+                      snapshot_path: Optional[str] = None, snapshot_interval: float = 0.0):
+        task_list = TaskList(sys.stdin, sys.stdout, journal_directory=journal_directory, analytics_workers=analytics_workers)
+        if scheduled or snapshot_path:
+            task_list.start_scheduler(snapshot_path, snapshot_interval)
+        # Commands piped or redirected into the console are run as a script
+        if sys.stdin.isatty():
+            task_list.run()
+        else:
+            task_list.run_script()
 
     @staticmethod
-    def start_console():
-        task_list = TaskList(sys.stdin, sys.stdout)
-        task_list.run()
+    def start_script(script: TextIO, journal_directory: Optional[str] = None, analytics_workers: int = 0):
+        task_list = TaskList(script, sys.stdout, journal_directory=journal_directory, analytics_workers=analytics_workers)
+        task_list.run_script()
+
+    def start_scheduler(self, snapshot_path: Optional[str] = None, snapshot_interval: float = 0.0) -> 'TaskScheduler':
+        """Start a TaskScheduler for this task list, which is closed with it."""
+        from task_scheduler import TaskScheduler
+        self._lock = threading.RLock()
+        self._scheduler = TaskScheduler(self, lambda command: self._lock, snapshot_path, snapshot_interval)
+        self._scheduler.start()
+        return self._scheduler
+
+    def refresh_daily_views(self):
+        """Compute the outputs of today and find-overdue for the current date into the daily view.
+
+        Changes that do not affect them keep them, see DailyView, so the first of these
+        commands after a change is still served without a scan.
+        """
+        output = self._output
+        self._output = OutputSink(io.StringIO())
+        try:
+            self.execute("today")
+            self.execute(f"find-overdue {date.today():%d-%m-%Y}")
+        finally:
+            self._output = output
+
+    def close(self):
+        if self._scheduler is not None:
+            self._scheduler.stop()
+        self._output.flush()
+        if self._journal is not None:
+            self._journal.close()
+        if self._analytics_workers and self._task_analytics is not None:
+            self._task_analytics.close()
 
     def run(self):
-        self._output_stream.write("Welcome to TaskList! Type 'help' for available commands.\n")
-        self._output_stream.flush()
+        self._output.write("Welcome to TaskList! Type 'help' for available commands.\n")
         
         while True:
-            self._output_stream.write("> ")
-            self._output_stream.flush()
+            self._output.write("> ")
+            # The prompt has to be visible before waiting for input, whatever the flush threshold
+            self._output.flush()
             command = self._input_stream.readline().strip()
             
             if command == self.QUIT:
                 break
             
-            self.execute(command)
+            with self._lock:
+                self.execute(command)
+        self.close()
+
+    def run_script(self):
+        """Run the commands of the input stream without interaction, until quit or its end.
+
+        There is no welcome message and no prompt, empty lines are skipped, and output
+        is flushed in blocks of SCRIPT_FLUSH_THRESHOLD characters. Consecutive add task
+        commands for the same project, and consecutive check/uncheck commands of single
+        task IDs, are executed as one bulk operation on the store; the output is the same
+        as when they are executed one at a time.
+        """
+        self._output.flush_threshold = max(self._output.flush_threshold, self.SCRIPT_FLUSH_THRESHOLD)
+        for kind, key, arguments in self._script_groups(self._input_stream):
+            with self._lock:
+                if kind == "add task":
+                    self._add_tasks(key, arguments)
+                elif kind == "done":
+                    self._set_done_many(arguments)
+                else:
+                    self.execute(key)
+        self.close()
+
+    def _script_groups(self, lines: Iterable[str]) -> Iterator[Tuple[str, Optional[str], list]]:
+        """Group the command lines of a script into (kind, key, arguments).
+
+        - ("add task", project, [description, ...]) for add task commands
+        - ("done", None, [(id string, done), ...]) for check and uncheck commands of a task ID
+        - ("command", command line, []) for every other command
+        """
+        group = None
+        for line in lines:
+            command_line = line.strip()
+            if not command_line:
+                continue
+            if command_line == self.QUIT:
+                break
+            kind, key, argument = self._script_command(command_line)
+            if group is not None and (kind == "command" or (kind, key) != group[:2] or len(group[2]) >= self.SCRIPT_GROUP_SIZE):
+                yield group
+                group = None
+            if group is None:
+                group = (kind, key, [])
+            if argument is not None:
+                group[2].append(argument)
+        if group is not None:
+            yield group
+
+    @staticmethod
+    def _script_command(command_line: str) -> Tuple[str, Optional[str], object]:
+        # Splits the same way as execute and _add, so grouped commands get the same arguments
+        command, _, arguments = command_line.partition(" ")
+        if command in ("check", "uncheck") and _is_id(arguments):
+            return "done", None, (arguments, command == "check")
+        if command == "add":
+            parts = arguments.split(" ", 1)
+            task_parts = parts[1].split(" ", 1) if parts[0] == "task" and len(parts) > 1 else []
+            if len(task_parts) >= 2:
+                return "add task", task_parts[0], task_parts[1]
+        return "command", command_line, None
+
+    def stream(self, command_line: str) -> Iterator[str]:
+        """Run a command like execute, but yield its output in chunks while it is rendered.
+
+        show and view-by-deadline are rendered lazily, one project or deadline at a time,
+        and are not written to the output stream. Other commands run through execute.
+        """
+        command, _, arguments = command_line.partition(" ")
+        renderers = {"show": self._render_show, "view-by-deadline": self._render_view_by_deadline}
+        if command not in renderers:
+            yield self.execute(command_line)
+            return
+        try:
+            offset, limit = self._parse_page(arguments)
+        except ValueError:
+            yield self._page_usage(command)
+            return
+        yield from renderers[command](offset, limit)
 
     def execute(self, command_line: str):
-        analytics = TaskAnalytics()
-        parts = command_line.split(" ", 1)
-        command = parts[0]
-        
-        if command == "show":
-            return self._show()
-        elif command == "add":
-            return self._add(parts[1] if len(parts) > 1 else "")
-        elif command == "check":
-            return self._check(parts[1] if len(parts) > 1 else "")
-        elif command == "uncheck":
-            return self._uncheck(parts[1] if len(parts) > 1 else "")
-        elif command == "deadline":
-            return self._add_deadline(parts[1] if len(parts) > 1 else "")
-        elif command == "today":
-            return self._today()
-        elif command == "view-by-deadline":
-            return self._view_by_deadline()
-        elif command == "import":
-            try:
-                df = analytics.import_from_csv(parts[1] if len(parts) > 1 else "")
-                df['task'] = df.apply(lambda x: Task(x['task_id'], x['description'], x['done']), axis=1)
-                self._tasks = analytics.export_to_dict(df)
-                output = "File found and imported as tasks (overwrote old tasks)\n"
-            except FileNotFoundError:
-                output = "Filename not found.\n"
-            else:
-                output = "Import encountered an unexpected error.\n"
-            self._output_stream.write(output)
-            self._output_stream.flush()
-            return output
-        elif command == "export":
-            if len(parts) > 1:
-                df = analytics.import_from_dict(self._tasks)
-                analytics.export_to_csv(df, parts[1])
-                output = "Tasks exported to file succesfully.\n"
-            else:
-                output = "No path given.\n"
-            self._output_stream.write(output)
-            self._output_stream.flush()
-            return output
-        elif command == "summary":
-            df = analytics.import_from_dict(self._tasks)
-            summary = analytics.get_project_summary(df)
-            output = summary.to_string(index=False) + '\n' if not summary.empty else '\n'
-            self._output_stream.write(output)
-            self._output_stream.flush()
-            return output 
-        elif command == "top-projects":
-            if len(parts) > 1:
-                try:
-                    n = int(parts[1])
-                except ValueError:
-                    output = 'No valid number given.\n'
-                    self._output_stream.write(output)
-                    self._output_stream.flush()
-                    return output 
-            else:
-                output = 'No valid number given.\n'
-                self._output_stream.write(output)
-                self._output_stream.flush()
-                return output
-            df = analytics.import_from_dict(self._tasks)
-            top_projects = analytics.get_top_projects_by_completion(df, n)
-            output = top_projects.to_string(index=False) + '\n'
-            self._output_stream.write(output)
-            self._output_stream.flush()
-            return output 
-        elif command == "find-tasks-by-keyword":
-            keyword = parts[1] if len(parts)>1 else ""
-            df = analytics.import_from_dict(self._tasks)
-            tasks_by_keyword = analytics.find_tasks_by_keyword(df, keyword)
-            output = tasks_by_keyword.to_string(index=False) + '\n' if not tasks_by_keyword.empty else '\n'
-            self._output_stream.write(output)
-            self._output_stream.flush()
-            return output 
-        elif command == "find-overdue":
-            current_date = parts[1] if len(parts) > 1 else ""
-            try:
-                datetime.strptime(current_date, '%d-%m-%Y')
-            except ValueError:
-                output = "Not a valid date.\n"
-                self._output_stream.write(output)
-                self._output_stream.flush()
-                return output
-            df = analytics.import_from_dict(self._tasks)
-            overdue = analytics.find_overdue_tasks(df, current_date)
-            output = overdue.to_string(index=False) + '\n' if not overdue.empty else 'No overdue tasks.\n'
-            self._output_stream.write(output)
-            self._output_stream.flush()
-            return output 
-        elif command == "help":
-            return self._help()
+        if not self._metrics.enabled:
+            return self._execute(command_line)
+        start = time.perf_counter()
+        try:
+            return self._execute(command_line)
+        finally:
+            name = command_line.partition(" ")[0]
+            # Unknown names are not labels of their own, so typos cannot grow the metrics
+            self._metrics.observe(name if name in self.commands else "unknown", time.perf_counter() - start)
+
+    def metrics_text(self) -> str:
+        """The command latencies and counters in the Prometheus text format."""
+        return self._metrics.prometheus_text(self._counters())
+
+    def _execute(self, command_line: str):
+        name, _, arguments = command_line.partition(" ")
+        command = self.commands.get(name)
+        if command is None:
+            return self._error(name)
+        if not command.cached:
+            return command.run(self, arguments)
+        key = (command_line, date.today().toordinal()) if command.dated else command_line
+        output = self._results.get(key)
+        if output is None:
+            output = command.run(self, arguments)
+            self._results.put(key, output)
         else:
-            return self._error(command)
+            self._output.write(output)
+        return output
+
+    @property
+    def _analytics(self) -> 'TaskAnalytics':
+        # Only built, and pandas only imported, once a command that needs it runs
+        if self._task_analytics is None and self._analytics_workers:
+            from parallel_analytics import ParallelTaskAnalytics
+            self._task_analytics = ParallelTaskAnalytics(self._analytics_workers)
+        elif self._task_analytics is None:
+            from task_analytics import TaskAnalytics
+            self._task_analytics = TaskAnalytics()
+        return self._task_analytics
+
+
+def _is_id(arguments: str) -> bool:
+    try:
+        int(arguments)
+    except ValueError:
+        return False
+    return True
+
+
+def _file_path(arguments: str) -> Tuple[str]:
+    if not arguments:
+        raise ValueError("no path given")
+    return (arguments,)
+
+
+def _number(arguments: str) -> Tuple[int]:
+    return (int(arguments),)
+
+
+def _keyword(arguments: str) -> Tuple[str, bool]:
+    if arguments.startswith("--literal "):
+        return (arguments[len("--literal "):], False)
+    return (arguments, True)
+
+
+def _date(arguments: str) -> Tuple[str]:
+    datetime.strptime(arguments, '%d-%m-%Y')
+    return (arguments,)
+
+
+TaskList.commands = CommandRegistry([
+    Command("show", TaskList._show, ("show [--offset <number>] [--limit <number>]",)),
+    Command("add", TaskList._add, ("add project <project name>", "add task <project name> <task description>")),
+    Command("check", TaskList._check, ("check <task ID>", "check <tasks>")),
+    Command("uncheck", TaskList._uncheck, ("uncheck <task ID>", "uncheck <tasks>")),
+    Command("deadline", TaskList._add_deadline, ("deadline <task id> <deadline>", "deadline <tasks> <deadline>")),
+    Command("today", TaskList._today, ("today",), cached=True, dated=True),
+    Command("view-by-deadline", TaskList._view_by_deadline, ("view-by-deadline [--offset <number>] [--limit <number>]",)),
+    Command("import", TaskList._import, ("import <filepath>",)),
+    Command("export", TaskList._export, ("export <filepath>",), _file_path, "No path given.\n"),
+    Command("import-binary", TaskList._import_binary, ("import-binary <filepath>",)),
+    Command("export-binary", TaskList._export_binary, ("export-binary <filepath>",), _file_path, "No path given.\n"),
+    Command("summary", TaskList._summary, ("summary",), cached=True),
+    Command("top-projects", TaskList._top_projects, ("top-projects <number of projects>",), _number, "No valid number given.\n", cached=True),
+    Command("find-tasks-by-keyword", TaskList._find_tasks_by_keyword, ("find-tasks-by-keyword [--literal] <keyword>",), _keyword, cached=True),
+    Command("find-overdue", TaskList._find_overdue, ("find-overdue <current date>",), _date, "Not a valid date.\n", cached=True),
+    Command("stats", TaskList._stats, ("stats [on|off|reset]", "stats profile <command>", "stats memory <command>")),
+    Command("help", TaskList._help),
+])
 
 if __name__ == "__main__":
     TaskList.start_console()
@@ -1,14 +1,59 @@
+import argparse
+import importlib
 import sys
 from task_list import TaskList
-from task_controller import app
 
 
 def main():
-    if len(sys.argv) == 1:
-        print("Starting console Application")
-        TaskList.start_console()
+    parser = argparse.ArgumentParser(description="TaskList console application and web API")
+    parser.add_argument("--web", action="store_true", help="start the Flask web server")
+    parser.add_argument("--asgi", action="store_true", help="start the asyncio (ASGI) server")
+    parser.add_argument("--journal", metavar="DIRECTORY", help="keep the tasks durable in a journal in this directory")
+    parser.add_argument("--script", metavar="FILE", help="run the commands in this file ('-' for stdin) without prompts and exit")
+    parser.add_argument("--analytics-workers", metavar="N", type=int, default=0, help="run the analytics on large lists in N processes")
+    parser.add_argument("--scheduler", action="store_true", help="compute today and find-overdue for the new day at midnight, in the background")
+    parser.add_argument("--snapshot", metavar="FILE", help="write a binary snapshot to this file in the background (implies --scheduler)")
+    parser.add_argument("--snapshot-every", metavar="SECONDS", type=float, default=300.0, help="interval between snapshots (default: 300)")
+    parser.add_argument("--plugin", metavar="MODULE", action="append", default=[], help="import this module first, so it can register commands (repeatable)")
+    args = parser.parse_args()
+    scheduled = args.scheduler or args.snapshot is not None
+
+    for plugin in args.plugin:
+        importlib.import_module(plugin)
+
+    if args.script == "-":
+        TaskList.start_script(sys.stdin, args.journal, args.analytics_workers)
+    elif args.script:
+        with open(args.script, encoding='utf-8') as script:
+            TaskList.start_script(script, args.journal, args.analytics_workers)
+    elif args.asgi:
+        # The servers are imported only when they are started, to keep the console quick to start
+        import asyncio
+        from asgi_app import AsyncTaskList, TaskListApp, serve
+        async_tasks = AsyncTaskList(journal_directory=args.journal, analytics_workers=args.analytics_workers)
+        print("localhost:8080/show")
+        try:
+            asyncio.run(serve(TaskListApp(async_tasks), 'localhost', 8080))
+        finally:
+            async_tasks.close()
+    elif not args.web:
+        if sys.stdin.isatty():
+            print("Starting console Application")
+        TaskList.start_console(args.journal, args.analytics_workers, scheduled, args.snapshot, args.snapshot_every)
     else:
-        app.run(host='localhost', port=8080, debug=True)
+        import task_controller
+        from concurrent_task_list import ConcurrentTaskList
+        tasks = task_controller.tasks
+        if args.journal or args.analytics_workers:
+            tasks = task_controller.tasks = ConcurrentTaskList(journal_directory=args.journal, analytics_workers=args.analytics_workers)
+        if scheduled:
+            tasks.start_scheduler(args.snapshot, args.snapshot_every)
+        # The reloader runs the server in a second process, which would start a second
+        # scheduler, and both processes would open the journal
+        try:
+            task_controller.app.run(host='localhost', port=8080, debug=True, use_reloader=not (scheduled or args.journal))
+        finally:
+            tasks.close()
         print("localhost:8080/tasks")
 
 
@@ -0,0 +1,100 @@
+import math
+import threading
+from bisect import bisect_left
+from typing import Dict, Iterable, List, Tuple
+
+# (name, help text, value) of a counter, see prometheus_text
+Counter = Tuple[str, str, float]
+
+
+class LatencyHistogram:
+    """Latencies in buckets a quarter of an octave wide, from 1 us up.
+
+    Quantiles are the upper bound of the bucket they fall in, which is at most 19%
+    above the real value. Recording a latency is a bisection and three additions.
+    """
+
+    BUCKETS_PER_OCTAVE = 4
+    # Up to 2 ** 36 us, about 19 hours
+    N_BUCKETS = 36 * BUCKETS_PER_OCTAVE + 1
+
+    def __init__(self):
+        self.counts = [0] * self.N_BUCKETS
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, seconds: float) -> None:
+        bucket = bisect_left(_UPPER_BOUNDS, seconds)
+        self.counts[bucket if bucket < self.N_BUCKETS else self.N_BUCKETS - 1] += 1
+        self.count += 1
+        self.sum += seconds
+
+    def quantile(self, q: float) -> float:
+        """Latency in seconds that a share q of the recorded latencies does not exceed."""
+        if not self.count:
+            return math.nan
+        rank = q * self.count
+        seen = 0
+        for bucket, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                return self.upper_bound(bucket)
+        return self.upper_bound(self.N_BUCKETS - 1)
+
+    @classmethod
+    def upper_bound(cls, bucket: int) -> float:
+        return 1e-6 * 2 ** (bucket / cls.BUCKETS_PER_OCTAVE)
+
+
+_UPPER_BOUNDS = [LatencyHistogram.upper_bound(bucket) for bucket in range(LatencyHistogram.N_BUCKETS)]
+
+
+class CommandMetrics:
+    """Latency histograms of the commands of a task list, by command name.
+
+    Nothing is recorded until enabled is set; disabled, a command only pays for
+    checking the flag. Commands may be recorded from several threads at once.
+    """
+
+    QUANTILES = (0.5, 0.95, 0.99)
+
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self.histograms: Dict[str, LatencyHistogram] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, command: str, seconds: float) -> None:
+        with self._lock:
+            histogram = self.histograms.get(command)
+            if histogram is None:
+                histogram = self.histograms[command] = LatencyHistogram()
+            histogram.observe(seconds)
+
+    def reset(self) -> None:
+        with self._lock:
+            self.histograms = {}
+
+    def table(self) -> str:
+        """The histograms as a table with latencies in milliseconds, for the stats command."""
+        lines = [f"{'command':<24}{'count':>10}{'p50 ms':>12}{'p95 ms':>12}{'p99 ms':>12}{'total ms':>12}\n"]
+        with self._lock:
+            for command, histogram in sorted(self.histograms.items()):
+                quantiles = ''.join(f"{histogram.quantile(q) * 1e3:>12.3f}" for q in self.QUANTILES)
+                lines.append(f"{command:<24}{histogram.count:>10}{quantiles}{histogram.sum * 1e3:>12.3f}\n")
+        return ''.join(lines)
+
+    def prometheus_text(self, counters: Iterable[Counter] = (), prefix: str = "tasklist") -> str:
+        """The histograms as a Prometheus summary, and the counters, in the text exposition format."""
+        name = f"{prefix}_command_seconds"
+        lines = [f"# HELP {name} Time to run a console command.\n", f"# TYPE {name} summary\n"]
+        with self._lock:
+            for command, histogram in sorted(self.histograms.items()):
+                label = f'command="{command}"'
+                lines.extend(f'{name}{{{label},quantile="{q}"}} {histogram.quantile(q):.9g}\n' for q in self.QUANTILES)
+                lines.append(f"{name}_sum{{{label}}} {histogram.sum:.9g}\n")
+                lines.append(f"{name}_count{{{label}}} {histogram.count}\n")
+        for counter_name, help_text, value in counters:
+            lines.append(f"# HELP {prefix}_{counter_name} {help_text}\n")
+            lines.append(f"# TYPE {prefix}_{counter_name} counter\n")
+            lines.append(f"{prefix}_{counter_name} {value:.9g}\n")
+        return ''.join(lines)
@@ -0,0 +1,91 @@
+import math
+import sys
+import threading
+import time
+from datetime import date, datetime, timedelta
+from typing import Callable, ContextManager, List, Optional
+
+
+def next_midnight(now: float) -> float:
+    """Timestamp of the first local midnight after the timestamp now."""
+    return datetime.combine(date.fromtimestamp(now) + timedelta(days=1), datetime.min.time()).timestamp()
+
+
+class TaskScheduler:
+    """Runs the periodic jobs of a task list in a background thread.
+
+    - Every snapshot_interval seconds, when the tasks changed since the last snapshot,
+      a binary snapshot is written to snapshot_path. The lock is only held to copy the
+      columns of the store; converting and writing them happens after it is released,
+      so commands are not held up by the disk.
+    - At midnight, the outputs of today and find-overdue for the new day are computed
+      into the daily view of the task list, see TaskList.refresh_daily_views. These
+      commands are then served from it until a change affects them.
+
+    locked(command) returns the lock to hold while running a command on the task list,
+    the one the console or the web server takes for that command.
+    """
+
+    # Upper bound on a sleep, so that a change of the system clock is noticed
+    MAX_SLEEP = 60.0
+
+    def __init__(self, task_list, locked: Callable[[str], ContextManager], snapshot_path: Optional[str] = None,
+                 snapshot_interval: float = 0.0, clock: Callable[[], float] = time.time):
+        self._task_list = task_list
+        self._locked = locked
+        self.snapshot_path = snapshot_path
+        self.snapshot_interval = snapshot_interval
+        self._clock = clock
+        self._snapshot_version: Optional[int] = None
+        now = clock()
+        self.next_snapshot = now + snapshot_interval if snapshot_path else math.inf
+        self.next_midnight = next_midnight(now)
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        if self._thread is None:
+            self._stopped.clear()
+            self._thread = threading.Thread(target=self._run, name="TaskScheduler", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        if self._thread is not None:
+            self._stopped.set()
+            self._thread.join()
+            self._thread = None
+
+    def run_pending(self) -> List[str]:
+        """Run the jobs that are due and return their names."""
+        now = self._clock()
+        ran = []
+        if now >= self.next_midnight:
+            self.next_midnight = next_midnight(now)
+            with self._locked("today"):
+                self._task_list.refresh_daily_views()
+            ran.append("daily views")
+        if now >= self.next_snapshot:
+            self.next_snapshot = now + self.snapshot_interval
+            if self.snapshot():
+                ran.append("snapshot")
+        return ran
+
+    def snapshot(self) -> bool:
+        """Write a snapshot unless the tasks are unchanged since the last one."""
+        from task_snapshot import export_columns_to_snapshot
+        with self._locked("export-binary"):
+            version = self._task_list._results.version
+            if version == self._snapshot_version:
+                return False
+            columns = self._task_list._store.to_columns()
+        try:
+            export_columns_to_snapshot(columns, self.snapshot_path)
+        except OSError as error:
+            print(f"Snapshot failed: {error}.", file=sys.stderr)
+            return False
+        self._snapshot_version = version
+        return True
+
+    def _run(self) -> None:
+        while not self._stopped.wait(min(max(min(self.next_snapshot, self.next_midnight) - self._clock(), 0.0), self.MAX_SLEEP)):
+            self.run_pending()
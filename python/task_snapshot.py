@@ -0,0 +1,120 @@
+import zipfile
+from datetime import date
+from typing import Dict, List, Sequence, Tuple
+from task_csv import atomic_write
+from task_store import TaskStore
+import numpy as np
+import pandas as pd
+
+SNAPSHOT_VERSION = 1
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+
+def export_store_to_snapshot(store: TaskStore, filepath: str, sequence: int = 0) -> None:
+    """Write the tasks of a store to a binary snapshot (an uncompressed NumPy .npz file).
+
+    Every column is stored with its own type, so loading it needs no parsing:
+    - project_names and descriptions: UTF-8 text with character offsets
+    - project_codes and description_codes: int32 index into those names (categorical)
+    - task_ids: int64, done: bool
+    - deadlines: datetime64[D], NaT meaning no deadline
+
+    sequence is the number of the last journal record the snapshot includes, see
+    TaskJournal. The file is replaced atomically, like a CSV export.
+    """
+    export_columns_to_snapshot(store.to_columns(), filepath, sequence)
+
+
+def export_columns_to_snapshot(columns: Dict[str, Sequence], filepath: str, sequence: int = 0) -> None:
+    """export_store_to_snapshot for columns taken from a store with to_columns.
+
+    The columns are a copy, so the store can change while they are written.
+    """
+    if 'descriptions' in columns:
+        # Codes into the descriptions, see ColumnarTaskStore.to_columns; only the used ones are kept
+        used, description_codes = np.unique(columns['description'], return_inverse=True)
+        descriptions = columns['descriptions']
+        unique_descriptions = [descriptions[code] for code in used.tolist()]
+    else:
+        description_codes, unique_descriptions = pd.factorize(pd.Series(columns['description']))
+        unique_descriptions = unique_descriptions.tolist()
+    project_text, project_offsets = pack_strings(columns['projects'])
+    description_text, description_offsets = pack_strings(unique_descriptions)
+    ordinals = np.asarray(columns['deadline'], dtype=np.int64)
+    days = np.where(ordinals == 0, np.iinfo(np.int64).min, ordinals - _EPOCH_ORDINAL)
+
+    with atomic_write(filepath, 'wb') as file:
+        np.savez(
+            file,
+            version=np.int64(SNAPSHOT_VERSION),
+            sequence=np.int64(sequence),
+            project_text=project_text,
+            project_offsets=project_offsets,
+            project_codes=np.asarray(columns['project_code'], dtype=np.int32),
+            task_ids=np.asarray(columns['task_id'], dtype=np.int64),
+            description_text=description_text,
+            description_offsets=description_offsets,
+            description_codes=description_codes.astype(np.int32),
+            done=np.asarray(columns['done'], dtype=np.bool_),
+            deadlines=days.view('datetime64[D]'),
+        )
+
+
+def read_snapshot(filepath: str) -> pd.DataFrame:
+    """Read a snapshot written by export_store_to_snapshot into a DataFrame.
+
+    The frame has the columns and dtypes of a chunk from TaskAnalytics.read_csv_chunks,
+    with project_name and description as categoricals, so it can be passed to
+    TaskStore.extend_from_frame. Projects without tasks get a row without a task_id.
+    The journal sequence number of the snapshot is in frame.attrs['sequence'].
+    """
+    try:
+        with np.load(filepath, allow_pickle=False) as snapshot:
+            if int(snapshot['version']) != SNAPSHOT_VERSION:
+                raise ValueError(f"unsupported snapshot version {int(snapshot['version'])}")
+            project_names = unpack_strings(snapshot['project_text'], snapshot['project_offsets'])
+            descriptions = unpack_strings(snapshot['description_text'], snapshot['description_offsets'])
+            project_codes = snapshot['project_codes']
+            task_ids = snapshot['task_ids']
+            description_codes = snapshot['description_codes']
+            done = snapshot['done']
+            deadlines = snapshot['deadlines']
+            sequence = int(snapshot['sequence']) if 'sequence' in snapshot.files else 0
+    except (KeyError, zipfile.BadZipFile) as error:
+        raise ValueError(f"{filepath} is not a task snapshot") from error
+
+    # Empty projects get a placeholder row at their position, like in a CSV export
+    empty = np.flatnonzero(np.bincount(project_codes, minlength=len(project_names)) == 0)
+    missing = np.ones(len(empty), dtype=np.bool_)
+    order = np.argsort(np.concatenate([project_codes, empty]), kind='stable')
+    frame = pd.DataFrame({
+        'project_name': pd.Categorical.from_codes(np.concatenate([project_codes, empty])[order], categories=project_names),
+        'task_id': pd.arrays.IntegerArray(
+            np.concatenate([task_ids, np.zeros(len(empty), dtype=np.int64)])[order],
+            np.concatenate([np.zeros(len(task_ids), dtype=np.bool_), missing])[order],
+        ),
+        'description': pd.Categorical.from_codes(
+            np.concatenate([description_codes, np.full(len(empty), -1, dtype=np.int32)])[order], categories=descriptions
+        ),
+        'done': pd.arrays.BooleanArray(
+            np.concatenate([done, np.zeros(len(empty), dtype=np.bool_)])[order],
+            np.concatenate([np.zeros(len(done), dtype=np.bool_), missing])[order],
+        ),
+        'deadline': np.concatenate([deadlines, np.full(len(empty), np.datetime64('NaT'), dtype='datetime64[D]')])[order].astype('datetime64[s]'),
+    })
+    frame.attrs['sequence'] = sequence
+    return frame
+
+
+def pack_strings(strings: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+    # One UTF-8 buffer plus the character offset where each string starts
+    offsets = np.zeros(len(strings) + 1, dtype=np.int64)
+    np.cumsum([len(string) for string in strings], out=offsets[1:])
+    return np.frombuffer(''.join(strings).encode('utf-8'), dtype=np.uint8), offsets
+
+
+def unpack_strings(text: np.ndarray, offsets: np.ndarray) -> List[str]:
+    # Slicing a str by character offsets is constant time, even for non-ASCII text
+    joined = text.tobytes().decode('utf-8')
+    bounds = offsets.tolist()
+    return [joined[start:stop] for start, stop in zip(bounds[:-1], bounds[1:])]
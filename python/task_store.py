@@ -0,0 +1,224 @@
+import gc
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+from task import Task, to_ordinal
+
+
+@contextmanager
+def gc_paused() -> Iterator[None]:
+    """Pause the cyclic garbage collector while creating many objects that hold no cycles.
+
+    Every few hundred allocations the collector would otherwise scan all tracked
+    objects, which makes loading a million tasks quadratic in practice.
+    """
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
+class TaskStore:
+    """Default storage engine: a dict of project name -> list of Task objects.
+
+    Task IDs are indexed so that lookups do not depend on the size of the list.
+    """
+
+    def __init__(self):
+        self._tasks: Dict[str, List[Task]] = {}
+        self._task_index: Dict[int, Tuple[str, Task]] = {}
+        self._listeners: List[object] = []
+        # Descriptions of the tasks added by extend_from_frame, to share equal strings
+        self._interned: Dict[str, str] = {}
+
+    def subscribe(self, listener: object) -> None:
+        """Register a listener that is told about every change to the store.
+
+        Listeners implement on_project_added, on_task_added, on_done_changed,
+        on_deadline_changed and on_loaded.
+        """
+        self._listeners.append(listener)
+
+    def __len__(self) -> int:
+        return sum(len(tasks) for tasks in self._tasks.values())
+
+    def has_project(self, name: str) -> bool:
+        return name in self._tasks
+
+    def add_project(self, name: str) -> None:
+        # Adding an existing project replaces it, dropping its tasks
+        for task in self._tasks.get(name, []):
+            self._task_index.pop(task.id, None)
+        self._tasks[name] = []
+        for listener in self._listeners:
+            listener.on_project_added(name)
+
+    def add_task(self, project: str, task_id: int, description: str, done: bool = False) -> None:
+        task = Task(task_id, description, done)
+        self._tasks[project].append(task)
+        self._task_index[task_id] = (project, task)
+        for listener in self._listeners:
+            listener.on_task_added(project, task_id, description, done)
+
+    def add_tasks(self, project: str, task_ids: Sequence[int], descriptions: Sequence[str]) -> None:
+        """Add tasks to a project in one go, the same as add_task for each of them."""
+        tasks = self._tasks[project]
+        with gc_paused():
+            for task_id, description in zip(task_ids, descriptions):
+                task = Task(task_id, description, False)
+                tasks.append(task)
+                self._task_index[task_id] = (project, task)
+                for listener in self._listeners:
+                    listener.on_task_added(project, task_id, description, False)
+
+    def get(self, task_id: int) -> Optional[Tuple[str, Task]]:
+        return self._task_index.get(task_id)
+
+    def set_done(self, task_id: int, done: bool) -> bool:
+        entry = self._task_index.get(task_id)
+        if entry is None:
+            return False
+        entry[1].done = done
+        for listener in self._listeners:
+            listener.on_done_changed(task_id, done)
+        return True
+
+    def set_done_many(self, task_ids: Sequence[int], done: Sequence[bool]) -> List[bool]:
+        """set_done for each task ID and flag in turn, returning whether each task was found."""
+        return [self.set_done(task_id, flag) for task_id, flag in zip(task_ids, done)]
+
+    def set_deadline(self, task_id: int, deadline: str) -> bool:
+        entry = self._task_index.get(task_id)
+        if entry is None:
+            return False
+        entry[1].deadline = deadline
+        for listener in self._listeners:
+            listener.on_deadline_changed(task_id, deadline)
+        return True
+
+    def set_deadline_many(self, task_ids: Sequence[int], deadline: str) -> List[bool]:
+        """set_deadline with the same deadline for each task ID, returning whether each task was found."""
+        ordinal = to_ordinal(deadline) if deadline else 0
+        found = []
+        for task_id in task_ids:
+            entry = self._task_index.get(task_id)
+            found.append(entry is not None)
+            if entry is not None:
+                entry[1].deadline_ordinal = ordinal
+                for listener in self._listeners:
+                    listener.on_deadline_changed(task_id, deadline)
+        return found
+
+    def has_empty_project(self) -> bool:
+        return any(len(tasks) == 0 for tasks in self._tasks.values())
+
+    def projects(self) -> List[str]:
+        return list(self._tasks)
+
+    def items(self) -> Iterator[Tuple[str, List[Task]]]:
+        return iter(self._tasks.items())
+
+    def task_counts(self) -> Dict[str, int]:
+        """Number of tasks per project, in items() order."""
+        return {name: len(tasks) for name, tasks in self._tasks.items()}
+
+    def tasks_of(self, project: str, offset: int = 0, limit: Optional[int] = None) -> List[Task]:
+        """Tasks offset up to offset + limit of a project, which must exist."""
+        return self._tasks[project][offset:None if limit is None else offset + limit]
+
+    def task_ids_of(self, project: str) -> List[int]:
+        """IDs of the tasks of a project, which must exist."""
+        return [task.id for task in self._tasks[project] if task.id is not None]
+
+    def task_ids_between(self, first: int, last: int) -> List[int]:
+        """IDs of the tasks from first to last, ascending."""
+        if last - first < len(self._task_index):
+            return [task_id for task_id in range(first, last + 1) if task_id in self._task_index]
+        return sorted(task_id for task_id in self._task_index if first <= task_id <= last)
+
+    def page(self, offset: int, limit: Optional[int] = None) -> Iterator[Tuple[str, List[Task]]]:
+        """Yield the projects and tasks of rows offset up to offset + limit, in items() order.
+
+        Every task is a row, and so is every project without tasks. A project is yielded
+        with the part of its tasks that falls in the range, or with no tasks if it is empty.
+        """
+        stop = None if limit is None else offset + limit
+        position = 0
+        for project_name, tasks in self._tasks.items():
+            if stop is not None and position >= stop:
+                return
+            rows = max(len(tasks), 1)
+            if position + rows > offset:
+                yield project_name, tasks[max(offset - position, 0):None if stop is None else stop - position]
+            position += rows
+
+    def to_dict(self) -> Dict[str, List[Task]]:
+        return self._tasks
+
+    def to_columns(self) -> Dict[str, Sequence]:
+        """Return the tasks as columns, in the order of items().
+
+        'projects' lists the project names, 'project_code' indexes into it for every
+        task. The other columns are 'task_id', 'description', 'done' and 'deadline' as
+        a date ordinal, 0 meaning no deadline.
+        """
+        columns: Dict[str, list] = {'project_code': [], 'task_id': [], 'description': [], 'done': [], 'deadline': []}
+        with gc_paused():
+            # A column at a time, one list comprehension per project and column
+            for code, tasks in enumerate(self._tasks.values()):
+                columns['project_code'].extend([code] * len(tasks))
+                columns['task_id'].extend([task.id for task in tasks])
+                columns['description'].extend([task.description for task in tasks])
+                columns['done'].extend([task.done for task in tasks])
+                columns['deadline'].extend([task.deadline_ordinal for task in tasks])
+        return {'projects': self.projects(), **columns}
+
+    def extend_from_frame(self, df) -> None:
+        """Append the tasks of a DataFrame as produced by TaskAnalytics.read_csv_chunks.
+
+        Rows without a task_id only add their project. Listeners are not notified, this
+        is meant for filling a new store that is then passed to load_from. Tasks with the
+        same description share one string, also across the chunks of an import.
+        """
+        for project_name in df['project_name'].unique():
+            self._tasks.setdefault(project_name, [])
+        df = df.loc[df['task_id'].notna()]
+        # Convert each distinct deadline once, the last entry is for tasks without one
+        deadline_codes, unique_deadlines = df['deadline'].factorize()
+        deadline_ordinals = [deadline.toordinal() for deadline in unique_deadlines] + [0]
+        deadlines = [deadline_ordinals[code] for code in deadline_codes.tolist()]
+        description_codes, unique_descriptions = df['description'].factorize()
+        unique_descriptions = [self._interned.setdefault(description, description) for description in unique_descriptions.tolist()]
+        descriptions = [unique_descriptions[code] for code in description_codes.tolist()]
+        with gc_paused():
+            for project_name, task_id, description, done, deadline in zip(
+                df['project_name'].tolist(), df['task_id'].tolist(), descriptions, df['done'].tolist(), deadlines
+            ):
+                task = Task(task_id, description, done)
+                task.deadline_ordinal = deadline
+                self._tasks[project_name].append(task)
+                self._task_index.setdefault(task_id, (project_name, task))
+
+    def load_from(self, other: 'TaskStore') -> None:
+        """Replace the contents of the store with those of another store of the same type."""
+        self._tasks = other._tasks
+        self._task_index = other._task_index
+        for listener in self._listeners:
+            listener.on_loaded()
+
+    def max_id(self) -> int:
+        return max(self._task_index, default=0)
+
+    def load(self, tasks: Dict[str, List[Task]]) -> None:
+        """Replace the contents of the store with the given projects and tasks."""
+        self._tasks = tasks
+        # First occurrence wins, matching what a scan over the projects would find
+        self._task_index = {}
+        for project_name, project_tasks in tasks.items():
+            for task in project_tasks:
+                if task.id is not None:
+                    self._task_index.setdefault(task.id, (project_name, task))
+        for listener in self._listeners:
+            listener.on_loaded()
@@ -1,19 +1,42 @@
 import io
 import pytest
 from task_list import TaskList
+from command_registry import Command
 from datetime import datetime
 from task_analytics import TaskAnalytics 
 from task import Task
+from task_store import TaskStore
+from columnar_task_store import ColumnarTaskStore
 import pandas as pd
 import os
+import signal
+import subprocess
+import sys
+from task_journal import TaskJournal
+from output_sink import OutputSink
+from result_cache import ResultCache
+from concurrent_task_list import ConcurrentTaskList
+from asgi_app import AsyncTaskList, TaskListApp
+import threading
+import asyncio
+import json
+import re
+import math
+import time
+import tracemalloc
+from parallel_analytics import ParallelTaskAnalytics
+from task_scheduler import TaskScheduler, next_midnight
+from task_metrics import LatencyHistogram
+from benchmarks.generator import TaskListSpec, generate_frame, generate_task_list
+from benchmarks.suite import NOISE_FLOOR, compare
 
 analytics = TaskAnalytics()
 
-@pytest.fixture
-def task_list() -> TaskList:
+@pytest.fixture(params=[TaskStore, ColumnarTaskStore])
+def task_list(request: pytest.FixtureRequest) -> TaskList:
     input_stream = io.StringIO()
     output_stream = io.StringIO()
-    return TaskList(input_stream, output_stream)
+    return TaskList(input_stream, output_stream, request.param())
 
 
 @pytest.fixture
@@ -554,4 +577,1288 @@ def test_find_overdue_tasks():
                            ['Food', 3, 'Dinner', True, datetime(2027, 1, 1)]], 
                            columns=['project_name','task_id','description','done','deadline'], 
                            index=[0,1])
-    assert df_overdue.equals(test_df)
\ No newline at end of file
+    assert df_overdue.equals(test_df)
+
+
+def test_store_indexes_added_tasks(task_list: TaskList, output_stream: io.StringIO) -> None:
+
+    task_list.execute("add project secrets")
+    task_list.execute("add task secrets Eat more donuts.")
+    task_list.execute("add project training")
+    task_list.execute("add task training SOLID")
+
+    assert [(project, task.description) for project, task in (task_list._store.get(1), task_list._store.get(2))] == [
+        ('secrets', 'Eat more donuts.'),
+        ('training', 'SOLID'),
+    ]
+
+    # Re-adding a project replaces it, so its tasks can no longer be found
+    task_list.execute("add project secrets")
+    clear_output(output_stream)
+    task_list.execute("check 1")
+    task_list.execute("check 2")
+    output = get_output(output_stream)
+    lines = output.strip().split('\n')
+
+    expected_lines = [
+        "Could not find a task with an ID of 1.",
+        "Checked 2.",
+    ]
+
+    assert lines == expected_lines
+
+
+def test_columnar_store_matches_dict_store() -> None:
+    commands = [
+        "add project secrets",
+        "add task secrets Eat more donuts.",
+        "add task secrets Destroy all humans.",
+        "add project training",
+        "add task training SOLID",
+        "add task training Eat less donuts.",
+        "add project empty",
+        "check 1",
+        "check 4",
+        "uncheck 1",
+        "deadline 2 01-01-2026",
+        "deadline 4 31-12-1999",
+        "show",
+        "view-by-deadline",
+        "summary",
+        "top-projects 2",
+        "find-tasks-by-keyword donuts",
+        "find-overdue 01-01-2030",
+        "add project secrets",
+        "check 2",
+        "add task secrets Again",
+        "show",
+    ]
+    dict_list = TaskList(io.StringIO(), io.StringIO(), TaskStore())
+    columnar_list = TaskList(io.StringIO(), io.StringIO(), ColumnarTaskStore())
+
+    for command in commands:
+        assert columnar_list.execute(command) == dict_list.execute(command)
+    assert get_output(columnar_list._output_stream) == get_output(dict_list._output_stream)
+
+
+def test_analytics_view_only_rebuilds_on_structural_changes(task_list: TaskList) -> None:
+
+    task_list.execute("add project secrets")
+    task_list.execute("add task secrets Eat more donuts.")
+    task_list.execute("add project training")
+    task_list.execute("add task training SOLID")
+    view = task_list._analytics_view
+
+    task_list.execute("summary")
+    assert view.rebuilds == 1
+    assert not view.dirty
+
+    # Queries on an unchanged list reuse the frame
+    task_list.execute("summary")
+    task_list.execute("top-projects 1")
+    task_list.execute("find-tasks-by-keyword donuts")
+    assert (view.rebuilds, view.delta_applications) == (1, 0)
+
+    # Task changes are applied as deltas
+    task_list.execute("add task secrets Destroy all humans.")
+    task_list.execute("check 1")
+    task_list.execute("deadline 2 01-01-2026")
+    assert view.dirty
+    task_list.execute("summary")
+    assert (view.rebuilds, view.delta_applications) == (1, 1)
+
+    # A new project changes the shape of the frame and forces a rebuild
+    task_list.execute("add project empty")
+    task_list.execute("summary")
+    assert (view.rebuilds, view.delta_applications) == (2, 1)
+
+
+def test_analytics_view_matches_import_from_dict(task_list: TaskList) -> None:
+
+    task_list.execute("add project secrets")
+    task_list.execute("add task secrets Eat more donuts.")
+    task_list.execute("add project training")
+    task_list.execute("add task training SOLID")
+    task_list._analytics_view.frame()
+
+    task_list.execute("add task secrets Destroy all humans.")
+    task_list.execute("add task training Outside-In TDD")
+    task_list.execute("add task secrets Eat less donuts.")
+    task_list.execute("check 3")
+    task_list.execute("check 5")
+    task_list.execute("uncheck 5")
+    task_list.execute("deadline 1 01-01-2026")
+    task_list.execute("deadline 4 31-12-1999")
+
+    expected = analytics.import_from_dict(task_list._store.to_dict()).drop(columns='task')
+    assert task_list._analytics_view.frame().equals(expected)
+
+
+def test_project_summary_includes_empty_projects():
+    task1 = Task(1, 'Eat donuts', True)
+    df = analytics.import_from_dict({'Food': [task1], 'Empty': []})
+    project_summary = analytics.get_project_summary(df)
+    test_df = pd.DataFrame([['Empty', 0, 0, 0, float('nan')],
+                            ['Food', 1, 1, 0, 100.0]],
+                            columns=['project_name', 'total_tasks', 'completed_tasks', 'pending_tasks', 'completion_rate'])
+    assert project_summary.equals(test_df)
+
+
+def test_top_projects_by_completion_breaks_ties_by_name():
+    tasks = {name: [Task(i, 'Task', done)] for i, (name, done) in enumerate([('c', True), ('a', False), ('e', True), ('b', True), ('d', False)])}
+    tasks['empty'] = []
+    df = analytics.import_from_dict(tasks)
+    top_projects = analytics.get_top_projects_by_completion(df, 6)
+    assert top_projects['project_name'].tolist() == ['b', 'c', 'e', 'a', 'd', 'empty']
+
+
+def test_top_projects_lists_empty_projects_once(task_list: TaskList, output_stream: io.StringIO) -> None:
+
+    task_list.execute("add project a")
+    task_list.execute("add project b")
+    task_list.execute("add task a x")
+    clear_output(output_stream)
+    task_list.execute("top-projects 5")
+    assert get_output(output_stream) == "project_name  completion_rate\n           a              0.0\n           b              NaN\n"
+
+
+def test_find_tasks_by_keyword_with_index_matches_scan(task_list: TaskList) -> None:
+
+    task_list.execute("add project secrets")
+    task_list.execute("add task secrets Eat more donuts.")
+    task_list.execute("add task secrets Destroy all humans.")
+    task_list.execute("add project training")
+    task_list.execute("add task training Donut design (part 1)")
+    task_list.execute("find-tasks-by-keyword donut")
+    # Tasks added after the index was built are indexed as well
+    task_list.execute("add task training Interaction-Driven Design")
+    task_list.execute("add project empty")
+
+    df = task_list._analytics_view.frame()
+    for keyword in ['donut', 'DONUTS', 'design', 'n d', 'd', '', 'xyz', 'an']:
+        expected = analytics.find_tasks_by_keyword(df, keyword)
+        assert analytics.find_tasks_by_keyword(df, keyword, keyword_index=task_list._keyword_index).equals(expected)
+
+
+def test_find_tasks_by_keyword_literal_and_regex():
+    task1 = Task(1, 'Eat donuts', False)
+    task2 = Task(2, 'Donut design (part 1)', True)
+    df = analytics.import_from_dict({'Food': [task1, task2]})
+
+    assert analytics.find_tasks_by_keyword(df, 'do.uts')['task_id'].tolist() == [1]
+    assert analytics.find_tasks_by_keyword(df, 'do.uts', regex=False).empty
+    assert analytics.find_tasks_by_keyword(df, '(part 1)', regex=False)['task_id'].tolist() == [2]
+
+
+def test_find_tasks_by_keyword_command_literal(task_list: TaskList, output_stream: io.StringIO) -> None:
+
+    task_list.execute("add project secrets")
+    task_list.execute("add task secrets Eat more donuts.")
+    task_list.execute("add task secrets Eat more donuts")
+    clear_output(output_stream)
+
+    task_list.execute("find-tasks-by-keyword --literal donuts.")
+    output = get_output(output_stream)
+    lines = output.strip().split('\n')
+
+    expected_lines = [
+        "project_name  task_id      description  done deadline",
+        "     secrets        1 Eat more donuts. False      NaT",
+    ]
+
+    assert lines == expected_lines
+
+
+def test_deadline_index_follows_changed_deadlines(task_list: TaskList, output_stream: io.StringIO) -> None:
+
+    task_list.execute("add project secrets")
+    task_list.execute("add task secrets Eat more donuts.")
+    task_list.execute("add task secrets Destroy all humans.")
+    task_list.execute("add project training")
+    task_list.execute("add task training SOLID")
+    task_list.execute("deadline 1 01-01-2026")
+    task_list.execute("deadline 3 01-01-2026")
+    task_list.execute("view-by-deadline")
+
+    # Moving and overwriting deadlines after the index was built
+    task_list.execute("deadline 1 15-03-2024")
+    task_list.execute("deadline 3 01-02-2026")
+    task_list.execute("deadline 2 01-02-2026")
+    clear_output(output_stream)
+
+    task_list.execute("view-by-deadline")
+    output = get_output(output_stream)
+    lines = output.strip().split('\n')
+
+    expected_lines = [
+        "15-03-2024:",
+        "  secrets:",
+        "    1: Eat more donuts.",
+        "01-02-2026:",
+        "  secrets:",
+        "    2: Destroy all humans.",
+        "  training:",
+        "    3: SOLID",
+    ]
+
+    assert lines == expected_lines
+
+    df = task_list._analytics_view.frame()
+    indexed_analytics = TaskAnalytics()
+    indexed_analytics.INDEX_SELECTIVITY = 0
+    for current_date in ['01-01-2000', '16-03-2024', '01-02-2026', '02-02-2026']:
+        expected = analytics.find_overdue_tasks(df, current_date)
+        assert indexed_analytics.find_overdue_tasks(df, current_date, task_list._deadline_index).equals(expected)
+
+
+def test_export_then_import_restores_tasks(task_list: TaskList, output_stream: io.StringIO, tmp_path) -> None:
+
+    task_list.execute("add project secrets")
+    task_list.execute("add task secrets Eat more donuts.")
+    task_list.execute("add task secrets Destroy, all humans.")
+    task_list.execute("add project empty")
+    task_list.execute("add project training")
+    task_list.execute("add task training SOLID")
+    task_list.execute("check 2")
+    task_list.execute("deadline 3 01-01-2026")
+    shown = task_list.execute("show")
+    task_list.execute(f"export {tmp_path / 'tasks.csv'}")
+
+    imported = TaskList(io.StringIO(), io.StringIO(), type(task_list._store)())
+    imported.IMPORT_CHUNK_SIZE = 2
+    assert imported.execute(f"import {tmp_path / 'tasks.csv'}") == "File found and imported as tasks (overwrote old tasks)\n"
+    assert imported.execute("show") == shown
+    progress = get_output(imported._output_stream).split('\n')
+    assert [line.split(' (')[0] for line in progress[:2]] == ["Imported 2 rows", "Imported 4 rows"]
+
+    # New tasks continue after the imported IDs
+    imported.execute("add task empty Refactor")
+    assert imported._store.get(4)[0] == 'empty'
+
+
+def test_import_invalid_file_keeps_tasks(task_list: TaskList, output_stream: io.StringIO, tmp_path) -> None:
+
+    task_list.execute("add project secrets")
+    task_list.execute("add task secrets Eat more donuts.")
+    path = tmp_path / 'tasks.csv'
+    path.write_text("project_name,task_id,description,done,deadline\nsecrets,1,Dinner,True,\nsecrets,2,Dishes,maybe,\n")
+    clear_output(output_stream)
+
+    task_list.execute(f"import {path}")
+    task_list.execute("show")
+    output = get_output(output_stream)
+    lines = output.strip().split('\n')
+
+    expected_lines = [
+        "Import failed: invalid done flag on lines 2-3.",
+        "secrets",
+        "    [ ] 1: Eat more donuts.",
+    ]
+
+    assert lines == expected_lines
+
+
+def test_streaming_export_matches_export_to_csv(task_list: TaskList, tmp_path) -> None:
+
+    task_list.execute("add project secrets")
+    task_list.execute("add task secrets Eat more donuts.")
+    task_list.execute('add task secrets Destroy "all", humans.')
+    task_list.execute("add project training")
+    task_list.execute("add task training SOLID")
+    task_list.execute("check 2")
+    task_list.execute("deadline 3 01-01-2026")
+    df = task_list._analytics_view.frame()
+
+    for with_empty_project in [False, True]:
+        if with_empty_project:
+            task_list.execute("add project empty")
+            df = task_list._analytics_view.frame()
+        task_list.execute(f"export {tmp_path / 'streamed.csv'}")
+        analytics.export_to_csv(df, tmp_path / 'pandas.csv')
+        assert (tmp_path / 'streamed.csv').read_bytes() == (tmp_path / 'pandas.csv').read_bytes()
+
+
+def test_failed_export_leaves_existing_file(task_list: TaskList, tmp_path) -> None:
+
+    task_list.execute("add project secrets")
+    task_list.execute("add task secrets Eat more donuts.")
+    task_list.execute("add project training")
+    path = tmp_path / 'tasks.csv'
+    path.write_text("previous export\n")
+
+    def failing_items():
+        yield from list(task_list._store.items())[:1]
+        raise RuntimeError("crash halfway")
+    task_list._store.items = failing_items
+
+    with pytest.raises(RuntimeError):
+        task_list.execute(f"export {path}")
+    assert path.read_text() == "previous export\n"
+    assert os.listdir(tmp_path) == ['tasks.csv']
+
+
+def test_binary_snapshot_round_trip_matches_csv(task_list: TaskList, tmp_path) -> None:
+
+    task_list.execute("add project secrets")
+    task_list.execute("add task secrets Eat more donuts.")
+    task_list.execute('add task secrets Destroy "all", humans ✓.')
+    task_list.execute("add project empty")
+    task_list.execute("add project training")
+    task_list.execute("add task training SOLID")
+    task_list.execute("add task training SOLID")
+    task_list.execute("check 2")
+    task_list.execute("deadline 3 01-01-2026")
+    task_list.execute("deadline 4 29-02-2024")
+    task_list.execute(f"export {tmp_path / 'tasks.csv'}")
+    assert task_list.execute(f"export-binary {tmp_path / 'tasks.npz'}") == "Tasks exported to file succesfully.\n"
+
+    from_csv = TaskList(io.StringIO(), io.StringIO(), type(task_list._store)())
+    from_csv.execute(f"import {tmp_path / 'tasks.csv'}")
+    from_binary = TaskList(io.StringIO(), io.StringIO(), type(task_list._store)())
+    assert from_binary.execute(f"import-binary {tmp_path / 'tasks.npz'}") == "File found and imported as tasks (overwrote old tasks)\n"
+
+    assert from_binary.execute("show") == from_csv.execute("show") == task_list.execute("show")
+    assert from_binary.execute("view-by-deadline") == task_list.execute("view-by-deadline")
+    assert from_binary._analytics_view.frame().equals(from_csv._analytics_view.frame())
+    from_binary.execute("add task empty Refactor")
+    assert from_binary._store.get(5)[0] == 'empty'
+
+
+def test_import_binary_rejects_other_files(task_list: TaskList, output_stream: io.StringIO, tmp_path) -> None:
+
+    task_list.execute("add project secrets")
+    task_list.execute(f"export {tmp_path / 'tasks.csv'}")
+    clear_output(output_stream)
+
+    assert task_list.execute(f"import-binary {tmp_path / 'missing.npz'}") == "Filename not found.\n"
+    assert task_list.execute(f"import-binary {tmp_path / 'tasks.csv'}").startswith("Import failed: ")
+    assert task_list.execute("show") == "secrets\n\n"
+
+
+def test_journal_replays_changes_after_restart(task_list: TaskList, tmp_path) -> None:
+
+    store_type = type(task_list._store)
+    journaled = TaskList(io.StringIO(), io.StringIO(), store_type(), str(tmp_path))
+    journaled.execute("add project secrets")
+    journaled.execute("add task secrets Eat more donuts.")
+    journaled.execute("add task secrets Destroy all humans.")
+    journaled.execute("add project empty")
+    journaled.execute("check 2")
+    journaled.execute("deadline 1 01-01-2026")
+    shown = journaled.execute("show")
+    # No close(): every record has already been handed to the operating system
+
+    restarted = TaskList(io.StringIO(), io.StringIO(), store_type(), str(tmp_path))
+    assert restarted._journal.replayed == 6
+    assert restarted.execute("show") == shown
+    restarted.execute("add task empty Refactor")
+    assert restarted._store.get(3)[0] == 'empty'
+    restarted.close()
+    journaled.close()
+
+
+def test_journal_compaction_and_torn_records(task_list: TaskList, tmp_path) -> None:
+
+    store_type = type(task_list._store)
+    journaled = TaskList(io.StringIO(), io.StringIO(), store_type(), str(tmp_path))
+    journaled._journal.COMPACT_AFTER = 3
+    for command in ["add project secrets", "add task secrets Eat more donuts.", "check 1", "add task secrets Sleep"]:
+        journaled.execute(command)
+    journaled._journal.close()
+    assert os.path.exists(tmp_path / TaskJournal.SNAPSHOT_NAME)
+    assert (tmp_path / TaskJournal.LOG_NAME).read_text().count("\n") == 1
+    shown = journaled.execute("show")
+
+    # A crash right after the snapshot leaves records in the log that it already holds,
+    # and a crash halfway through a write leaves a partial record
+    log = (tmp_path / TaskJournal.LOG_NAME)
+    log.write_text('[1,"p","secrets"]\n[2,"t","secrets",1,"Eat more donuts.",false]\n' + log.read_text() + '[5,"t","secr')
+
+    restarted = TaskList(io.StringIO(), io.StringIO(), store_type(), str(tmp_path))
+    assert restarted.execute("show") == shown
+    restarted.execute("add task secrets Wake up")
+    reopened = TaskList(io.StringIO(), io.StringIO(), store_type(), str(tmp_path))
+    assert reopened.execute("show") == restarted.execute("show")
+    reopened.close()
+    restarted.close()
+
+
+def test_journal_syncs_incomplete_group_when_idle(tmp_path) -> None:
+
+    journaled = TaskList(io.StringIO(), io.StringIO(), journal_directory=str(tmp_path))
+    journal = journaled._journal
+    journal.GROUP_COMMIT_INTERVAL = 0.2
+    journal.sync()
+    journaled.execute("add project secrets")
+    journaled.execute("add task secrets Eat more donuts.")
+    assert journal._unsynced == 2
+    # No further change comes, the timer syncs the group
+    deadline = time.monotonic() + 5
+    while journal._unsynced and time.monotonic() < deadline:
+        time.sleep(0.05)
+    assert journal._unsynced == 0
+    assert journal._timer is None
+    journaled.close()
+
+
+def test_journal_recovers_after_process_is_killed(task_list: TaskList, tmp_path) -> None:
+
+    store_type = type(task_list._store)
+    script = (
+        "import io, itertools, sys\n"
+        "from task_list import TaskList\n"
+        f"from {store_type.__module__} import {store_type.__name__}\n"
+        f"task_list = TaskList(io.StringIO(), io.StringIO(), {store_type.__name__}(), sys.argv[1])\n"
+        "task_list.execute('add project load')\n"
+        "for i in itertools.count(1):\n"
+        "    task_list.execute(f'add task load Task {i}')\n"
+        "    if i % 3 == 0:\n"
+        "        task_list.execute(f'check {i}')\n"
+        "    print(i, flush=True)\n"
+    )
+    process = subprocess.Popen([sys.executable, "-c", script, str(tmp_path)], cwd=os.path.dirname(os.path.abspath(__file__)), stdout=subprocess.PIPE, text=True)
+    try:
+        for _ in range(500):
+            acknowledged = int(process.stdout.readline())
+    finally:
+        process.send_signal(signal.SIGKILL)
+        process.wait()
+        process.stdout.close()
+
+    recovered = TaskList(io.StringIO(), io.StringIO(), store_type(), str(tmp_path))
+    tasks = recovered._store.to_dict()['load']
+    assert len(tasks) >= acknowledged
+    assert [task.id for task in tasks] == list(range(1, len(tasks) + 1))
+    assert all(task.description == f"Task {task.id}" for task in tasks)
+    # The check of the last task may not have been made yet
+    assert all(task.done == (task.id % 3 == 0) for task in tasks[:-1])
+    recovered.close()
+
+
+class CountingStream(io.StringIO):
+    def __init__(self):
+        super().__init__()
+        self.writes = 0
+        self.flushes = 0
+
+    def write(self, text: str) -> int:
+        self.writes += 1
+        return super().write(text)
+
+    def flush(self) -> None:
+        self.flushes += 1
+
+
+def test_commands_write_their_output_once(task_list: TaskList) -> None:
+
+    task_list.execute("add project secrets")
+    task_list.execute("add task secrets Eat more donuts.")
+    task_list.execute("add task secrets Destroy all humans.")
+    task_list.execute("deadline 1 01-01-2026")
+    stream = CountingStream()
+    task_list._output = OutputSink(stream)
+
+    for command in ["show", "view-by-deadline", "today", "help"]:
+        output = task_list.execute(command)
+        assert stream.getvalue().endswith(output)
+    assert (stream.writes, stream.flushes) == (4, 4)
+
+
+def test_output_sink_flushes_at_threshold() -> None:
+
+    stream = CountingStream()
+    sink = OutputSink(stream, flush_threshold=10)
+    sink.write("12345")
+    sink.write("6789")
+    assert stream.flushes == 0
+    sink.write("0")
+    assert stream.flushes == 1
+    sink.write("abc")
+    sink.flush()
+    assert (stream.getvalue(), stream.flushes) == ("1234567890abc", 2)
+
+
+def test_show_pages(task_list: TaskList) -> None:
+
+    task_list.execute("add project secrets")
+    task_list.execute("add task secrets Eat more donuts.")
+    task_list.execute("add task secrets Destroy all humans.")
+    task_list.execute("add project empty")
+    task_list.execute("add project training")
+    task_list.execute("add task training SOLID")
+    task_list.execute("add task training XP")
+
+    assert task_list.execute("show --limit 3") == (
+        "secrets\n    [ ] 1: Eat more donuts.\n    [ ] 2: Destroy all humans.\n\n"
+        "empty\n\n"
+        "(more: show --offset 3 --limit 3)\n"
+    )
+    assert task_list.execute("show --offset 3 --limit 3") == "training\n    [ ] 3: SOLID\n    [ ] 4: XP\n\n"
+    assert task_list.execute("show --limit 2 --offset 1") == (
+        "secrets\n    [ ] 2: Destroy all humans.\n\nempty\n\n(more: show --offset 3 --limit 2)\n"
+    )
+    assert task_list.execute("show --offset 9") == ""
+    assert task_list.execute("show --limit 0") == "Usage: show [--offset <number>] [--limit <number>]\n"
+    assert ''.join(task_list.stream("show")) == task_list.execute("show")
+
+
+def test_view_by_deadline_pages(task_list: TaskList) -> None:
+
+    task_list.execute("add project secrets")
+    task_list.execute("add task secrets Eat more donuts.")
+    task_list.execute("add task secrets Destroy all humans.")
+    task_list.execute("add project training")
+    task_list.execute("add task training SOLID")
+    task_list.execute("deadline 1 01-01-2026")
+    task_list.execute("deadline 3 01-01-2026")
+
+    assert task_list.execute("view-by-deadline --offset 1 --limit 1") == (
+        "01-01-2026:\n  training:\n    3: SOLID\n(more: view-by-deadline --offset 2 --limit 1)\n"
+    )
+    assert task_list.execute("view-by-deadline --offset 2") == "No deadline:\n  secrets:\n    2: Destroy all humans.\n"
+    assert task_list.execute("view-by-deadline --limit") == "Usage: view-by-deadline [--offset <number>] [--limit <number>]\n"
+    full = task_list.execute("view-by-deadline")
+    assert ''.join(task_list.stream("view-by-deadline")) == full
+    task_list.OUTPUT_CHUNK_SIZE = 1
+    stream = CountingStream()
+    task_list._output = OutputSink(stream)
+    assert task_list.execute("view-by-deadline") == full
+    assert stream.writes == 2
+
+
+def test_concurrent_task_list_serializes_writers(task_list: TaskList, capsys: pytest.CaptureFixture) -> None:
+
+    tasks = ConcurrentTaskList(type(task_list._store)())
+    tasks.execute("add project secrets")
+
+    def add_tasks(thread: int) -> None:
+        for i in range(100):
+            tasks.execute(f"add task secrets Task {thread}-{i}")
+            tasks.execute("show --limit 5")
+    threads = [threading.Thread(target=add_tasks, args=(thread,)) for thread in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    shown = tasks.execute("show").split("\n")
+    ids = [int(line.split("] ")[1].split(":")[0]) for line in shown if line.startswith("    [")]
+    assert sorted(ids) == list(range(1, 801))
+    assert capsys.readouterr().out == ""
+
+
+def test_concurrent_task_list_reads_snapshots_without_locking(task_list: TaskList) -> None:
+
+    tasks = ConcurrentTaskList(type(task_list._store)())
+    tasks.execute("add project secrets")
+    tasks.execute("add task secrets Eat more donuts.")
+    shown = tasks.execute("show")
+    summary = tasks.execute("summary")
+
+    results = []
+    def read_snapshots() -> None:
+        results.extend([tasks.execute("show"), tasks.execute("summary")])
+    with tasks._lock.writing():
+        reader = threading.Thread(target=read_snapshots)
+        reader.start()
+        reader.join(timeout=5)
+    assert results == [shown, summary]
+
+    tasks.execute("check 1")
+    assert tasks.execute("show") == "secrets\n    [x] 1: Eat more donuts.\n\n"
+
+
+def test_concurrent_stream_does_not_hold_lock_while_sending(task_list: TaskList) -> None:
+
+    tasks = ConcurrentTaskList(type(task_list._store)())
+    for project in ["secrets", "training"]:
+        tasks.execute(f"add project {project}")
+        tasks.execute(f"add task {project} Eat more donuts.")
+    chunks = tasks.stream("show")
+    assert next(chunks) == "secrets\n    [ ] 1: Eat more donuts.\n\n"
+
+    # The client has not read the rest yet
+    writer = threading.Thread(target=tasks.execute, args=("add task secrets Destroy all humans.",), daemon=True)
+    writer.start()
+    writer.join(timeout=5)
+    assert not writer.is_alive()
+    assert list(chunks) == ["training\n    [ ] 2: Eat more donuts.\n\n"]
+
+
+def test_web_pages_and_streams_projects(monkeypatch: pytest.MonkeyPatch) -> None:
+
+    import task_controller
+    monkeypatch.setattr(task_controller, "tasks", ConcurrentTaskList())
+    app, tasks = task_controller.app, task_controller.tasks
+    client = app.test_client()
+    client.post("/projects", data={"project_to_create": "secrets"})
+    for i in range(150):
+        tasks.execute(f"add task secrets Task {i}")
+
+    page = client.get("/projects?offset=100&limit=100").get_data(as_text=True)
+    assert "Task 99" not in page and "Task 100" in page and "Task 149" in page
+    assert "Previous page" in page and "Next page" not in page
+    assert "Next page" in client.get("/projects").get_data(as_text=True)
+
+    response = client.get("/projects/stream?limit=2")
+    assert response.is_streamed
+    assert response.get_data(as_text=True) == (
+        "secrets\n    [ ] 1: Task 0\n    [ ] 2: Task 1\n\n(more: show --offset 2 --limit 2)\n"
+    )
+
+
+def test_json_api(monkeypatch: pytest.MonkeyPatch) -> None:
+
+    import task_controller
+    monkeypatch.setattr(task_controller, "tasks", ConcurrentTaskList())
+    app = task_controller.app
+    client = app.test_client()
+
+    assert client.post("/api/projects", json={"name": "api"}).status_code == 201
+    assert {"name": "api", "task_count": 0} in client.get("/api/projects").get_json()
+    response = client.post("/api/projects/api/tasks", json={"description": "Write docs"})
+    assert response.status_code == 201
+    task = response.get_json()
+    assert task == {"id": task["id"], "project": "api", "description": "Write docs", "done": False, "deadline": None}
+
+    response = client.patch(f"/api/tasks/{task['id']}", json={"done": True, "deadline": "1-2-2026"})
+    assert response.get_json() == dict(task, done=True, deadline="01-02-2026")
+    assert client.get(f"/api/tasks/{task['id']}").get_json() == dict(task, done=True, deadline="01-02-2026")
+    assert client.get("/api/projects/api/tasks").get_json() == [dict(task, done=True, deadline="01-02-2026")]
+
+    assert client.patch(f"/api/tasks/{task['id']}", json={"deadline": "31-31-2026"}).status_code == 400
+    assert client.post("/api/projects/missing/tasks", json={"description": "Nothing"}).status_code == 404
+    assert client.get("/api/tasks/999999").status_code == 404
+    assert client.post("/api/batch", json={"commands": "show"}).status_code == 400
+
+    commands = [f"add task api Step {i}" for i in range(3)] + [f"check {task['id'] + 1}", "frobnicate"]
+    results = client.post("/api/batch", json=commands).get_json()["results"]
+    assert [result["command"] for result in results] == commands
+    assert results[0]["output"] == "Added task Step 0 to project api\n"
+    assert results[3]["output"] == f"Checked {task['id'] + 1}.\n"
+    assert results[4]["output"] == 'I don\'t know what the command "frobnicate" is.\n'
+    assert len(client.get("/api/projects/api/tasks?offset=1&limit=2").get_json()) == 2
+
+
+def call_asgi(application, method: str, path: str, body: object = None) -> tuple:
+    messages = []
+    async def receive() -> dict:
+        return {"type": "http.request", "body": json.dumps(body).encode() if body is not None else b"", "more_body": False}
+    async def send(message: dict) -> None:
+        messages.append(message)
+    path, _, query = path.partition("?")
+    scope = {"type": "http", "method": method, "path": path, "query_string": query.encode(), "headers": []}
+    return application(scope, receive, send), messages
+
+
+def test_asgi_app_serializes_writes(tmp_path) -> None:
+
+    application = TaskListApp()
+    async def scenario() -> list:
+        calls = [call_asgi(application, "POST", "/api/batch", ["add project secrets"])]
+        await calls[0][0]
+        calls = [call_asgi(application, "POST", "/api/command", {"command": f"add task secrets Task {i}"}) for i in range(50)]
+        calls.append(call_asgi(application, "POST", "/api/command", {"command": f"export {tmp_path / 'tasks.csv'}"}))
+        await asyncio.gather(*(call for call, _ in calls))
+        show = call_asgi(application, "GET", "/show?limit=2")
+        await show[0]
+        await application.tasks.stop()
+        return [messages for _, messages in calls] + [show[1]]
+
+    responses = asyncio.run(scenario())
+    outputs = [json.loads(messages[1]["body"])["output"] for messages in responses[:-1]]
+    assert sorted(outputs[:-1]) == sorted(f"Added task Task {i} to project secrets\n" for i in range(50))
+    assert outputs[-1] == "Tasks exported to file succesfully.\n"
+    assert (tmp_path / 'tasks.csv').read_text().count("\n") == 51
+    assert responses[-1][0]["status"] == 200
+    assert responses[-1][1]["body"] == b"secrets\n    [ ] 1: Task 0\n    [ ] 2: Task 1\n\n(more: show --offset 2 --limit 2)\n"
+
+
+def test_asgi_import_replaces_tasks_on_event_loop(tmp_path) -> None:
+
+    load_threads = []
+    class RecordingStore(TaskStore):
+        def load_from(self, other):
+            load_threads.append(threading.current_thread())
+            super().load_from(other)
+    application = TaskListApp(AsyncTaskList(RecordingStore()))
+    async def scenario() -> list:
+        for command in ["add project secrets", "add task secrets Eat more donuts.", f"export {tmp_path / 'tasks.csv'}",
+                        "add project training", "add task training SOLID"]:
+            await application.tasks.execute(command)
+        before = await application.tasks.execute("top-projects 5")
+        import_call = call_asgi(application, "POST", "/api/command", {"command": f"import {tmp_path / 'tasks.csv'}"})
+        reads = [call_asgi(application, "POST", "/api/command", {"command": "top-projects 5"}) for _ in range(20)]
+        await asyncio.gather(import_call[0], *(call for call, _ in reads))
+        after = await application.tasks.execute("top-projects 5")
+        await application.tasks.stop()
+        return [before, after]
+
+    before, after = asyncio.run(scenario())
+    assert load_threads == [threading.main_thread()]
+    assert "training" in before and "training" not in after
+
+
+def test_asgi_server_answers_500_when_the_application_fails(capsys) -> None:
+
+    import socket
+    from asgi_app import serve
+    with socket.socket() as probe:
+        probe.bind(("localhost", 0))
+        port = probe.getsockname()[1]
+    async def scenario() -> list:
+        ready = asyncio.Event()
+        server = asyncio.ensure_future(serve(TaskListApp(), "localhost", port, ready))
+        await ready.wait()
+        replies = []
+        for command in ["find-tasks-by-keyword (", "help"]:
+            body = json.dumps({"command": command}).encode()
+            reader, writer = await asyncio.open_connection("localhost", port)
+            writer.write(b"POST /api/command HTTP/1.1\r\nContent-Length: %d\r\n\r\n%s" % (len(body), body))
+            await writer.drain()
+            replies.append(await reader.read())
+            writer.close()
+        server.cancel()
+        try:
+            await server
+        except asyncio.CancelledError:
+            pass
+        return replies
+
+    failed, served = asyncio.run(scenario())
+    assert failed.startswith(b"HTTP/1.1 500 Internal Server Error\r\n")
+    assert served.startswith(b"HTTP/1.1 200 OK\r\n")
+    assert "Traceback" in capsys.readouterr().err
+
+
+SCRIPT = """add project secrets
+add task secrets Eat more donuts.
+add task secrets Destroy all humans.
+add task nowhere Lost task.
+add project training
+
+add task training Four Elements of Simple Design
+add task training SOLID
+check 1
+check 3
+uncheck 1
+check two
+check 99
+uncheck 1-3
+add task secrets Refactor the code.
+deadline 2 01-01-2026
+check 6
+show
+quit
+add task secrets Never added.
+"""
+
+
+def test_script_mode_matches_executing_commands_one_at_a_time(task_list: TaskList, tmp_path) -> None:
+
+    store_type = type(task_list._store)
+    expected = TaskList(io.StringIO(), io.StringIO(), store_type(), str(tmp_path / "one-by-one"))
+    for command in SCRIPT.split("\n"):
+        if command == TaskList.QUIT:
+            break
+        if command:
+            expected.execute(command)
+    expected.close()
+
+    script = TaskList(io.StringIO(SCRIPT), io.StringIO(), store_type(), str(tmp_path / "script"))
+    script.SCRIPT_GROUP_SIZE = 2
+    script.run_script()
+
+    assert script._output_stream.getvalue() == expected._output_stream.getvalue()
+    assert script._last_id == expected._last_id == 5
+    # The bulk operations are journaled like single commands
+    script.close()
+    recovered = TaskList(io.StringIO(), io.StringIO(), store_type(), str(tmp_path / "script"))
+    assert recovered.execute("show") == expected.execute("show")
+    recovered.close()
+
+
+def test_script_groups_consecutive_commands(task_list: TaskList) -> None:
+
+    groups = list(task_list._script_groups(SCRIPT.split("\n")))
+    assert groups[:4] == [
+        ("command", "add project secrets", []),
+        ("add task", "secrets", ["Eat more donuts.", "Destroy all humans."]),
+        ("add task", "nowhere", ["Lost task."]),
+        ("command", "add project training", []),
+    ]
+    assert groups[5] == ("done", None, [("1", True), ("3", True), ("1", False)])
+    # Anything but a single ID is a bulk command of its own
+    assert groups[6:8] == [("command", "check two", []), ("done", None, [("99", True)])]
+    assert groups[8] == ("command", "uncheck 1-3", [])
+    assert groups[-1] == ("command", "show", [])
+
+
+def test_commands_are_dispatched_through_the_registry(task_list: TaskList, output_stream: io.StringIO) -> None:
+
+    help_text = task_list.execute("help")
+    assert help_text.startswith("Commands:\n  show [--offset <number>] [--limit <number>]\n")
+    assert all(f"  {usage}\n" in help_text for command in TaskList.commands for usage in command.usage)
+    # Only the analytics commands build the analytics
+    task_list.execute("add project secrets")
+    task_list.execute("show")
+    task_list.execute("top-projects many")
+    assert task_list._task_analytics is None
+    task_list.execute("summary")
+    assert task_list._task_analytics is not None
+    assert task_list.execute("frobnicate now") == 'I don\'t know what the command "frobnicate" is.\n'
+
+
+def test_plugins_register_commands() -> None:
+
+    class PluginTaskList(TaskList):
+        commands = TaskList.commands.copy()
+
+    @PluginTaskList.commands.command("count", usage=("count [<project name>]",))
+    def count(task_list: TaskList, arguments: str) -> str:
+        counts = task_list._store.task_counts()
+        output = f"{counts.get(arguments, 0) if arguments else sum(counts.values())}\n"
+        task_list._output.write(output)
+        return output
+
+    PluginTaskList.commands.register(Command("double", PluginTaskList._top_projects, (), lambda arguments: (2 * int(arguments),), "Not a number.\n"))
+
+    plugin_list = PluginTaskList(io.StringIO(), io.StringIO())
+    plugin_list.execute("add project secrets")
+    plugin_list.execute("add task secrets Eat more donuts.")
+    assert plugin_list.execute("count") == "1\n"
+    assert plugin_list.execute("count secrets") == "1\n"
+    assert plugin_list.execute("double x") == "Not a number.\n"
+    assert "  count [<project name>]\n" in plugin_list.execute("help")
+    # Other task lists are not affected
+    assert "count" not in TaskList.commands
+    assert TaskList(io.StringIO(), io.StringIO()).execute("count") == 'I don\'t know what the command "count" is.\n'
+
+
+def test_console_commands_do_not_import_pandas() -> None:
+
+    script = (
+        "import io, sys\n"
+        "from task_list import TaskList\n"
+        "task_list = TaskList(io.StringIO(), io.StringIO())\n"
+        "for command in ['add project secrets', 'add task secrets Eat more donuts.', 'check 1', 'deadline 1 01-01-2026', 'show', 'today', 'view-by-deadline', 'help']:\n"
+        "    task_list.execute(command)\n"
+        "print('pandas' in sys.modules, 'numpy' in sys.modules)\n"
+        "task_list.execute('summary')\n"
+        "print('pandas' in sys.modules)\n"
+    )
+    result = subprocess.run([sys.executable, "-c", script], cwd=os.path.dirname(os.path.abspath(__file__)), capture_output=True, text=True, check=True)
+    assert result.stdout.split("\n")[:2] == ["False False", "True"]
+
+
+def test_analytics_results_are_cached_until_the_tasks_change(task_list: TaskList, output_stream: io.StringIO) -> None:
+
+    task_list.execute("add project secrets")
+    task_list.execute("add task secrets Eat more donuts.")
+    task_list.execute("deadline 1 01-01-2020")
+    results = task_list._results
+
+    summary = task_list.execute("summary")
+    overdue = task_list.execute("find-overdue 01-01-2026")
+    assert (results.hits, results.misses) == (0, 2)
+    clear_output(output_stream)
+    assert task_list.execute("summary") == summary
+    assert task_list.execute("find-overdue 01-01-2026") == overdue
+    assert get_output(output_stream) == summary + overdue
+    assert (results.hits, results.misses) == (2, 2)
+    # Commands that do not depend on the tasks alone are not cached
+    task_list.execute("show")
+    assert (results.hits, results.misses) == (2, 2)
+
+    task_list.execute("check 1")
+    assert len(results) == 0
+    assert task_list.execute("summary") != summary
+    assert task_list.execute("find-overdue 01-01-2026") != overdue
+    assert (results.hits, results.misses) == (2, 4)
+
+
+def test_result_cache_evicts_least_recently_used() -> None:
+
+    store = TaskStore()
+    cache = ResultCache(store, max_entries=2)
+    cache.put("a", "1")
+    cache.put("b", "2")
+    assert cache.get("a") == "1"
+    cache.put("c", "3")
+    assert (cache.get("b"), cache.get("a"), cache.get("c")) == (None, "1", "3")
+    store.add_project("secrets")
+    assert cache.get("a") is None
+    assert (cache.hits, cache.misses) == (3, 2)
+
+
+def test_parallel_analytics_match_serial_analytics(task_list: TaskList) -> None:
+
+    for project in ["secrets", "training", "empty", "ünïcode"]:
+        task_list.execute(f"add project {project}")
+    for i in range(60):
+        project = ["secrets", "training", "ünïcode"][i % 3]
+        task_list.execute(f"add task {project} {['Eat', 'DESTROY', 'Straße', 'İstanbul'][i % 4]} task {i}")
+        if i % 4 == 0:
+            task_list.execute(f"check {i + 1}")
+        if i % 5 == 0:
+            task_list.execute(f"deadline {i + 1} {1 + i % 28:02d}-0{1 + i % 9}-2025")
+    df = task_list._analytics_view.frame()
+    serial = TaskAnalytics()
+    parallel = ParallelTaskAnalytics(workers=2)
+    parallel.PARALLEL_MIN_ROWS = 0
+    try:
+        pd.testing.assert_frame_equal(parallel.get_project_summary(df), serial.get_project_summary(df))
+        pd.testing.assert_frame_equal(parallel.get_top_projects_by_completion(df, 2), serial.get_top_projects_by_completion(df, 2))
+        for keyword, regex in [("eat", True), ("task [0-9]$", True), ("STRASSE", False), ("straße", False), ("i̇stanbul", False), ("nothing", False)]:
+            pd.testing.assert_frame_equal(parallel.find_tasks_by_keyword(df, keyword, regex), serial.find_tasks_by_keyword(df, keyword, regex))
+        with pytest.raises(re.error):
+            parallel.find_tasks_by_keyword(df, "(", True)
+        for current_date in ["01-05-2025", "01-01-2000"]:
+            pd.testing.assert_frame_equal(parallel.find_overdue_tasks(df, current_date), serial.find_overdue_tasks(df, current_date))
+
+        # Shards are kept for the frame, while its done and deadline columns change in place
+        partition = parallel._partition
+        task_list.execute("check 2-30")
+        task_list.execute("deadline 31-40 01-01-2025")
+        assert task_list._analytics_view.frame() is df
+        pd.testing.assert_frame_equal(parallel.get_project_summary(df), serial.get_project_summary(df))
+        pd.testing.assert_frame_equal(parallel.find_overdue_tasks(df, "01-05-2025"), serial.find_overdue_tasks(df, "01-05-2025"))
+        assert parallel._partition is partition
+        task_list.execute("add task secrets Eat again")
+        added = task_list._analytics_view.frame()
+        pd.testing.assert_frame_equal(parallel.find_tasks_by_keyword(added, "eat"), serial.find_tasks_by_keyword(added, "eat"))
+        assert parallel._partition is not partition
+    finally:
+        parallel.close()
+
+
+def test_task_keeps_deadline_as_ordinal() -> None:
+
+    task = Task(1, "Eat more donuts.")
+    assert not hasattr(task, "__dict__")
+    assert (task.deadline, task.deadline_ordinal) == ("", 0)
+    task.deadline = "05-03-2024"
+    assert task.deadline == "05-03-2024"
+    assert task.deadline_ordinal == datetime(2024, 3, 5).toordinal()
+    del task.deadline
+    assert (task.deadline, task.deadline_ordinal) == ("", 0)
+    with pytest.raises(ValueError):
+        task.deadline = "31-02-2024"
+
+
+def test_import_shares_equal_descriptions(task_list: TaskList, output_stream: io.StringIO, tmp_path) -> None:
+
+    path = tmp_path / "tasks.csv"
+    path.write_text("project_name,task_id,description,done,deadline\n" + "".join(f"secrets,{i},Eat more donuts.,False,\n" for i in range(1, 7)))
+    task_list.IMPORT_CHUNK_SIZE = 4
+    task_list.execute(f"import {path}")
+
+    if isinstance(task_list._store, ColumnarTaskStore):
+        assert task_list._store._descriptions == ["Eat more donuts."]
+    else:
+        tasks = task_list._store.to_dict()["secrets"]
+        assert len(tasks) == 6
+        assert all(task.description is tasks[0].description for task in tasks)
+
+
+def test_import_sparse_and_negative_task_ids(task_list: TaskList, output_stream: io.StringIO, tmp_path) -> None:
+
+    path = tmp_path / "tasks.csv"
+    path.write_text("project_name,task_id,description,done,deadline\n"
+                    "big,5000000000000,Huge ID.,False,\nsmall,-3,Negative ID.,False,\nsmall,7,Small ID.,False,\n")
+    assert task_list.execute(f"import {path}") == "File found and imported as tasks (overwrote old tasks)\n"
+    assert task_list.execute("check -3") == "Checked -3.\n"
+    assert task_list.execute("check 5000000000000") == "Checked 5000000000000.\n"
+    task_list.execute("add task small Next ID.")
+    assert task_list.execute("check 4-7") == "Checked 1 task.\n"
+    # Ranges only go through the IDs in use
+    assert task_list.execute("uncheck 1-5000000000001") == "Unchecked 3 tasks.\n"
+    assert task_list.execute("check 4-7,5000000000001") == "Checked 2 tasks.\n"
+    assert task_list._store.get(5000000000001)[1].description == "Next ID."
+    assert task_list._store.get(-3)[1].done and not task_list._store.get(5000000000000)[1].done
+    if isinstance(task_list._store, ColumnarTaskStore):
+        assert len(task_list._store._row_of_id) == ColumnarTaskStore._INITIAL_CAPACITY
+
+
+def test_bulk_check_and_deadline(task_list: TaskList, output_stream: io.StringIO) -> None:
+
+    task_list.execute("add project secrets")
+    for description in ["Eat more donuts.", "Destroy all humans.", "Refactor the code."]:
+        task_list.execute(f"add task secrets {description}")
+    task_list.execute("add project training")
+    task_list.execute("add task training SOLID")
+    task_list.execute("add task training Outside-In TDD")
+
+    assert task_list.execute("check 2-4") == "Checked 3 tasks.\n"
+    assert task_list.execute("uncheck 4,3,3,99") == "Unchecked 2 tasks, 1 not found.\n"
+    assert task_list.execute("uncheck 1,99999999999999999999") == "Unchecked 1 task, 1 not found.\n"
+    assert task_list.execute("check project training") == "Checked 2 tasks.\n"
+    assert task_list.execute("deadline 1,2 01-01-2026") == "Added deadline to 2 tasks.\n"
+    assert task_list.execute("deadline project training 15-03-2024") == "Added deadline to 2 tasks.\n"
+    assert task_list.execute("uncheck where overdue 01-06-2024") == "Unchecked 2 tasks.\n"
+    # Ranges end at the last task
+    assert task_list.execute("check 5-5000") == "Checked 1 task.\n"
+    clear_output(output_stream)
+
+    task_list.execute("show")
+    assert get_output(output_stream).strip().split("\n") == [
+        "secrets",
+        "    [ ] 1: Eat more donuts. (Deadline: 01-01-2026)",
+        "    [x] 2: Destroy all humans. (Deadline: 01-01-2026)",
+        "    [ ] 3: Refactor the code.",
+        "",
+        "training",
+        "    [ ] 4: SOLID (Deadline: 15-03-2024)",
+        "    [x] 5: Outside-In TDD (Deadline: 15-03-2024)",
+    ]
+    assert task_list.execute("check project nowhere") == 'Could not find a project with the name "nowhere".\n'
+    assert task_list.execute("check 1-x") == "1-x is not a valid ID"
+    assert task_list.execute("uncheck where done 01-06-2024") == "where done 01-06-2024 is not a valid ID"
+    assert task_list.execute("deadline 1-2 31-02-2026") == "This is not a valid date! Use format DD-MM-YYYY.\n"
+    assert task_list.execute("deadline everything 01-01-2026") == "No valid Task ID given.\n"
+
+
+def test_deadline_index_follows_bulk_deadlines(task_list: TaskList) -> None:
+
+    task_list.execute("add project secrets")
+    task_list._add_tasks("secrets", [f"Task {i}" for i in range(1, 201)])
+    task_list.execute("deadline 1-10 01-01-2026")
+    assert task_list._deadline_index.due_before(datetime(2027, 1, 1).toordinal()) == list(range(1, 11))
+    # More changes than are inserted one at a time, and a few that are
+    task_list.execute("deadline 5-200 01-01-2025")
+    task_list.execute("deadline 1,2 01-01-2024")
+    assert task_list._deadline_index.due_before(datetime(2025, 6, 1).toordinal()) == [1, 2] + list(range(5, 201))
+    assert task_list._deadline_index.due_on(datetime(2026, 1, 1).toordinal()) == [3, 4]
+
+
+def test_deadline_views_keep_project_order_of_imported_tasks(task_list: TaskList, output_stream: io.StringIO, tmp_path) -> None:
+
+    today = datetime.today().strftime('%d-%m-%Y')
+    path = tmp_path / "tasks.csv"
+    path.write_text("project_name,task_id,description,done,deadline\n"
+                    f"secrets,9,Nine.,False,{today}\nsecrets,2,Two.,False,{today}\nsecrets,5,Five.,False,\n"
+                    f"training,3,Three.,False,{today}\ntraining,1,One.,False,{today}\n")
+    assert task_list.execute(f"import {path}") == "File found and imported as tasks (overwrote old tasks)\n"
+    task_list.execute("add task secrets Ten.")
+    # Deadlines set after the import go through the pending changes
+    task_list.execute(f"deadline 10 {today}")
+    task_list.execute(f"deadline 5 {today}")
+    clear_output(output_stream)
+
+    task_list.execute("view-by-deadline")
+    assert get_output(output_stream) == (
+        f"{today}:\n"
+        "  secrets:\n    9: Nine.\n    2: Two.\n    5: Five.\n    10: Ten.\n"
+        "  training:\n    3: Three.\n    1: One.\n"
+    )
+    clear_output(output_stream)
+    task_list.execute("today")
+    assert get_output(output_stream) == (
+        "secrets\n    [ ] 9: Nine.\n    [ ] 2: Two.\n    [ ] 5: Five.\n    [ ] 10: Ten.\n\n"
+        "training\n    [ ] 3: Three.\n    [ ] 1: One.\n\n"
+    )
+
+
+def test_scheduler_writes_snapshots_when_tasks_change(task_list: TaskList, tmp_path) -> None:
+
+    now = [1_000_000.0]
+    path = str(tmp_path / "tasks.npz")
+    scheduler = TaskScheduler(task_list, lambda command: task_list._lock, path, 60.0, clock=lambda: now[0])
+    task_list.execute("add project secrets")
+    task_list.execute("add task secrets Eat more donuts.")
+    task_list.execute("deadline 1 01-01-2026")
+    assert scheduler.run_pending() == []
+    now[0] += 60
+    assert "snapshot" in scheduler.run_pending()
+    # Nothing changed since
+    now[0] += 60
+    assert "snapshot" not in scheduler.run_pending()
+    task_list.execute("check 1")
+    now[0] += 60
+    assert "snapshot" in scheduler.run_pending()
+
+    restored = TaskList(io.StringIO(), io.StringIO(), type(task_list._store)())
+    restored.execute(f"import-binary {path}")
+    assert restored.execute("show") == task_list.execute("show")
+
+
+def test_scheduler_computes_daily_views_at_midnight(task_list: TaskList, output_stream: io.StringIO) -> None:
+
+    task_list.execute("add project secrets")
+    task_list.execute("add task secrets Eat more donuts.")
+    task_list.execute("add task secrets Destroy all humans.")
+    task_list.execute(f"deadline 1 {datetime.now():%d-%m-%Y}")
+    task_list.execute("deadline 2 01-01-2020")
+    now = [datetime.now().timestamp()]
+    scheduler = TaskScheduler(task_list, lambda command: task_list._lock, clock=lambda: now[0])
+    now[0] = next_midnight(now[0]) - 1
+    assert scheduler.run_pending() == []
+    # The views are computed for the date of the day the test runs
+    now[0] += 1
+    assert scheduler.run_pending() == ["daily views"]
+    assert get_output(output_stream) == ""
+
+    hits = task_list._results.hits
+    today = task_list.execute("today")
+    assert "Eat more donuts." in today and "Destroy all humans." not in today
+    assert "Destroy all humans." in task_list.execute(f"find-overdue {datetime.now():%d-%m-%Y}")
+    assert task_list._results.hits == hits + 2
+
+    # Changes that do not affect the views keep them
+    today_date = f"{datetime.now():%d-%m-%Y}"
+    overdue = task_list.execute(f"find-overdue {today_date}")
+    task_list.execute("add task secrets Sleep.")
+    task_list.execute("check 3")
+    task_list.execute("deadline 3 01-01-2100")
+    frames, hits = task_list._analytics_view.rebuilds + task_list._analytics_view.delta_applications, task_list._daily_view.hits
+    assert task_list.execute("today") == today
+    assert task_list.execute(f"find-overdue {today_date}") == overdue
+    assert task_list._daily_view.hits == hits + 2
+    assert task_list._analytics_view.rebuilds + task_list._analytics_view.delta_applications == frames
+    task_list.execute("check 1")
+    assert "[x] 1: Eat more donuts." in task_list.execute("today")
+    assert task_list.execute(f"find-overdue {today_date}") == overdue
+    task_list.execute("deadline 3 01-01-2021")
+    assert "Sleep." in task_list.execute(f"find-overdue {today_date}")
+    assert "daily_view_hits_total" in task_list.metrics_text()
+
+
+def test_scheduler_thread_runs_until_task_list_is_closed(task_list: TaskList, tmp_path) -> None:
+
+    path = tmp_path / "tasks.npz"
+    task_list.execute("add project secrets")
+    scheduler = task_list.start_scheduler(str(path), 0.01)
+    for _ in range(500):
+        if path.exists():
+            break
+        threading.Event().wait(0.01)
+    task_list.close()
+    assert path.exists()
+    assert scheduler._thread is None
+
+
+def test_latency_histogram_quantiles() -> None:
+
+    histogram = LatencyHistogram()
+    assert math.isnan(histogram.quantile(0.5))
+    for microseconds in range(1, 1001):
+        histogram.observe(microseconds * 1e-6)
+    assert histogram.count == 1000
+    assert histogram.sum == pytest.approx(0.5005)
+    for q in (0.5, 0.95, 0.99):
+        # The upper bound of a quarter octave bucket
+        assert q * 1e-3 <= histogram.quantile(q) <= q * 1e-3 * 2 ** 0.25
+
+
+def test_stats_times_commands_once_enabled(task_list: TaskList, output_stream: io.StringIO) -> None:
+
+    task_list.execute("add project secrets")
+    task_list.execute("add task secrets Eat more donuts.")
+    assert task_list._metrics.histograms == {}
+    assert task_list.execute("stats on") == "Command timing is on.\n"
+    task_list.execute("show")
+    task_list.execute("show")
+    task_list.execute("summary")
+    task_list.execute("frobnicate")
+    stats = task_list.execute("stats")
+    lines = stats.split("\n")
+    assert lines[0].split() == ["command", "count", "p50", "ms", "p95", "ms", "p99", "ms", "total", "ms"]
+    # stats on itself ran before timing was on, and stats is recorded once it has run
+    assert [line.split()[:2] for line in lines[1:4]] == [["show", "2"], ["summary", "1"], ["unknown", "1"]]
+    assert "dataframes_built_total" in stats
+
+    metrics = task_list.metrics_text()
+    assert 'tasklist_command_seconds_count{command="show"} 2\n' in metrics
+    assert 'tasklist_command_seconds{command="summary",quantile="0.99"} ' in metrics
+    assert "# TYPE tasklist_dataframes_built_total counter\ntasklist_dataframes_built_total 1\n" in metrics
+    assert "tasklist_analytics_rows_scanned_total 1\n" in metrics
+
+    task_list.execute("stats off")
+    task_list.execute("show")
+    task_list.execute("stats reset")
+    assert task_list._metrics.histograms == {}
+    assert task_list.execute("stats sideways") == TaskList.STATS_USAGE
+
+
+def test_stats_profile_and_memory(task_list: TaskList, output_stream: io.StringIO) -> None:
+
+    task_list.execute("add project secrets")
+    task_list.execute("add task secrets Eat more donuts.")
+    clear_output(output_stream)
+    profile = task_list.execute("stats profile show")
+    assert "function calls" in profile and "_render_show" in profile
+    # The output of the command comes first
+    assert get_output(output_stream).startswith("secrets\n    [ ] 1: Eat more donuts.\n")
+    assert task_list.execute("stats memory add task secrets Destroy all humans.").startswith("Peak memory ")
+    assert task_list._store.get(2) is not None
+    assert not tracemalloc.is_tracing()
+
+
+def test_web_metrics(monkeypatch: pytest.MonkeyPatch) -> None:
+
+    import task_controller
+    monkeypatch.setattr(task_controller, "tasks", ConcurrentTaskList())
+    app, tasks = task_controller.app, task_controller.tasks
+    client = app.test_client()
+    client.post("/projects", data={"project_to_create": "metrics"})
+    tasks.execute("show")
+    tasks.execute("show")
+    response = client.get("/metrics")
+    assert response.mimetype == "text/plain"
+    text = response.get_data(as_text=True)
+    assert "# TYPE tasklist_command_seconds summary\n" in text
+    assert re.search(r'^tasklist_command_seconds_count\{command="show"\} [1-9]', text, re.MULTILINE)
+    assert re.search(r"^tasklist_output_flushes_total \d+$", text, re.MULTILINE)
+
+
+def test_servers_keep_the_journal(monkeypatch: pytest.MonkeyPatch, tmp_path) -> None:
+
+    import asgi_app
+    import task_controller
+    from task_list_application import main
+    monkeypatch.setattr(task_controller, "tasks", ConcurrentTaskList())
+    reloaded = []
+
+    def run(**options):
+        reloaded.append(options["use_reloader"])
+        task_controller.tasks.execute("add project web")
+
+    async def serve(application, host, port):
+        await application.tasks.execute("add project asgi")
+
+    monkeypatch.setattr(task_controller.app, "run", run)
+    monkeypatch.setattr(asgi_app, "serve", serve)
+    for mode in ["--web", "--asgi"]:
+        monkeypatch.setattr(sys, "argv", ["task_list_application.py", mode, "--journal", str(tmp_path)])
+        main()
+    # Both processes of the reloader would open the journal
+    assert reloaded == [False]
+    restarted = TaskList(io.StringIO(), io.StringIO(), journal_directory=str(tmp_path))
+    assert restarted.execute("show") == "web\n\nasgi\n\n"
+    restarted.close()
+
+
+def test_generated_task_lists_depend_only_on_the_seed() -> None:
+
+    spec = TaskListSpec(500, tasks_per_project=50, project_skew=1.5, seed=7)
+    frame = generate_frame(spec)
+    pd.testing.assert_frame_equal(frame, generate_frame(spec))
+    assert not frame.equals(generate_frame(TaskListSpec(500, tasks_per_project=50, project_skew=1.5, seed=8)))
+    assert len(frame) == 500 and frame['project_name'].nunique() <= 10
+    # The skew makes the first project the largest
+    assert frame['project_name'].value_counts().index[0] == "project0"
+    task_list = generate_task_list(spec, ColumnarTaskStore())
+    assert len(task_list._store) == 500
+    assert task_list._store.get(500)[1].description == frame['description'].iloc[-1]
+
+
+def test_benchmark_comparison_flags_slowdowns_above_threshold() -> None:
+
+    def entry(name, seconds):
+        return {"benchmark": name, "store": "TaskStore", "tasks": 1000, "min_seconds": seconds}
+    baseline = [entry("slower", 0.001), entry("noise", 1e-6), entry("steady", 0.001)]
+    results = [entry("slower", 0.0015), entry("noise", 1e-6 + NOISE_FLOOR / 2), entry("steady", 0.00105), entry("new", 1.0)]
+    regressions = compare(results, baseline, 0.2)
+    assert [regression["benchmark"] for regression in regressions] == ["slower"]
+    assert regressions[0]["ratio"] == pytest.approx(1.5)
+    assert regressions[0]["baseline_seconds"] == 0.001